@@ -1,4 +1,56 @@
 const noJSElements = document.querySelectorAll(".no-js");
 for (let element of noJSElements) {
     element.classList.remove("no-js");
-}
\ No newline at end of file
+}
+
+// Loads the next page of posts in place, rather than navigating to it.
+// The next page is requested as a fragment: only its list of posts and pagination.
+let loadingNextPage = false;
+
+document.addEventListener("click", async function(event) {
+    const nextPageLink = event.target.closest(".paging .next-page");
+    const contentList = document.getElementById("m");
+
+    if (!nextPageLink || !contentList || event.button !== 0 || event.ctrlKey || event.metaKey || event.shiftKey) {
+        return;
+    }
+
+    event.preventDefault();
+
+    if (loadingNextPage) {
+        return;
+    }
+
+    loadingNextPage = true;
+
+    const fragmentUrl = new URL(nextPageLink.href);
+    fragmentUrl.hash = "";
+    fragmentUrl.searchParams.set("fragment", "1");
+
+    try {
+        const response = await fetch(fragmentUrl);
+        if (!response.ok) {
+            throw new Error(`Unable to load the next page: ${response.status}`);
+        }
+
+        const fragment = new DOMParser().parseFromString(await response.text(), "text/html");
+        const newElements = Array.from(fragment.getElementById("m").children);
+        const paging = nextPageLink.closest(".paging");
+
+        contentList.append(...newElements);
+
+        const nextPaging = fragment.querySelector(".paging");
+        if (nextPaging) {
+            paging.replaceWith(nextPaging);
+        } else {
+            paging.remove();
+        }
+
+        document.dispatchEvent(new CustomEvent("contentsappended", {detail: newElements}));
+    } catch (error) {
+        // Fall back to navigating to the next page
+        window.location.href = nextPageLink.href;
+    } finally {
+        loadingNextPage = false;
+    }
+});
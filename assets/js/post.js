@@ -117,13 +117,19 @@ function populate_polls() {
 // TODO lazy load polls
 populate_polls();
 
-const unblurCommunityLabledPostButtons = document.getElementsByClassName("unblur-post-button");
-for (let btn of unblurCommunityLabledPostButtons) {
-    btn.addEventListener('click', function(event) {
-        let postContentElement = btn.closest(".post-content");
-        let communityTagCoverElement = postContentElement.getElementsByClassName("community-label-cover")
-
-        communityTagCoverElement[0]["style"] = `display: none;`;
-        postContentElement["style"] = `height: unset;`;
-    })
-}
\ No newline at end of file
+// Handled from the document as to also cover posts appended later on
+document.addEventListener('click', function(event) {
+    let btn = event.target.closest(".unblur-post-button");
+    if (!btn) {
+        return;
+    }
+
+    let postContentElement = btn.closest(".post-content");
+    let communityTagCoverElement = postContentElement.getElementsByClassName("community-label-cover")
+
+    communityTagCoverElement[0]["style"] = `display: none;`;
+    postContentElement["style"] = `height: unset;`;
+})
+
+// Posts from the next page are appended by base.js
+document.addEventListener("contentsappended", populate_polls);
\ No newline at end of file
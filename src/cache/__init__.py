@@ -3,4 +3,5 @@ from .search import get_search_results
 from .explore import get_explore_results
 from .tagged import get_tag_browse_results
 from .blogs import get_blog_posts, get_blog_post, get_blog_search_results
-from .notes import get_post_notes
\ No newline at end of file
+from .notes import get_post_notes
+from .rss_feeds import get_rss_feed
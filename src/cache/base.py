@@ -1,11 +1,16 @@
 import abc
+import time
 import typing
 
 import orjson
 
 from .. import priviblur_extractor
+from ..helpers import metrics, timing, etags
 
 class AccessCache(abc.ABC):
+    # Groups cache lookups in metrics
+    metrics_label = "generic"
+
     def __init__(self, ctx, prefix, cache_ttl, continuation=None, **kwargs):
         self.ctx = ctx
         self.prefix = prefix
@@ -29,11 +34,24 @@ class AccessCache(abc.ABC):
         """Creates a key to get/store an item within the cache"""
         pass
 
+    async def _fetch(self):
+        with timing.measure("upstream"):
+            return await self.fetch()
+
+    def _parse(self, initial_results):
+        with timing.measure("parse"):
+            return self.parse(initial_results)
+
     def parse_cached_json(self, json):
         return priviblur_extractor.models.timelines.Timeline.from_json(json)
 
-    def to_json(self, parsed_results):
-        return orjson.dumps(parsed_results.to_json_serialisable())
+    def to_json(self, parsed_results, cached_at):
+        json = parsed_results.to_json_serialisable()
+
+        # Identifies this specific entry. See helpers/etags.py
+        json["cached_at"] = cached_at
+
+        return orjson.dumps(json)
 
     def get_key(self):
         base_key = self.build_key()
@@ -59,9 +77,10 @@ class AccessCache(abc.ABC):
         Creates a placeholder item within the cache for the next continuation batch if applicable
         """
         pipeline = self.ctx.CacheDb.pipeline()
-        timeline = self.parse(initial_results)
+        timeline = self._parse(initial_results)
+        cached_at = time.time()
 
-        pipeline.set(full_key_with_continuation, self.to_json(timeline))
+        pipeline.set(full_key_with_continuation, self.to_json(timeline, cached_at))
         pipeline.expire(full_key_with_continuation, self.cache_ttl)
 
         # Allocate key slot for the next continuation
@@ -76,6 +95,8 @@ class AccessCache(abc.ABC):
 
         await pipeline.execute()
 
+        etags.add(full_key_with_continuation, priviblur_extractor.models.VERSION, cached_at)
+
         return timeline
 
     async def get_cached(self):
@@ -84,38 +105,55 @@ class AccessCache(abc.ABC):
         Fetches new data and inserts into the cache when it is unable to do so
         """
         base_key, full_key_with_continuation = self.get_key()
-        cached_result = await self.ctx.CacheDb.get(full_key_with_continuation)
+        with timing.measure("cache"):
+            cached_result = await self.ctx.CacheDb.get(full_key_with_continuation)
 
         # See comment in self.parse_and_cache as to why "0"
         if not cached_result or cached_result == "0":
-            initial_results = await self.fetch()
+            metrics.record_cache_lookup(self.metrics_label, "miss")
+            initial_results = await self._fetch()
 
             # When the current request has a continuation token attached, we'll only cache
             # when a slot has already been allocated for it from the previous request.
             if self.continuation and not cached_result:
-                return self.parse(initial_results)
+                etags.mark_uncacheable()
+                return self._parse(initial_results)
             else:
                 self.ctx.LOGGER.info("Cache: Adding \"%s\" to the cache", full_key_with_continuation)
                 return await self.parse_and_cache(base_key, full_key_with_continuation, initial_results)
         else:
             self.ctx.LOGGER.info("Cache: Cached version of \"%s\" found", full_key_with_continuation)
 
-            initial_results_from_cache = orjson.loads(cached_result)
+            with timing.measure("rebuild"):
+                initial_results_from_cache = orjson.loads(cached_result)
 
             if initial_results_from_cache["version"] != priviblur_extractor.models.VERSION:
+                metrics.record_cache_lookup(self.metrics_label, "version_mismatch")
+
                 self.ctx.LOGGER.debug(
                     "Cache: Version mismatch! Cached object is from a different version of Priviblur (%(cached_version)s != %(priviblur_version)s). Fetching new response...",
                     dict(cached_version=initial_results_from_cache["version"], priviblur_version=priviblur_extractor.models.VERSION)
                 )
-                new_initial_results = await self.fetch()
+                new_initial_results = await self._fetch()
                 return await self.parse_and_cache(base_key, full_key_with_continuation, new_initial_results)
 
-            return self.parse_cached_json(initial_results_from_cache)
+            metrics.record_cache_lookup(self.metrics_label, "hit")
+
+            # Compared against the client's ETag ahead of the rebuild
+            if cached_at := initial_results_from_cache.pop("cached_at", None):
+                etags.add(full_key_with_continuation, priviblur_extractor.models.VERSION, cached_at)
+            else:
+                etags.mark_uncacheable()
+
+            with timing.measure("rebuild"):
+                return self.parse_cached_json(initial_results_from_cache)
 
     async def get(self):
         """Retrieves some data from either the cache or Tumblr itself"""
         if self.ctx.CacheDb:
             return await self.get_cached()
         else:
-            initial_results = await self.fetch()
-            return self.parse(initial_results)
+            etags.mark_uncacheable()
+
+            initial_results = await self._fetch()
+            return self._parse(initial_results)
@@ -5,6 +5,8 @@ from .. import priviblur_extractor
 
 
 class BlogPostsCache(AccessCache):
+    metrics_label = "blog_posts"
+
     def __init__(self, ctx, blog, continuation, **kwargs):
         super().__init__(
             ctx=ctx,
@@ -37,6 +39,8 @@ class BlogPostsCache(AccessCache):
 
 
 class BlogPostCache(AccessCache):
+    metrics_label = "blog_post"
+
     def __init__(self, ctx, blog, post_id, **kwargs):
         super().__init__(
             ctx=ctx,
@@ -65,6 +69,8 @@ class BlogPostCache(AccessCache):
 
 
 class BlogSearchCache(BlogPostsCache):
+    metrics_label = "blog_search"
+
     def __init__(self, ctx, blog, query, continuation, **kwargs):
         AccessCache.__init__(
             self,
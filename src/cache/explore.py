@@ -5,6 +5,8 @@ from .. import priviblur_extractor
 
 
 class ExploreCache(AccessCache):
+    metrics_label = "explore"
+
     def __init__(self, ctx, type_, continuation, fetch_function, **kwargs):
         super().__init__(
             ctx=ctx,
@@ -3,6 +3,8 @@ from .. import priviblur_extractor
 
 
 class NotesTimelineCache(AccessCache):
+    metrics_label = "notes"
+
     def __init__(self, ctx, blog, post_id, type_, fetch_function, **kwargs):
         super().__init__(
             ctx=ctx,
@@ -42,7 +44,7 @@ class NotesTimelineCache(AccessCache):
 
         pipeline.setnx(next_key, "0")
         pipeline.expire(next_key, self.cache_ttl)
-        self.ctx.LOGGER.debug(f"Cache: Allocating a slot for next \"%s\" notes batch with key \"%s\"", self.type_, next_key)
+        self.ctx.LOGGER.debug("Cache: Allocating a slot for next \"%s\" notes batch with key \"%s\"", self.type_, next_key)
 
     def build_key(self):
         # blog:<blog_name>:post:<post_id>:<kwargs>
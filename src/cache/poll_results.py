@@ -1,29 +1,40 @@
 import orjson
 
+from ..helpers import metrics, timing, etags
+
 async def get_poll_results(ctx, blog, post_id,poll_id, expired=False):
     """Gets poll results from the given data
     
     Attempts to retrieve from the cache first and foremost, and only requests when the data is either unavailable or expired.
     """
     if ctx.CacheDb:
-        cached_result = await ctx.CacheDb.hgetall(f"polls:{poll_id}")
+        with timing.measure("cache"):
+            cached_result = await ctx.CacheDb.hgetall(f"polls:{poll_id}")
         if cached_result:
+            metrics.record_cache_lookup("polls", "hit")
+
             timestamp = cached_result.pop("timestamp")
+            etags.add(f"polls:{poll_id}", timestamp)
             poll_results = {k:int(v) for k, v in cached_result.items()}
 
             return {"timestamp": timestamp, "results": poll_results}
         else:
+            metrics.record_cache_lookup("polls", "miss")
+
             initial_results = await _fetch_poll_results(ctx.TumblrAPI, blog, post_id, poll_id)
             await _cache_poll_results(ctx, initial_results, poll_id, expired)
+            etags.add(f"polls:{poll_id}", initial_results["timestamp"])
 
             return initial_results
     else:
+        etags.mark_uncacheable()
         return await _fetch_poll_results(ctx.TumblrAPI, blog, post_id, poll_id)
 
 
 async def _fetch_poll_results(tumblr_api, blog, post_id, poll_id):
     """Requests Tumblr for poll results"""
-    initial_results = await tumblr_api.poll_results(blog, post_id, poll_id)
+    with timing.measure("upstream"):
+        initial_results = await tumblr_api.poll_results(blog, post_id, poll_id)
     return initial_results["response"]
 
 
@@ -0,0 +1,56 @@
+import time
+
+from ..helpers import metrics, timing, etags
+
+
+async def get_rss_feed(ctx, key, render):
+    """Gets a rendered RSS feed document
+
+    Returns the cached document when available. Otherwise it is rendered with `render`, a
+    coroutine function returning the document, and cached on its own apart from the posts it
+    is built from.
+
+    Returns the document and the time at which it was rendered
+    """
+    if not ctx.CacheDb:
+        etags.mark_uncacheable()
+        return await render(), time.time()
+
+    # Links within feeds are otherwise built from the Host header of the request. Caching them
+    # would let anyone poison the feed served to everyone else. See helpers/feeds.py
+    if not ctx.PRIVIBLUR_CONFIG.deployment.domain:
+        return await render(), time.time()
+
+    cache_id = f"rss:{key}"
+
+    with timing.measure("cache"):
+        cached_result = await ctx.CacheDb.hgetall(cache_id)
+
+    # Documents are rendered from templates, as such the ones rendered by other builds are discarded
+    if cached_result and cached_result.get("fingerprint") == ctx.ETAG_FINGERPRINT:
+        metrics.record_cache_lookup("rss", "hit")
+
+        rendered_at = float(cached_result["rendered_at"])
+        etags.add(cache_id, rendered_at)
+
+        return cached_result["document"], rendered_at
+
+    metrics.record_cache_lookup("rss", "miss")
+
+    document = await render()
+    rendered_at = time.time()
+
+    pipeline = ctx.CacheDb.pipeline()
+    pipeline.hset(cache_id, mapping={
+        "document": document,
+        "rendered_at": rendered_at,
+        "fingerprint": ctx.ETAG_FINGERPRINT,
+    })
+    pipeline.expire(cache_id, ctx.PRIVIBLUR_CONFIG.cache.cache_rss_feed_for)
+    await pipeline.execute()
+
+    # The ETag must match the one sent once the document is served from the cache
+    etags.reset()
+    etags.add(cache_id, rendered_at)
+
+    return document, rendered_at
@@ -5,6 +5,8 @@ from .. import priviblur_extractor
 
 
 class SearchCache(AccessCache):
+    metrics_label = "search"
+
     def __init__(self, ctx, query, continuation, **kwargs):
         super().__init__(
             ctx=ctx,
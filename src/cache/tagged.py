@@ -5,6 +5,8 @@ from .. import priviblur_extractor
 
 
 class TagBrowseCache(AccessCache):
+    metrics_label = "tagged"
+
     def __init__(self, ctx, tag, latest, continuation, **kwargs):
         super().__init__(
             ctx=ctx,
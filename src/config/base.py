@@ -3,7 +3,7 @@ import tomllib
 
 from typing import NamedTuple
 
-from . import deployment, priviblur_backend, cache_config, user_preferences, logging_config, misc
+from . import deployment, priviblur_backend, cache_config, user_preferences, logging_config, metrics_config, server_timing_config, compression_config, preload_config, misc
 
 
 class PriviblurConfig(NamedTuple):
@@ -16,6 +16,10 @@ class PriviblurConfig(NamedTuple):
         backend: Configuration settings to customize
             how Priviblur requests Tumblr
         logging: Configuration settings to change logging behavior
+        metrics: Configuration settings for the Prometheus metrics endpoint
+        server_timing: Configuration settings for the Server-Timing header
+        compression: Configuration settings for response compression
+        preload: Configuration settings for preload hints and 103 Early Hints
         misc: Configuration settings that doesn't fit into any other categories
     """
 
@@ -24,6 +28,10 @@ class PriviblurConfig(NamedTuple):
     default_user_preferences: user_preferences.DefaultUserPreferences
     cache: cache_config.CacheConfig
     logging: logging_config.LoggingConfig
+    metrics: metrics_config.MetricsConfig
+    server_timing: server_timing_config.ServerTimingConfig
+    compression: compression_config.CompressionConfig
+    preload: preload_config.PreloadConfig
     misc: misc.MiscellaneousConfig
 
 
@@ -54,6 +62,10 @@ def load_config(path : str) -> PriviblurConfig:
         (user_preferences.DefaultUserPreferences, "default_user_preferences", "default_user_preferences"),
         (cache_config.CacheConfig, "cache", "cache"),
         (logging_config.LoggingConfig, "logging", "logging"),
+        (metrics_config.MetricsConfig, "metrics", "metrics"),
+        (server_timing_config.ServerTimingConfig, "server_timing", "server_timing"),
+        (compression_config.CompressionConfig, "compression", "compression"),
+        (preload_config.PreloadConfig, "preload", "preload"),
         (misc.MiscellaneousConfig, "misc", "misc")
     )
 
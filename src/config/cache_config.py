@@ -7,6 +7,7 @@ class CacheConfig(NamedTuple):
         url: to connect to the redis instance
         cache_active_poll_results_for: Amount of seconds to cache poll results from active polls
         cache_expired_poll_results_for: Amount of seconds to cache poll results from expired polls
+        cache_rss_feed_for: Amount of seconds to cache rendered RSS feeds of blogs and tags. Requires deployment.domain
     """
 
     url: Optional[str] = None
@@ -15,4 +16,5 @@ class CacheConfig(NamedTuple):
     cache_expired_poll_results_for: int = 86400
     cache_feed_for: int = 3600
     cache_blog_feed_for: int = 3600
-    cache_blog_post_for: int = 300
\ No newline at end of file
+    cache_blog_post_for: int = 300
+    cache_rss_feed_for: int = 900
\ No newline at end of file
@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+class CompressionConfig(NamedTuple):
+    """NamedTuple that stores configuration values relating to response compression
+
+    Attributes:
+        enabled: Compresses responses with the best encoding the client accepts (brotli, zstd or gzip).
+            brotli and zstd are only used when the `brotli` and `zstandard` packages are installed.
+        minimum_size: Responses smaller than this amount of bytes are sent as is
+        level: Compression level of pages and API responses. Static assets are compressed once
+            at the highest level instead.
+    """
+
+    enabled: bool = True
+    minimum_size: int = 1024
+    level: int = 5
@@ -0,0 +1,17 @@
+from typing import NamedTuple, Optional
+
+class MetricsConfig(NamedTuple):
+    """NamedTuple that stores configuration values relating to the Prometheus metrics endpoint
+
+    Attributes:
+        enabled: Exposes Prometheus compatible metrics at /metrics
+        host: Host to bind the dedicated metrics listener to. Defaults to the deployment host.
+        port: When set, /metrics is only served on this port rather than the main one.
+            Only applies when Priviblur is launched through `python -m src.server`
+        snapshot_interval: Seconds between each worker publishing its metrics for aggregation
+    """
+
+    enabled: bool = False
+    host: Optional[str] = None
+    port: Optional[int] = None
+    snapshot_interval: int = 5
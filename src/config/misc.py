@@ -6,7 +6,12 @@ class MiscellaneousConfig(NamedTuple):
     Attributes:
         main_response_timeout: Timeout for API requests to Tumblr
         image_response_timeout: Timeout for media requests to Tumblr
+        template_cache_path: Directory to store compiled templates in. Shared between workers
+            and restarts. Disabled when empty.
+        bundle_assets: Whether to concatenate the assets loaded by every page into bundles
     """
 
     dev_mode: bool = False
+    template_cache_path: str = ".cache/templates"
+    bundle_assets: bool = True
 
@@ -0,0 +1,16 @@
+from typing import NamedTuple
+
+class PreloadConfig(NamedTuple):
+    """NamedTuple that stores configuration values relating to preload hints
+
+    Attributes:
+        enabled: Sends `Link: rel=preload` headers listing the stylesheets, scripts and blog images pages depend on
+        early_hints: Sends the hints within a 103 Early Hints response ahead of fetching Tumblr.
+            Only over HTTP/1.1, and the reverse proxy in front of Priviblur must support them.
+        remembered_blogs: Amount of blogs whose banner and avatar are remembered as to hint
+            them before the blog is fetched again
+    """
+
+    enabled: bool = True
+    early_hints: bool = False
+    remembered_blogs: int = 1024
@@ -1,4 +1,4 @@
-from typing import NamedTuple
+from typing import NamedTuple, Optional
 
 class PriviblurBackendConfig(NamedTuple):
     """NamedTuple that stores configuration values relating to Priviblur Extractor
@@ -6,7 +6,23 @@ class PriviblurBackendConfig(NamedTuple):
     Attributes:
         main_response_timeout: Timeout for API requests to Tumblr
         image_response_timeout: Timeout for media requests to Tumblr
+        upstream_url_override: Sends every request meant for Tumblr (API and media) to this URL instead.
+            Intended for benchmarking against utils/benchmarks/mock_tumblr.py
+        response_recorder_directory: Records every response from Tumblr into compressed JSONL files
+            within this directory. Used to build fixture corpora for the benchmarks under utils/benchmarks
+        response_recorder_max_file_size: Size in MiB a corpus file can grow to before a new one is started
+        response_recorder_max_files: Number of corpus files to keep per worker
+        prewarm_connections: Connections opened to each Tumblr host when starting up. Disabled when 0
+        prewarm_explore: Fetches the explore feeds into the cache when starting up. Requires the cache
+        prewarm_timeout: Seconds to wait for the above before reporting the worker as ready regardless
     """
 
     main_response_timeout: int = 10
     image_response_timeout: int = 30
+    upstream_url_override: Optional[str] = None
+    response_recorder_directory: Optional[str] = None
+    response_recorder_max_file_size: int = 64
+    response_recorder_max_files: int = 10
+    prewarm_connections: int = 0
+    prewarm_explore: bool = False
+    prewarm_timeout: int = 10
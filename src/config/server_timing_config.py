@@ -0,0 +1,13 @@
+from typing import NamedTuple
+
+class ServerTimingConfig(NamedTuple):
+    """NamedTuple that stores configuration values relating to the Server-Timing header
+
+    Attributes:
+        enabled: Attaches a Server-Timing header breaking down where the time for each response went
+        trusted_ips: IP addresses or networks (CIDR) allowed to receive the header.
+            Every client receives the header when left empty.
+    """
+
+    enabled: bool = False
+    trusted_ips: list[str] = []
@@ -1,7 +1,13 @@
 from .extractor_errors import extractor_errors
 from .miscellaneous_errors import miscellaneous_errors
+from .api_errors import api_errors
 
 def register(app):
     """Registers all known error handlers into the given Sanic application"""
     extractor_errors.register_handlers_into_app(app)
-    miscellaneous_errors.register_handlers_into_app(app)
\ No newline at end of file
+    miscellaneous_errors.register_handlers_into_app(app)
+
+
+def register_into_api(api):
+    """Registers the JSON error handlers into the given API blueprint group"""
+    api_errors.register_handlers_into_blueprint(api)
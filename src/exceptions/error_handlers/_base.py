@@ -27,6 +27,15 @@ class ErrorHandlerGroup:
             for exception in exceptions:
                 app.error_handler.add(exception, handler)
 
+    def register_handlers_into_blueprint(self, blueprint):
+        """Registers the tracked exception handlers into the given Blueprint or BlueprintGroup
+
+        These take precedence over the ones of the app for the routes of the blueprint.
+        Must be called before the blueprint is registered into the app.
+        """
+        for handler, exceptions in self.registered_handlers.items():
+            blueprint.exception(*exceptions)(handler)
+
 
 def create_user_friendly_error_message(request, exception):
     # Taken from https://github.com/searxng/searxng/blob/f5eb56b63f250c7804e5e1cf4426e550bc933906/searx/metrics/error_recorder.py
@@ -0,0 +1,58 @@
+"""JSON error responses for the routes of the API. See routes/api"""
+
+import asyncio
+
+import sanic
+import sanic.exceptions
+
+from src.exceptions import exceptions
+from src.exceptions.error_handlers import _base
+from src.priviblur_extractor import priviblur_exceptions
+
+api_errors = _base.ErrorHandlerGroup()
+
+
+def create_error_response(message, status):
+    return sanic.response.json({"error": message}, status=status)
+
+
+@api_errors.register(priviblur_exceptions.TumblrLoginRequiredError)
+async def tumblr_error_login_walled(request, exception):
+    return create_error_response("This blog requires being logged in to view", 403)
+
+
+@api_errors.register(priviblur_exceptions.TumblrRestrictedTagError)
+async def tumblr_error_restricted_tag(request, exception):
+    return create_error_response("This tag is restricted", 403)
+
+
+@api_errors.register(priviblur_exceptions.TumblrBlogNotFoundError)
+async def tumblr_error_unknown_blog(request, exception):
+    return create_error_response("Blog not found", 404)
+
+
+@api_errors.register(priviblur_exceptions.TumblrErrorResponse)
+async def tumblr_error(request, exception):
+    return create_error_response(f"Tumblr has returned an error response (HTTP {exception.code})", 502)
+
+
+@api_errors.register(asyncio.TimeoutError)
+async def request_timeout(request, exception):
+    return create_error_response("The request to Tumblr timed out", 504)
+
+
+@api_errors.register(exceptions.NotModified)
+async def not_modified(request, exception):
+    # Otherwise caught by the generic handler below, which takes precedence over the app's
+    return sanic.response.empty(status=304, headers={"etag": exception.etag})
+
+
+@api_errors.register(sanic.exceptions.SanicException)
+async def sanic_error(request, exception):
+    return create_error_response(str(exception), exception.status_code)
+
+
+@api_errors.register(Exception)
+async def generic_error(request, exception):
+    name, message, _ = _base.create_user_friendly_error_message(request, exception)
+    return create_error_response(f"{name}: {message}" if message else name, 500)
@@ -5,7 +5,7 @@ import sanic.exceptions
 import sanic_ext
 
 from src.exceptions import exceptions
-from src.exceptions.error_handlers import _base
+from src.exceptions.error_handlers import _base, api_errors
 
 miscellaneous_errors = _base.ErrorHandlerGroup()
 
@@ -26,6 +26,10 @@ async def request_timeout(request, exception):
 
 @miscellaneous_errors.register(sanic.exceptions.NotFound, IsADirectoryError)
 async def error_404(request, exception):
+    # Unmatched paths have no route, and as such aren't covered by the error handlers of the API
+    if request.path.startswith("/api/"):
+        return api_errors.create_error_response(f"The requested URL \"{request.path}\" was not found", 404)
+
     return await sanic_ext.render(
         "misc/msg_error.jinja",
         context={
@@ -51,6 +55,11 @@ async def invalid_redirect(request, exception):
     )
 
 
+@miscellaneous_errors.register(exceptions.NotModified)
+async def not_modified(request, exception):
+    return sanic.response.empty(status=304, headers={"etag": exception.etag})
+
+
 @miscellaneous_errors.register(Exception)
 async def generic_error(request, exception):
     name, message, context = _base.create_user_friendly_error_message(request, exception)
@@ -1,2 +1,11 @@
 class TumblrInvalidRedirect(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class NotModified(Exception):
+    """Raised once the client's cached copy of the response is known to still be valid
+
+    Answered with 304 Not Modified. See helpers/etags.py
+    """
+    def __init__(self, etag):
+        super().__init__(etag)
+        self.etag = etag
@@ -0,0 +1,139 @@
+"""Fingerprinted static assets
+
+At startup every file under the assets directory is hashed and made available under a path
+containing the hash of its content (`/assets/css/base.3f2a1c9e01.css`). As such they can be
+cached forever by clients while a deploy only invalidates the files that actually changed.
+
+Assets loaded by every page are additionally concatenated into bundles, as to load them with a
+single request each.
+
+Templates look up the URLs through the manifest stored at app.ctx.ASSET_MANIFEST:
+
+    <link rel="stylesheet" href="{{app.ctx.ASSET_MANIFEST.url('css/timeline.css')}}">
+
+    {% for url in app.ctx.ASSET_MANIFEST.bundle("base.css") %}
+    <link rel="stylesheet" href="{{url}}">
+    {% endfor %}
+
+Changes to the assets are only picked up on restart.
+"""
+
+import os
+import re
+import hashlib
+import mimetypes
+
+URL_PREFIX = "/assets/"
+
+# Bundles and the assets they're made of, in order
+BUNDLES = {
+    "base.css": ("css/base.css", "css/base-post-layout.css", "css/post.css", "css/post-layout.css"),
+    "base.js": ("js/base.js", "js/post.js", "js/interaction.js"),
+}
+
+# Text inserted between files when concatenating them into a bundle.
+# Scripts are separated by a semicolon in case the previous one doesn't end its last statement.
+BUNDLE_SEPARATORS = {".css": b"\n", ".js": b"\n;\n"}
+
+# References to other assets within stylesheets, such as fonts
+CSS_URL_PATTERN = re.compile(rb"""url\(\s*(["']?)/assets/([^"')]+)\1\s*\)""")
+
+
+def fingerprint(path : str, body : bytes) -> str:
+    """Inserts the hash of the body into the file name: `css/base.css` -> `css/base.<hash>.css`"""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{hashlib.blake2b(body, digest_size=5).hexdigest()}{extension}"
+
+
+class AssetManifest:
+    """Maps assets to their fingerprinted URLs and stores the content served under them
+
+    Attributes:
+        urls: Mapping of each asset (and bundle) to its fingerprinted URL
+        bundles: Mapping of each bundle to the URLs templates should link to. Either the URL of
+            the bundle itself or those of its individual assets when bundling is disabled.
+        files: Mapping of each fingerprinted URL to its body and content type
+        sources: Mapping of each asset to its original body, as served under its unversioned URL.
+            Differs from the fingerprinted body for stylesheets, whose references are rewritten.
+    """
+
+    def __init__(self):
+        self.urls = {}
+        self.bundles = {}
+        self.files = {}
+        self.sources = {}
+
+    def add(self, path : str, body : bytes) -> str:
+        """Adds an asset and returns its fingerprinted URL"""
+        url = URL_PREFIX + fingerprint(path, body)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+        self.urls[path] = url
+        self.files[url] = (body, content_type)
+
+        return url
+
+    def url(self, path : str) -> str:
+        """Returns the fingerprinted URL of an asset
+
+        Falls back to the regular, unversioned, URL for assets outside of the manifest
+        """
+        return self.urls.get(path) or URL_PREFIX + path
+
+    def bundle(self, name : str) -> list[str]:
+        """Returns the URLs to link to for the given bundle"""
+        return self.bundles[name]
+
+
+def build(directory : str, extra_assets : dict[str, bytes] | None = None, bundle : bool = True) -> AssetManifest:
+    """Hashes every asset within the directory and concatenates the bundles
+
+    Args:
+        directory: Directory of the assets. Served under /assets/
+        extra_assets: Assets generated at runtime that aren't stored within the directory.
+            Mapping of path (relative to the assets directory) to body.
+        bundle: Whether to concatenate the bundles or to link to their assets individually.
+    """
+    sources = {}
+
+    for parent, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            path = os.path.join(parent, file_name)
+
+            with open(path, "rb") as file:
+                sources[os.path.relpath(path, directory).replace(os.sep, "/")] = file.read()
+
+    if extra_assets:
+        sources.update(extra_assets)
+
+    manifest = AssetManifest()
+    manifest.sources = dict(sources)
+
+    # Stylesheets reference other assets, which must be fingerprinted first as to point to their
+    # new URLs. Otherwise an update to a font wouldn't reach clients which cached the stylesheet.
+    stylesheets = {}
+
+    for path, body in sources.items():
+        if path.endswith(".css"):
+            stylesheets[path] = body
+        else:
+            manifest.add(path, body)
+
+    def replace_url(match):
+        quote, path = match.group(1), match.group(2).decode()
+        return b"url(%s%s%s)" % (quote, manifest.url(path).encode(), quote)
+
+    for path, body in stylesheets.items():
+        sources[path] = CSS_URL_PATTERN.sub(replace_url, body)
+        manifest.add(path, sources[path])
+
+    for name, paths in BUNDLES.items():
+        if bundle:
+            separator = BUNDLE_SEPARATORS[os.path.splitext(name)[1]]
+            body = separator.join(sources[path] for path in paths)
+
+            manifest.bundles[name] = [manifest.add(f"bundles/{name}", body)]
+        else:
+            manifest.bundles[name] = [manifest.url(path) for path in paths]
+
+    return manifest
@@ -0,0 +1,135 @@
+"""Response compression
+
+Responses are compressed with the best encoding accepted by the client out of the ones available.
+gzip is always available, while brotli and zstd depend on the optional `brotli` and `zstandard`
+packages.
+"""
+
+import gzip
+import functools
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content types worth compressing. Images (other than SVGs), fonts, audio and video already are.
+COMPRESSIBLE_CONTENT_TYPES = frozenset((
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/rss+xml",
+    "image/svg+xml",
+))
+
+# Highest level of each encoding. Used for static assets which only get compressed once.
+MAXIMUM_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+
+
+def _compress_gzip(data, level):
+    # mtime is fixed as for the output to only depend on the input
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_brotli(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _compress_zstd(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+# Available encodings, ordered by preference
+ENCODERS = {}
+
+if brotli:
+    ENCODERS["br"] = _compress_brotli
+
+if zstandard:
+    ENCODERS["zstd"] = _compress_zstd
+
+ENCODERS["gzip"] = _compress_gzip
+
+
+@functools.lru_cache(maxsize=256)
+def negotiate(accept_encoding : str | None) -> str | None:
+    """Returns the preferred encoding out of the ones listed within the Accept-Encoding header
+
+    None is returned when the client doesn't accept any of the available encodings.
+    Memoized as browsers send one of only a few distinct values.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+
+    for item in accept_encoding.split(","):
+        name, _, parameters = item.partition(";")
+        quality = 1.0
+
+        parameters = parameters.strip()
+        if parameters.startswith("q="):
+            try:
+                quality = float(parameters[2:])
+            except ValueError:
+                continue
+
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0)
+
+    for encoding in ENCODERS:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+
+    return None
+
+
+def is_compressible(content_type : str | None) -> bool:
+    """Checks whether responses of the given content type (with or without parameters) are worth compressing"""
+    if not content_type:
+        return False
+
+    return content_type.partition(";")[0].strip().lower() in COMPRESSIBLE_CONTENT_TYPES
+
+
+def compress(data : bytes, encoding : str, level : int | None = None) -> bytes:
+    """Compresses data with the given encoding. Defaults to the highest level"""
+    if level is None:
+        level = MAXIMUM_LEVELS[encoding]
+
+    return ENCODERS[encoding](data, min(level, MAXIMUM_LEVELS[encoding]))
+
+
+def compress_response(request, response, minimum_size : int, level : int):
+    """Compresses the body of the response in place when applicable"""
+    body = response.body
+
+    if (
+        not body
+        or len(body) < minimum_size
+        or request.method == "HEAD"
+        or "content-encoding" in response.headers
+        or not is_compressible(response.content_type)
+    ):
+        return
+
+    # Caches must store the compressed and uncompressed responses separately
+    response.headers.add("vary", "accept-encoding")
+
+    if not (encoding := negotiate(request.headers.get("accept-encoding"))):
+        return
+
+    response.body = compress(body, encoding, level)
+    response.headers["content-encoding"] = encoding
+
+    if "content-length" in response.headers:
+        response.headers["content-length"] = str(len(response.body))
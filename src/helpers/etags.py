@@ -0,0 +1,125 @@
+"""Per-request ETags derived from the cache entries each response is built from
+
+Every cache lookup made while handling a request adds the identity of the entry it found (its key,
+model version and the time it was written) into the Validator bound to the request. The ETag is
+the hash of those identities on top of the request's path, query, preferences and the build of
+Priviblur serving it.
+
+As such the client's ETag can be compared right as each entry is found, ahead of the entry
+being rebuilt into models and the page rendered. Once it matches NotModified is raised, which
+is answered with 304 Not Modified.
+
+Responses built from anything not cached (Tumblr's response when the cache is disabled, for
+instance) are left without an ETag.
+"""
+
+import hashlib
+import contextvars
+
+from ..exceptions import exceptions
+
+_current_validator = contextvars.ContextVar("etag_validator", default=None)
+
+
+def parse_if_none_match(header):
+    """Returns the opaque tags within the If-None-Match header. Weak and strong tags are treated alike"""
+    tags = set()
+
+    for tag in header.split(","):
+        tag = tag.strip()
+
+        if tag.startswith("W/"):
+            tag = tag[2:]
+
+        tags.add(tag.strip('"'))
+
+    return tags
+
+
+class Validator:
+    """Accumulates the identities of the cache entries used to build the current response"""
+    __slots__ = ("request", "fingerprint", "if_none_match", "hash", "cacheable")
+
+    def __init__(self, request, fingerprint):
+        self.request = request
+        self.fingerprint = fingerprint
+
+        if if_none_match := request.headers.get("if-none-match"):
+            self.if_none_match = parse_if_none_match(if_none_match)
+        else:
+            self.if_none_match = None
+
+        self.hash = None
+        self.cacheable = True
+
+    def add(self, *identity):
+        """Adds the identity of a cache entry. Raises NotModified when the client's copy is still valid"""
+        if self.hash is None:
+            # Only computed once needed, as most requests (media, assets) never reach the cache
+            request = self.request
+            self.hash = hashlib.blake2b(
+                f"{self.fingerprint}\0{request.path}\0{request.query_string}\0{request.ctx.preferences!r}".encode(),
+                digest_size=12
+            )
+
+        self.hash.update("\0".join(str(part) for part in identity).encode() + b"\n")
+
+        if self.cacheable and self.if_none_match and self.hash.hexdigest() in self.if_none_match:
+            raise exceptions.NotModified(self.etag())
+
+    def mark_uncacheable(self):
+        self.cacheable = False
+
+    def reset(self):
+        self.hash = None
+        self.cacheable = True
+
+    def etag(self):
+        if self.cacheable and self.hash is not None:
+            return f'W/"{self.hash.hexdigest()}"'
+
+        return None
+
+
+def begin(request, fingerprint):
+    """Binds a new Validator to the current request
+
+    Must be called at the start of every request, as requests over a keep-alive connection share
+    the same context. Only GET and HEAD requests are validated.
+    """
+    if request.method in ("GET", "HEAD"):
+        validator = Validator(request, fingerprint)
+    else:
+        validator = None
+
+    _current_validator.set(validator)
+    return validator
+
+
+def add(*identity):
+    """Adds the identity of a cache entry the current response is built from. See Validator.add()"""
+    if (validator := _current_validator.get()) is not None:
+        validator.add(*identity)
+
+
+def mark_uncacheable():
+    """Marks the current response as built from data that can't be validated"""
+    if (validator := _current_validator.get()) is not None:
+        validator.mark_uncacheable()
+
+
+def reset():
+    """Discards the identities added so far
+
+    For responses which are cached as a whole, whose own identity replaces the ones of the
+    entries they were built from.
+    """
+    if (validator := _current_validator.get()) is not None:
+        validator.reset()
+
+
+def current_etag():
+    if (validator := _current_validator.get()) is not None:
+        return validator.etag()
+
+    return None
@@ -1,8 +1,11 @@
 """Extensions to npf-renderer to allow asynchronous code and some other custom styling"""
 
+import time
+
 import dominate
 import npf_renderer
 
+from . import metrics, timing
 from .helpers import url_handler
 
 
@@ -184,6 +187,8 @@ async def format_npf(contents, layouts=None, blog_name=None, post_id=None,*, pol
         post_id:
             Unique ID of the post. This is used to render links to the parent post
     """
+    render_start = time.perf_counter()
+
     try:
         contents = await NPFParser(contents, poll_callback=poll_callback).parse()
         if layouts:
@@ -207,4 +212,10 @@ async def format_npf(contents, layouts=None, blog_name=None, post_id=None,*, pol
         formatted = dominate.tags.div(cls="post-body has-error")
         contains_render_errors = True
 
-    return contains_render_errors, formatted.render(pretty=False)
+    rendered = formatted.render(pretty=False)
+
+    render_time = time.perf_counter() - render_start
+    metrics.REGISTRY.histogram("priviblur_npf_render_seconds").observe(render_time)
+    timing.record("npf", render_time)
+
+    return contains_render_errors, rendered
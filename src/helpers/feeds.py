@@ -0,0 +1,140 @@
+"""RSS feeds of blogs and tags
+
+Feeds are rendered from the first page of posts, and cached on their own as a whole document.
+See cache/rss_feeds.py
+"""
+
+import re
+import email.utils
+from typing import NamedTuple, Optional, Sequence
+
+import sanic
+
+from . import ext_npf_renderer
+from .. import priviblur_extractor
+
+# Content blocks rendered per item, shared between the post's trail and its own content.
+# Feed readers poll often while the rest of a long post is a click away.
+MAX_BLOCKS_PER_ITEM = 20
+
+# Links within rendered posts are relative to Priviblur, which feed readers can't resolve
+RELATIVE_URL_PATTERN = re.compile(r'(\s(?:src|href|poster)=")/(?!/)')
+
+
+class FeedItem(NamedTuple):
+    title: str
+    link: str
+    published: Optional[str]
+    tags: Sequence[str]
+    description: str
+
+
+def get_base_url(request) -> str:
+    """Returns the absolute URL of the instance
+
+    Taken from the configured domain. Otherwise falls back to the request, whose Host header is
+    controlled by the client. Feeds are then not cached. See cache/rss_feeds.py
+    """
+    deployment = request.app.ctx.PRIVIBLUR_CONFIG.deployment
+
+    if deployment.domain:
+        return f"{'https' if deployment.https else 'http'}://{deployment.domain}"
+
+    return f"{'https' if deployment.https else request.scheme}://{request.host}"
+
+
+async def render_post_content(post, max_blocks : int = MAX_BLOCKS_PER_ITEM) -> str:
+    """Renders the trail and content of a post, up to `max_blocks` content blocks in total"""
+    rendered = []
+    remaining_blocks = max_blocks
+
+    for section in (*post.trail, post):
+        content, layout = section.content, section.layout
+
+        if not content:
+            continue
+
+        if remaining_blocks <= 0:
+            break
+
+        if len(content) > remaining_blocks:
+            # Layouts refer to blocks by their index
+            content, layout = content[:remaining_blocks], None
+
+        remaining_blocks -= len(content)
+
+        _, rendered_section = await ext_npf_renderer.format_npf(content, layout, post.blog.name, post.id)
+        rendered.append(rendered_section)
+
+    return "".join(rendered)
+
+
+async def create_items(request, elements) -> list[FeedItem]:
+    """Creates feed items out of the posts within the given timeline elements"""
+    base_url = get_base_url(request)
+    items = []
+
+    for element in elements:
+        if not isinstance(element, priviblur_extractor.models.post.Post) or element.is_advertisement:
+            continue
+
+        link = f"{base_url}/{element.blog.name}/{element.id}"
+        if element.slug:
+            link += f"/{element.slug}"
+
+        description = RELATIVE_URL_PATTERN.sub(rf'\1{base_url}/', await render_post_content(element))
+
+        items.append(FeedItem(
+            title=element.summary.strip() or f"@{element.blog.name}",
+            link=link,
+            # Dates parsed from Tumblr are naive and in local time
+            published=email.utils.format_datetime(element.date.astimezone()) if element.date else None,
+            tags=element.tags,
+            description=description,
+        ))
+
+    return items
+
+
+async def render_feed(request, title : str, path : str, description : str, elements) -> str:
+    """Renders a RSS feed of the posts within the given timeline elements
+
+    `path` is the path of the page the feed mirrors
+    """
+    base_url = get_base_url(request)
+
+    template = request.app.ext.environment.get_template("feeds/rss.jinja")
+
+    return await template.render_async(
+        app=request.app,
+        title=title,
+        link=base_url + path,
+        feed_url=base_url + request.path,
+        description=description,
+        items=await create_items(request, elements),
+    )
+
+
+def feed_response(request, document : str, rendered_at : float):
+    """Creates the response of a feed. Answers If-Modified-Since with 304 Not Modified
+
+    ETags are handled by helpers/etags.py
+    """
+    last_modified = email.utils.formatdate(rendered_at, usegmt=True)
+
+    # If-Modified-Since is ignored when If-None-Match is present
+    if (
+        "if-none-match" not in request.headers
+        and (if_modified_since := request.headers.get("if-modified-since"))
+    ):
+        try:
+            if email.utils.parsedate_to_datetime(if_modified_since).timestamp() >= int(rendered_at):
+                return sanic.response.empty(status=304, headers={"last-modified": last_modified})
+        except (TypeError, ValueError):
+            pass
+
+    return sanic.response.text(
+        document,
+        content_type="application/rss+xml; charset=utf-8",
+        headers={"last-modified": last_modified},
+    )
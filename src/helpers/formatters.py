@@ -0,0 +1,84 @@
+"""Locale bound Babel formatters used by templates
+
+babel.numbers.format_decimal() and co. parse the given locale identifier and look up its
+patterns on every call. Here each locale instead gets a single Formatters object holding the
+parsed babel.Locale and its resolved patterns.
+
+Formatted values are additionally memoized, as the same values (note counts, the dates of
+cached posts) are formatted over and over again across pages.
+"""
+
+import functools
+
+import babel
+import babel.dates
+import babel.lists
+import babel.numbers
+
+# Amount of formatted values memoized per formatter and locale
+FORMAT_CACHE_SIZE = 4096
+
+
+class Formatters:
+    """Formatters bound to a single locale"""
+    def __init__(self, locale : str) -> None:
+        self.locale = babel.Locale.parse(locale)
+        self.decimal_pattern = babel.numbers.parse_pattern(self.locale.decimal_formats[None])
+
+        self._format_decimal = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self._format_decimal)
+        self._format_date = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self._format_date)
+        self._format_datetime = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self._format_datetime)
+        self._format_list = functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)(self._format_list)
+
+    def _format_decimal(self, number):
+        return self.decimal_pattern.apply(number, self.locale)
+
+    def _format_date(self, date):
+        return babel.dates.format_date(date, locale=self.locale)
+
+    def _format_datetime(self, datetime, tzinfo):
+        return babel.dates.format_datetime(datetime, locale=self.locale)
+
+    def _format_list(self, items):
+        return babel.lists.format_list(items, locale=self.locale)
+
+    def format_decimal(self, number):
+        return self._format_decimal(number)
+
+    def format_date(self, date):
+        # Only the date itself is formatted. Posts from the same day share an entry.
+        if hasattr(date, "date"):
+            date = date.date()
+
+        return self._format_date(date)
+
+    def format_datetime(self, datetime):
+        # Aware datetimes of the same instant compare equal regardless of their timezone,
+        # as such it is made part of the key.
+        return self._format_datetime(datetime, datetime.tzinfo)
+
+    def format_list(self, items):
+        return self._format_list(tuple(items))
+
+
+@functools.cache
+def get_formatters(locale : str) -> Formatters:
+    return Formatters(locale)
+
+
+# Drop-in replacements of the Babel functions for use as Jinja filters
+
+def format_decimal(number, locale="en_US"):
+    return get_formatters(locale).format_decimal(number)
+
+
+def format_date(date, locale="en_US"):
+    return get_formatters(locale).format_date(date)
+
+
+def format_datetime(datetime, locale="en_US"):
+    return get_formatters(locale).format_datetime(datetime)
+
+
+def format_list(items, locale="en_US"):
+    return get_formatters(locale).format_list(items)
@@ -1,5 +1,7 @@
-import datetime
+import re
 import copy
+import datetime
+import functools
 import urllib.parse
 from typing import Sequence
 
@@ -24,15 +26,50 @@ def is_tumblr_url(url : str | urllib.parse.ParseResult):
     return False
 
 
-def url_handler(url : str | urllib.parse.ParseResult):
-    """Change URLs found in posts to privacy-friendly alternatives"""
-    if isinstance(url, str):
-        url = urllib.parse.urlparse(url)
-    elif isinstance(url, urllib.parse.ParseResult):
-        url = url
+# Plain http(s) URLs without any port, credentials or path parameters. These can be split into
+# their hostname and path without a full urllib.parse.urlparse(). Anything else takes the slow path.
+SIMPLE_URL_PATTERN = re.compile(r"https?://([A-Za-z0-9.-]+)(/[^?#;\s]*)?(?:[?#]\S*)?")
+
+# Amount of URLs memoized by url_handler()
+URL_HANDLER_CACHE_SIZE = 8192
+
+
+def _handle_tumblr_url(hostname, path):
+    """Returns the local equivalent of an URL under tumblr.com"""
+    if hostname.endswith(".media.tumblr.com"):
+        sub_domains = hostname.split(".")
+        if sub_domains[1] == "media":
+            return f"/tblr/media/{sub_domains[0]}{path}"
+        elif sub_domains[0] == "www" and sub_domains[2] == "media":
+            return f"/tblr/media/{sub_domains[1]}{path}"
+
+    # Continue down the chain when the above doesn't match
+    if hostname.endswith("assets.tumblr.com"):
+        return f"/tblr/assets{path}"
+    elif hostname.endswith("static.tumblr.com"):
+        return f"/tblr/static{path}"
+    elif hostname.startswith("a."):
+        return f"/tblr/a{path}"
     else:
-        raise ValueError
+        # Check for subdomain blog
+        sub_domains = hostname.split(".")
+
+        if sub_domains[0] == "www":
+            potential_blog_name = sub_domains[1]
+        else:
+            potential_blog_name = sub_domains[0]
+
+        # Check if blog
+        if potential_blog_name != "tumblr":
+            if path.startswith("/post"):
+                return f"/{potential_blog_name}{path[5:]}"
+            else:
+                return f"/{potential_blog_name}{path}"
+        else:
+            return f"{path}"
 
+
+def _handle_parsed_url(url : urllib.parse.ParseResult):
     hostname = url.hostname
 
     # Redirects links can have malformed URLs such as https://href.li/?http://
@@ -49,41 +86,37 @@ def url_handler(url : str | urllib.parse.ParseResult):
         pass
 
     if hostname.endswith("tumblr.com"):
-        if hostname.endswith(".media.tumblr.com"):
-            sub_domains = hostname.split(".")
-            if sub_domains[1] == "media":
-                return f"/tblr/media/{sub_domains[0]}{url.path}"
-            elif sub_domains[0] == "www" and sub_domains[2] == "media":
-                return f"/tblr/media/{sub_domains[1]}{url.path}"
-
-        # Continue down the chain when the above doesn't match
-        if hostname.endswith("assets.tumblr.com"):
-            return f"/tblr/assets{url.path}"
-        elif hostname.endswith("static.tumblr.com"):
-            return f"/tblr/static{url.path}"
-        elif hostname.startswith("a."):
-            return f"/tblr/a{url.path}"
-        else:
-            # Check for subdomain blog
-            sub_domains = hostname.split(".")
-
-            if sub_domains[0] == "www":
-                potential_blog_name = sub_domains[1]
-            else:
-                potential_blog_name = sub_domains[0]
-
-            # Check if blog
-            if potential_blog_name != "tumblr":
-                if url.path.startswith("/post"):
-                    return f"/{potential_blog_name}{url.path[5:]}"
-                else:
-                    return f"/{potential_blog_name}{url.path}"
-            else:
-                return f"{url.path}"
+        return _handle_tumblr_url(hostname, url.path)
 
     return url.geturl()
 
 
+@functools.lru_cache(maxsize=URL_HANDLER_CACHE_SIZE)
+def _handle_url(url : str):
+    # Fast path for the media, assets and blog URLs making up most of the URLs within posts
+    if match := SIMPLE_URL_PATTERN.fullmatch(url):
+        hostname = match[1].lower()
+
+        if hostname.endswith("tumblr.com"):
+            return _handle_tumblr_url(hostname, match[2] or "")
+
+    return _handle_parsed_url(urllib.parse.urlparse(url))
+
+
+def url_handler(url : str | urllib.parse.ParseResult):
+    """Change URLs found in posts to privacy-friendly alternatives
+
+    Results for string URLs are memoized, as the same URLs tend to be repeated across
+    posts, trails and pages.
+    """
+    if isinstance(url, str):
+        return _handle_url(url)
+    elif isinstance(url, urllib.parse.ParseResult):
+        return _handle_parsed_url(url)
+    else:
+        raise ValueError
+
+
 def create_reblog_attribution_link(post):
     """Creates an attribution of who the author reblogged the post from"""
     reblog_from_url = urllib.parse.urlparse(post.reblog_from.post_url)
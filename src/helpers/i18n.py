@@ -1,20 +1,64 @@
 import sys
 import gettext
 import typing
+import functools
 
 import sanic
 
 from .i18n_data import LOCALE_DATA
 
 
+class Translator:
+    """Translates messages into a single language
+
+    Messages are resolved through gettext (and its fallbacks) only once, after which they're
+    served out of a flat dictionary. The translator of the current language is bound to each
+    request as `request.ctx.translate`. See bind_language()
+    """
+    def __init__(self, gettext_instance, message_ids=()) -> None:
+        self.instance = gettext_instance
+
+        # Precompiled catalog of message id -> translated message
+        self.messages = {id: gettext_instance.gettext(id) for id in message_ids}
+
+    def __call__(self, id : str, number : int | float | None = None,
+                 substitution : str | dict | None = None) -> str:
+        if number is not None:
+            translated = self.instance.ngettext(id, f"{id}_plural", number)
+        else:
+            try:
+                translated = self.messages[id]
+            except KeyError:
+                translated = self.messages[id] = self.instance.gettext(id)
+
+        if substitution is None:
+            return translated
+        elif isinstance(substitution, str):
+            return translated.format(substitution)
+        elif isinstance(substitution, dict):
+            return translated.format(**substitution)
+
+        return translated
+
+
 class Language:
-    """Stores metadata about supported translations"""
-    def __init__(self, locale, gettext_instance,) -> None:
+    """Stores metadata about supported translations
+
+    The translations themselves are only loaded once first used.
+    """
+    def __init__(self, locale) -> None:
         self.locale = locale
-        self.instance = gettext_instance
 
         self.name, self.translation_percentage = LOCALE_DATA[locale]
 
+    @functools.cached_property
+    def instance(self):
+        return load_translations(self.locale)
+
+    @functools.cached_property
+    def translator(self):
+        return Translator(self.instance, get_message_ids())
+
 SUPPORTED_LANGUAGES = [
     "en_US", "cs_CZ", "fr", "ja", "uk", "zh_Hans", "zh_Hant", "es"
 ]
@@ -22,52 +66,59 @@ SUPPORTED_LANGUAGES = [
 SUPPORTED_LANGUAGES.sort()
 
 
-def initialize_locales() -> typing.Mapping[str, Language]:
-    """Initializes locales into GNUTranslations instances"""
-    try:
-        # Initialize english locale first so that we may use it as a fallback
+@functools.cache
+def load_translations(locale : str) -> gettext.GNUTranslations:
+    """Loads the translations of the given locale, falling back onto english"""
+    instance = gettext.translation("priviblur", localedir="locales", languages=(locale,))
+
+    if locale != "en_US":
+        instance.add_fallback(load_translations("en_US"))
+
+    return instance
 
-        english_instance = gettext.translation("priviblur", localedir="locales", languages=("en_US",))
 
-        languages = {
-            "en_US": Language("en_US", english_instance)
-        }
+@functools.cache
+def get_message_ids() -> tuple[str, ...]:
+    """Returns the id of every message
 
-        for locale in SUPPORTED_LANGUAGES:
-            if locale == "en_US":
-                continue
+    The english catalog holds every message. Their ids are used to precompile the catalogs
+    of each language. GNUTranslations doesn't expose its catalog publicly. Should that change,
+    messages will instead be compiled on first use.
+    """
+    return tuple(
+        id for id in getattr(load_translations("en_US"), "_catalog", ())
+        if isinstance(id, str) and id
+    )
 
-            instance = gettext.translation("priviblur", localedir="locales", languages=(locale,))
-            instance.add_fallback(english_instance)
 
-            languages[locale] = Language(locale, instance)
-    except FileNotFoundError as e:
-        print(
-            'Error: Unable to find locale files. '
-            'Did you forget to compile them?'
-        )
+def initialize_locales() -> typing.Mapping[str, Language]:
+    """Initializes the supported languages
+
+    Only checks for the presence of their compiled translations. Each catalog is loaded when first used.
+    """
+    for locale in SUPPORTED_LANGUAGES:
+        if not gettext.find("priviblur", localedir="locales", languages=(locale,)):
+            print(
+                'Error: Unable to find locale files. '
+                'Did you forget to compile them?'
+            )
 
-        sys.exit()
-    except Exception as e:
-        raise e
+            sys.exit()
 
-    return languages
+    return {locale: Language(locale) for locale in SUPPORTED_LANGUAGES}
 
 
 def translate(language : str, id : str, number : int | float | None = None,
               substitution : str | dict | None = None) -> str:
-    app = sanic.Sanic.get_app("Priviblur")
+    """Translates a message into the given language
 
-    gettext_instance = app.ctx.LANGUAGES[language].instance
-
-    if number is not None:
-        translated = gettext_instance.ngettext(id, f"{id}_plural", number)
-    else:
-        translated = gettext_instance.gettext(id)
+    Prefer the translator bound to the request (`request.ctx.translate`) where available
+    """
+    app = sanic.Sanic.get_app("Priviblur")
+    return app.ctx.LANGUAGES[language].translator(id, number, substitution)
 
-    if isinstance(substitution, str):
-        translated = translated.format(substitution)
-    elif isinstance(substitution, dict):
-        translated = translated.format(**substitution)
 
-    return translated
+def bind_language(request, language : str):
+    """Sets the language of the current request alongside the translator for it"""
+    request.ctx.language = language
+    request.ctx.translate = request.app.ctx.LANGUAGES[language].translator
@@ -0,0 +1,254 @@
+"""Process-wide metrics and their Prometheus exposition
+
+Each Sanic worker is a separate process with its own registry. Workers periodically
+publish a snapshot of their registry into a directory shared by every worker, which is
+then merged whenever /metrics is requested.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+
+import orjson
+
+from ..priviblur_extractor.helpers.metrics import MetricsRegistry
+
+# Environmental variable used to pass the shared snapshot directory down to the workers
+SNAPSHOT_DIRECTORY_ENV = "PRIVIBLUR_METRICS_SNAPSHOT_DIRECTORY"
+
+REGISTRY = MetricsRegistry()
+
+REGISTRY.describe("priviblur_requests_total", "Requests handled by Priviblur")
+REGISTRY.describe("priviblur_request_duration_seconds", "Time taken to respond to a request")
+REGISTRY.describe("priviblur_cache_requests_total", "Cache lookups grouped by their result")
+REGISTRY.describe("priviblur_media_proxy_bytes_total", "Bytes proxied from Tumblr's media servers")
+REGISTRY.describe("priviblur_media_proxy_active_streams", "Media responses currently being proxied")
+REGISTRY.describe("priviblur_npf_render_seconds", "Time taken to render NPF content into HTML")
+REGISTRY.describe("priviblur_event_loop_lag_seconds", "Delay between when a timer should and did fire")
+REGISTRY.describe(
+    "priviblur_event_loop_lag_current_seconds", "Most recently measured event loop lag. The highest across workers"
+)
+
+
+def record_request(request, response):
+    """Records the latency and status of a request under its blueprint"""
+    if (start := getattr(request.ctx, "request_start", None)) is None:
+        return
+
+    if request.route:
+        # <AppName>.[<BlueprintName>.]<HandlerName>
+        route_name_components = request.route.name.split(".")
+        blueprint = route_name_components[1] if len(route_name_components) > 2 else "app"
+    else:
+        blueprint = "none"
+
+    REGISTRY.histogram("priviblur_request_duration_seconds", {"blueprint": blueprint}).observe(
+        time.perf_counter() - start
+    )
+    REGISTRY.counter("priviblur_requests_total", {"blueprint": blueprint, "status": response.status}).inc()
+
+
+def record_cache_lookup(cache, result):
+    """Records the result ("hit", "miss" or "version_mismatch") of a cache lookup
+
+    "version_mismatch" is recorded when the cached entry was written by another models.VERSION
+    """
+    REGISTRY.counter("priviblur_cache_requests_total", {"cache": cache, "result": result}).inc()
+
+
+async def monitor_event_loop_lag(interval=0.5):
+    """Continuously measures how late the event loop is at waking up a sleeping task"""
+    loop = asyncio.get_running_loop()
+
+    histogram = REGISTRY.histogram("priviblur_event_loop_lag_seconds")
+    gauge = REGISTRY.gauge("priviblur_event_loop_lag_current_seconds", aggregation="max")
+
+    while True:
+        scheduled_at = loop.time()
+        await asyncio.sleep(interval)
+
+        lag = max(loop.time() - scheduled_at - interval, 0)
+        histogram.observe(lag)
+        gauge.set(lag)
+
+
+# Aggregation across workers
+
+def create_snapshot_directory():
+    """Creates the directory shared by the workers and exports its location to them"""
+    directory = tempfile.mkdtemp(prefix="priviblur-metrics-")
+    os.environ[SNAPSHOT_DIRECTORY_ENV] = directory
+
+    return directory
+
+
+def get_snapshot_directory():
+    return os.environ.get(SNAPSHOT_DIRECTORY_ENV)
+
+
+def publish_snapshot(directory):
+    """Atomically writes the snapshot of this worker's registry into the shared directory"""
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    temporary_path = f"{path}.tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(orjson.dumps(REGISTRY.snapshot()))
+
+    os.replace(temporary_path, path)
+
+
+def remove_snapshot(directory):
+    try:
+        os.remove(os.path.join(directory, f"{os.getpid()}.json"))
+    except FileNotFoundError:
+        pass
+
+
+async def publish_snapshots_periodically(directory, interval):
+    while True:
+        await asyncio.sleep(interval)
+        publish_snapshot(directory)
+
+
+def collect_snapshots(directory, max_age):
+    """Reads every worker's snapshot within the directory
+
+    Gauges from snapshots older than `max_age` seconds are dropped as they likely
+    belong to a worker that is no longer around.
+    """
+    snapshots = []
+    now = time.time()
+
+    for file_name in os.listdir(directory):
+        if not file_name.endswith(".json"):
+            continue
+
+        path = os.path.join(directory, file_name)
+
+        try:
+            with open(path, "rb") as file:
+                snapshot = orjson.loads(file.read())
+            is_stale = (now - os.path.getmtime(path)) > max_age
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            continue
+
+        if is_stale:
+            snapshot["gauges"] = []
+
+        snapshots.append(snapshot)
+
+    return snapshots
+
+
+def merge_snapshots(snapshots):
+    """Merges the snapshots of multiple registries into one"""
+    histograms = {}
+    counters = {}
+    gauges = {}
+    descriptions = {}
+
+    for snapshot in snapshots:
+        descriptions.update(snapshot["descriptions"])
+
+        for histogram in snapshot["histograms"]:
+            key = (histogram["name"], tuple(sorted(histogram["labels"].items())))
+
+            if (merged := histograms.get(key)) is None:
+                histograms[key] = {**histogram, "counts": list(histogram["counts"])}
+            else:
+                merged["counts"] = [a + b for a, b in zip(merged["counts"], histogram["counts"])]
+                merged["sum"] += histogram["sum"]
+                merged["count"] += histogram["count"]
+
+        for counter in snapshot["counters"]:
+            key = (counter["name"], tuple(sorted(counter["labels"].items())))
+
+            if (merged := counters.get(key)) is None:
+                counters[key] = dict(counter)
+            else:
+                merged["value"] += counter["value"]
+
+        for gauge in snapshot["gauges"]:
+            key = (gauge["name"], tuple(sorted(gauge["labels"].items())))
+
+            if (merged := gauges.get(key)) is None:
+                gauges[key] = dict(gauge)
+            elif gauge["aggregation"] == "max":
+                merged["value"] = max(merged["value"], gauge["value"])
+            else:
+                merged["value"] += gauge["value"]
+
+    return {
+        "histograms": list(histograms.values()),
+        "counters": list(counters.values()),
+        "gauges": list(gauges.values()),
+        "descriptions": descriptions,
+    }
+
+
+# Prometheus text exposition format
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels.items())
+    if extra:
+        pairs.append(extra)
+
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in pairs) + "}"
+
+
+def _format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def render_prometheus(snapshot):
+    """Renders a (merged) snapshot in Prometheus' text exposition format"""
+    lines = []
+    descriptions = snapshot["descriptions"]
+
+    def group_by_name(metrics):
+        grouped = {}
+        for metric in metrics:
+            grouped.setdefault(metric["name"], []).append(metric)
+        return sorted(grouped.items())
+
+    def add_header(name, type_):
+        if description := descriptions.get(name):
+            lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {type_}")
+
+    for name, histograms in group_by_name(snapshot["histograms"]):
+        add_header(name, "histogram")
+
+        for histogram in histograms:
+            labels = histogram["labels"]
+
+            cumulative_count = 0
+            for upper_bound, count in zip((*histogram["buckets"], "+Inf"), histogram["counts"]):
+                cumulative_count += count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', upper_bound))} {cumulative_count}")
+
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+
+    for name, counters in group_by_name(snapshot["counters"]):
+        add_header(name, "counter")
+        for counter in counters:
+            lines.append(f"{name}{_format_labels(counter['labels'])} {_format_number(counter['value'])}")
+
+    for name, gauges in group_by_name(snapshot["gauges"]):
+        add_header(name, "gauge")
+        for gauge in gauges:
+            lines.append(f"{name}{_format_labels(gauge['labels'])} {_format_number(gauge['value'])}")
+
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,125 @@
+"""Preload hints for the resources pages depend on
+
+Pages are only sent once Tumblr responds, and the browser only discovers the stylesheets, scripts
+and images they reference once it starts parsing them. Instead these resources are listed within
+`Link: rel=preload` headers, and optionally within a 103 Early Hints response sent as soon as the
+request arrives, ahead of fetching Tumblr.
+
+The banner and avatar of a blog are only known once the blog is fetched. As such they're
+remembered per blog and hinted early on subsequent visits.
+"""
+
+import collections
+
+from . import helpers
+
+
+def format_link(url : str, destination : str) -> str:
+    return f"<{url}>; rel=preload; as={destination}"
+
+
+class BlogImageHints:
+    """Least recently used mapping of blog name to the preload links of its banner and avatar"""
+
+    def __init__(self, max_size : int):
+        self.max_size = max_size
+        self.links = collections.OrderedDict()
+
+    def get(self, blog : str) -> tuple[str, ...]:
+        if (links := self.links.get(blog)) is not None:
+            self.links.move_to_end(blog)
+            return links
+
+        return ()
+
+    def remember(self, blog : str, links : tuple[str, ...]):
+        self.links[blog] = links
+        self.links.move_to_end(blog)
+
+        if len(self.links) > self.max_size:
+            self.links.popitem(last=False)
+
+
+def is_navigation(request) -> bool:
+    """Checks whether the request is for a page, rather than for a subresource or from a script"""
+    return request.method == "GET" and "text/html" in request.headers.get("accept", "")
+
+
+def begin(request, static_links : tuple[str, ...], blog_image_hints : BlogImageHints, early_hints : bool):
+    """Starts collecting the preload links of the current request
+
+    Routes flagged with `ctx_blog_header=True` additionally hint the images of the blog
+    remembered from previous visits. When enabled, the links are sent within a 103
+    Early Hints response right away.
+    """
+    if not is_navigation(request):
+        request.ctx.preload_links = None
+        return
+
+    links = list(static_links)
+    remembered_links = ()
+
+    if request.route and getattr(request.route.ctx, "blog_header", False) and (blog := request.match_info.get("blog")):
+        remembered_links = blog_image_hints.get(blog)
+        links.extend(remembered_links)
+
+    # Replaced by add_blog_images() once the blog's current images are known
+    request.ctx.remembered_blog_links = remembered_links
+
+    request.ctx.preload_links = links
+
+    # Sanic has no API for informational responses, as such it is written directly to the connection.
+    # HTTP/1.1 clients must accept any amount of them ahead of the final response.
+    if early_hints and links and request.version == "1.1" and request.transport:
+        request.transport.write(
+            b"HTTP/1.1 103 Early Hints\r\n"
+            + "".join(f"link: {link}\r\n" for link in links).encode()
+            + b"\r\n"
+        )
+
+
+def add_blog_images(request, blog_info, blog_image_hints : BlogImageHints):
+    """Adds the banner and avatar of the blog shown in the blog header to the current response's links
+
+    Links remembered from previous visits that no longer match (such as after the blog changed its
+    avatar) are removed. Also remembers them as to be hinted early on subsequent visits of the blog
+    """
+    if getattr(request.ctx, "preload_links", None) is None:
+        return
+
+    links = []
+
+    theme = blog_info.theme
+    header_info = theme.header_info if theme else None
+
+    if header_info and (header_image := header_info.focused_header_image):
+        links.append(format_link(helpers.url_handler(header_image), "image"))
+
+    if len(blog_info.avatar) >= 2:
+        links.append(format_link(helpers.url_handler(blog_info.avatar[-2].url), "image"))
+
+    links = tuple(links)
+
+    if blog := request.match_info.get("blog"):
+        blog_image_hints.remember(blog, links)
+
+    outdated_links = set(getattr(request.ctx, "remembered_blog_links", ())).difference(links)
+    preload_links = [link for link in request.ctx.preload_links if link not in outdated_links]
+
+    for link in links:
+        if link not in preload_links:
+            preload_links.append(link)
+
+    request.ctx.preload_links = preload_links
+
+
+def to_header(request, response) -> str | None:
+    """Returns the value of the Link header for the response, if any"""
+    if (
+        not (links := getattr(request.ctx, "preload_links", None))
+        or response.status != 200
+        or not (response.content_type or "").startswith("text/html")
+    ):
+        return None
+
+    return ", ".join(links)
@@ -0,0 +1,61 @@
+"""Warms up upstream connections and caches once a worker starts serving. See /healthz/ready"""
+
+import asyncio
+
+import aiohttp
+
+from .. import cache
+
+
+async def open_connections(client : aiohttp.ClientSession, count : int) -> int:
+    """Opens up to `count` keep-alive connections within the pool of the given client
+
+    aiohttp has no means of opening connections by themselves. Instead `count` concurrent HEAD
+    requests are sent, whose connections are then released back into the pool.
+
+    Returns the amount of connections opened
+    """
+    async def open_connection():
+        try:
+            async with client.head("/", allow_redirects=False):
+                return True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    return sum(await asyncio.gather(*(open_connection() for _ in range(count))))
+
+
+async def prefetch_explore(ctx):
+    """Fetches the first page of the explore feeds into the cache
+
+    Returns the exceptions of the feeds that failed to be fetched
+    """
+    results = await asyncio.gather(
+        cache.get_explore_results(ctx, ctx.TumblrAPI.explore_trending, "trending", None),
+        cache.get_explore_results(ctx, ctx.TumblrAPI.explore_today, "today", None),
+        return_exceptions=True
+    )
+
+    return [result for result in results if isinstance(result, BaseException)]
+
+
+async def prewarm(ctx, clients):
+    """Prepares the worker for traffic: opens connections to each upstream host and fills the cache
+
+    Controlled by the prewarm_* options of the backend configuration.
+    """
+    backend = ctx.PRIVIBLUR_CONFIG.backend
+
+    if backend.prewarm_connections > 0:
+        opened = await asyncio.gather(
+            *(open_connections(client, backend.prewarm_connections) for client in clients)
+        )
+
+        ctx.LOGGER.debug(
+            "Prewarm: Opened %d out of %d upstream connections",
+            sum(opened), backend.prewarm_connections * len(clients)
+        )
+
+    if backend.prewarm_explore and ctx.CacheDb:
+        for error in await prefetch_explore(ctx):
+            ctx.LOGGER.warning("Prewarm: Unable to prefetch the explore feeds: %r", error)
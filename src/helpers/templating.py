@@ -0,0 +1,87 @@
+import os
+import urllib.parse
+import functools
+
+import jinja2
+
+from . import helpers, i18n, ext_npf_renderer, formatters, timing
+from .. import priviblur_extractor
+
+
+def create_environment(templates_path):
+    """Creates a Jinja environment configured like the one sanic-ext creates for the server
+
+    For use outside of the server, such as when compiling templates ahead of time. Compiled
+    templates are only keyed by their name and source within the bytecode cache, as such they
+    must be compiled by an identically configured environment (see setup_environment()).
+    """
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(templates_path),
+        autoescape=jinja2.select_autoescape(),
+        enable_async=True,
+    )
+
+
+def setup_environment(environment, config=None):
+    """Registers Priviblur's extensions, filters, globals and tests into the Jinja environment
+
+    `config` may be omitted outside of the server, in which case the options it controls are left disabled.
+    """
+    environment.add_extension("jinja2.ext.do")
+
+    if config and config.server_timing.enabled:
+        environment.template_class = timing.TimedTemplate
+
+    environment.filters["encodepathsegment"] = functools.partial(urllib.parse.quote, safe="")
+
+    environment.filters["update_query_params"] = helpers.update_query_params
+    environment.filters["remove_query_params"] = helpers.remove_query_params
+    environment.filters["deseq_urlencode"] = helpers.deseq_urlencode
+    environment.filters["ensure_single_prefix_slash"] = helpers.prefix_slash_in_url_if_missing
+
+    environment.filters["format_decimal"] = formatters.format_decimal
+    environment.filters["format_date"] = formatters.format_date
+    environment.filters["format_datetime"] = formatters.format_datetime
+
+    environment.filters["format_list"] = formatters.format_list
+
+    environment.globals["translate"] = i18n.translate
+    environment.globals["url_handler"] = helpers.url_handler
+    environment.globals["format_npf"] = ext_npf_renderer.format_npf
+    environment.globals["create_poll_callback"] = helpers.create_poll_callback
+    environment.globals["create_reblog_attribution"] = helpers.create_reblog_attribution_link
+
+    environment.tests["a_post"] = lambda element : isinstance(element, priviblur_extractor.models.post.Post)
+
+
+def setup_bytecode_cache(environment, directory) -> bool:
+    """Stores templates compiled by the environment within `directory`
+
+    The directory is shared between workers and kept across restarts. Templates are
+    therefore only compiled once for every change to their source.
+
+    Returns False, leaving the environment as is, when the directory isn't writable.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return False
+
+    if not os.access(directory, os.W_OK):
+        return False
+
+    environment.bytecode_cache = jinja2.FileSystemBytecodeCache(directory)
+    return True
+
+
+def load_templates(environment) -> int:
+    """Loads every template into the environment, compiling them when not already cached
+
+    Returns the amount of templates loaded
+    """
+    names = environment.list_templates(extensions=("jinja",))
+
+    for name in names:
+        environment.get_template(name)
+
+    return len(names)
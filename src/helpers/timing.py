@@ -0,0 +1,110 @@
+"""Per-request phase timings exposed through the Server-Timing header
+
+Timings are collected into the ServerTiming object bound to the request currently being
+handled. Code outside of a request (or requests that aren't being timed) will find no
+bound object, in which case `measure` does nothing.
+
+Phases can nest. The template render for instance includes the time spent formatting NPF
+content, which in turn may include fetching poll results.
+"""
+
+import time
+import ipaddress
+import contextvars
+
+import jinja2
+
+# Phase name -> human readable description
+PHASES = {
+    "prefs": "Preferences parsing",
+    "cache": "Cache lookup",
+    "upstream": "Upstream fetch",
+    "parse": "Parse",
+    "rebuild": "Model rebuild",
+    "npf": "NPF formatting",
+    "render": "Template render",
+    "total": "Total",
+}
+
+_current_timing = contextvars.ContextVar("server_timing", default=None)
+
+
+class ServerTiming:
+    """Accumulates the time spent on each phase of a request"""
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations = {}
+
+    def add(self, phase, duration):
+        self.durations[phase] = self.durations.get(phase, 0) + duration
+
+    def to_header(self):
+        entries = []
+        for phase, duration in self.durations.items():
+            entries.append(f'{phase};dur={duration * 1000:.2f};desc="{PHASES.get(phase, phase)}"')
+
+        return ", ".join(entries)
+
+
+class measure:
+    """Context manager timing the enclosed block as the given phase of the current request"""
+    __slots__ = ("phase", "timing", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+        self.timing = _current_timing.get()
+
+    def __enter__(self):
+        if self.timing is not None:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.timing is not None:
+            self.timing.add(self.phase, time.perf_counter() - self.start)
+
+
+def record(phase, duration):
+    """Adds an already measured duration to the given phase of the current request"""
+    if (timing := _current_timing.get()) is not None:
+        timing.add(phase, duration)
+
+
+def begin(enabled):
+    """Binds a new ServerTiming object to the current request when `enabled`
+
+    Must be called at the start of every request once Server-Timing is enabled, as requests over
+    a keep-alive connection share the same context.
+    """
+    timing = ServerTiming() if enabled else None
+    _current_timing.set(timing)
+
+    return timing
+
+
+def parse_trusted_networks(trusted_ips):
+    return tuple(ipaddress.ip_network(address, strict=False) for address in trusted_ips)
+
+
+def is_trusted(address, trusted_networks):
+    """Checks whether the given address falls within the trusted networks
+
+    An empty collection of trusted networks means every address is trusted
+    """
+    if not trusted_networks:
+        return True
+
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+
+    return any(address in network for network in trusted_networks)
+
+
+class TimedTemplate(jinja2.Template):
+    """Jinja template that records its render time into the current request"""
+
+    async def render_async(self, *args, **kwargs):
+        with measure("render"):
+            return await super().render_async(*args, **kwargs)
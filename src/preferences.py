@@ -1,12 +1,21 @@
+import functools
 import dataclasses
 import urllib.parse
 
-from .helpers.i18n import SUPPORTED_LANGUAGES
+from .helpers.i18n import SUPPORTED_LANGUAGES, bind_language
 
 VERSION = 1
 
-@dataclasses.dataclass
+# Amount of distinct settings cookies whose parsed preferences are memoized
+COOKIE_CACHE_SIZE = 1024
+
+@dataclasses.dataclass(frozen=True)
 class UserPreferences:
+    """Preferences of the current user
+
+    Instances are immutable. The defaults are created once and shared between requests,
+    as are the preferences parsed out of each distinct settings cookie.
+    """
     # See DefaultUserPreferences in config/user_preferences.py
     language: str
     theme: str
@@ -19,11 +28,13 @@ class UserPreferences:
         """Validates default user attribute values"""
         # Silently fallback when the language given is invalid
         # TODO raise error to the end-user and instance maintainer when necessary
+        #
+        # The dataclass is frozen, hence object.__setattr__
         if self.language not in SUPPORTED_LANGUAGES:
-            self.language = "en_US"
+            object.__setattr__(self, "language", "en_US")
 
         if self.theme not in ("auto", "light", "dark"):
-            self.theme = "auto"
+            object.__setattr__(self, "theme", "auto")
 
     def replace_from_forms(self, request) -> 'UserPreferences':
         """Returns updated UserPreferences class from POST form data"""
@@ -34,33 +45,51 @@ class UserPreferences:
         return self._replace(request, request.args)
 
     def replace_from_cookie(self, request) -> 'UserPreferences':
-        """Returns updated UserPreferences class from the settings cookie"""
-        request.ctx.invalid_settings_cookie = False
+        """Returns updated UserPreferences class from the settings cookie
+
+        Also binds the language of the resulting preferences to the request
+        """
+        new_preferences, invalid = self, False
+
+        if raw_prefs := request.cookies.get("settings"):
+            new_preferences, invalid = self._parse_cookie(raw_prefs)
+
+        request.ctx.invalid_settings_cookie = invalid
+        bind_language(request, new_preferences.language)
+
+        return new_preferences
+
+    @functools.lru_cache(maxsize=COOKIE_CACHE_SIZE)
+    def _parse_cookie(self, raw_prefs):
+        """Parses the settings cookie into updated UserPreferences
 
+        Returns the new preferences alongside whether the cookie is invalid. Memoized, as most
+        requests carry one of only a few distinct cookies.
+        """
         try:
-            if raw_prefs := request.cookies.get("settings"):
-                raw_prefs = urllib.parse.parse_qs(raw_prefs)
-                version = raw_prefs["version"][0]
-
-                if int(version) == VERSION:
-                    return self._replace(request, raw_prefs)
-                else:
-                    request.ctx.invalid_settings_cookie = True
+            raw_prefs = urllib.parse.parse_qs(raw_prefs)
+            version = raw_prefs["version"][0]
+
+            if int(version) == VERSION:
+                return self._updated(raw_prefs), False
         except (TypeError, KeyError, ValueError):
-            request.ctx.invalid_settings_cookie = True
-        
-        return self
+            pass
+
+        return self, True
 
     def _replace(self, request, raw_new_prefs):
         """Returns updated UserPreferences class from values in raw_new_prefs"""
-        # Get the field names of the UserPreferences dataclass
-        fields = tuple(field.name for field in dataclasses.fields(UserPreferences))
+        new_preferences = self._updated(raw_new_prefs)
+        bind_language(request, new_preferences.language)
+
+        return new_preferences
 
+    def _updated(self, raw_new_prefs):
         # Process Sanic's RequestParameters object to a dictionary
         # mapping the request argument to its first value.
         # Also skips over unknown fields.
         raw_new_prefs = {
-            key: value[0] for key, value in raw_new_prefs.items() if key in fields
+            key: value[0] for key, value in raw_new_prefs.items() if key in FIELD_NAMES
         }
 
         self.convert_value_to_python(raw_new_prefs)
@@ -68,10 +97,7 @@ class UserPreferences:
         # TODO provide an error message to the end user when an unknown field is set,
         # or when an value is invalid.
 
-        new_preferences = dataclasses.replace(self, **raw_new_prefs)
-        request.ctx.language = new_preferences.language
-
-        return new_preferences
+        return dataclasses.replace(self, **raw_new_prefs)
 
     def to_url_encoded(self):
         """Encodes user preferences as URL query parameters
@@ -123,3 +149,7 @@ class UserPreferences:
             cookie["domain"] = request.app.ctx.PRIVIBLUR_CONFIG.deployment.domain
 
         return cookie
+
+
+# Field names of the UserPreferences dataclass
+FIELD_NAMES = frozenset(field.name for field in dataclasses.fields(UserPreferences))
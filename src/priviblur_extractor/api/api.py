@@ -4,6 +4,8 @@ Inspired by Invidious' version for YouTube
 
 """
 import json
+import time
+import logging
 import urllib.parse
 from typing import Optional
 
@@ -13,6 +15,13 @@ from . import request_config as rconf
 from .. import helpers
 from ..helpers import exceptions
 
+# When logging, are we able to prettyprint the output? If so we shall
+try:
+    import prettyprinter
+    _format = prettyprinter.pformat
+except ImportError:
+    def _format(obj): return obj
+
 logger = helpers.LOGGER.getChild("api")
 
 
@@ -30,69 +39,136 @@ class TumblrAPI:
     }
 
     @classmethod
-    async def create(cls, client=None, main_request_timeout=10, json_loads=json.loads):
+    async def create(cls, client=None, main_request_timeout=10, json_loads=json.loads, metrics=None, url="https://www.tumblr.com",
+                     recorder=None):
         """Creates a Tumblr API instance with the given client. Automatically creates a client obj if not given."""
         if not client:
             main_request_timeout = aiohttp.ClientTimeout(main_request_timeout)
 
             client = aiohttp.ClientSession(
-                "https://www.tumblr.com",
+                url,
                 headers=cls.DEFAULT_HEADERS,
                 timeout=main_request_timeout  # TODO allow fine-tuning the different types of timeouts
             )
 
-        return cls(client, json_loads)
+        return cls(client, json_loads, metrics, recorder)
+
+    def __init__(self, client: aiohttp.ClientSession, json_loads=json.loads, metrics=None, recorder=None):
+        """Initializes a TumblrAPI instance with the given client
 
-    def __init__(self, client: aiohttp.ClientSession, json_loads=json.loads):
-        """Initializes a TumblrAPI instance with the given client"""
+        Upstream request metrics are recorded into `metrics`. A new registry is created when not given.
+
+        When a helpers.recorder.ResponseRecorder is given as `recorder` every response from Tumblr is
+        additionally written to its corpus.
+        """
         self.client = client
         self.json_loader = json_loads
-
-    async def _get_json(self, endpoint, url_params=None):
-        """Internal method that does the actual request to Tumblr"""
+        self.metrics = metrics if metrics is not None else helpers.metrics.MetricsRegistry()
+        self.recorder = recorder
+
+        self.metrics.describe("tumblr_api_time_to_headers_seconds", "Time until Tumblr's response headers are received")
+        self.metrics.describe("tumblr_api_response_bytes", "Size of the response body from Tumblr")
+        self.metrics.describe("tumblr_api_json_decode_seconds", "Time spent decoding the JSON response from Tumblr")
+        self.metrics.describe("tumblr_api_responses_total", "Responses received from Tumblr")
+
+    def _record_response(self, family, response, headers_received_in, body, decode_time):
+        """Records metrics about a response from Tumblr under the given endpoint family"""
+        labels = {"family": family}
+
+        self.metrics.histogram("tumblr_api_time_to_headers_seconds", labels).observe(headers_received_in)
+
+        if body is not None:
+            self.metrics.histogram(
+                "tumblr_api_response_bytes", {"family": family, "encoding": "identity"}, helpers.metrics.SIZE_BUCKETS
+            ).observe(len(body))
+
+            # aiohttp transparently decompresses the body, as such the size on the wire
+            # is only known when Tumblr reports it.
+            if response.headers.get("content-encoding") and (compressed_size := response.headers.get("content-length")):
+                self.metrics.histogram(
+                    "tumblr_api_response_bytes", {"family": family, "encoding": "compressed"}, helpers.metrics.SIZE_BUCKETS
+                ).observe(int(compressed_size))
+
+        if decode_time is not None:
+            self.metrics.histogram("tumblr_api_json_decode_seconds", labels).observe(decode_time)
+
+    def _record_status(self, family, status, error_code=None):
+        self.metrics.counter(
+            "tumblr_api_responses_total",
+            {"family": family, "status": status, "error_code": error_code if error_code is not None else ""}
+        ).inc()
+
+    def _record_to_corpus(self, endpoint, family, url_params, response, body):
+        def log_failure(future):
+            if error := future.exception():
+                logger.warning("Unable to record response from Tumblr: %r", error)
+
+        self.recorder.submit(
+            endpoint, family, url_params, response.status, self.client.headers, response.headers, body
+        ).add_done_callback(log_failure)
+
+    async def _get_json(self, endpoint, url_params=None, family=None):
+        """Internal method that does the actual request to Tumblr
+
+        `family` groups the metrics recorded from this request. Defaults to the endpoint itself.
+        """
         if url_params:
             url = f"{endpoint}?{urllib.parse.urlencode(url_params)}"
         else:
             url = f"{endpoint}"
 
-        # When logging, are we able to prettyprint the output? If so we shall
-        try:
-            import prettyprinter
-            _format = prettyprinter.pformat
-        except ImportError:
-            def _format(obj): return obj
+        family = family or endpoint
 
-        logger.info(f"Requesting endpoint: /api/v2/{url}")
+        logger.debug("Requesting endpoint: /api/v2/%s", url)
 
+        request_start = time.perf_counter()
         response = await self.client.get(f"/api/v2/{url}")
+        headers_received_in = time.perf_counter() - request_start
 
-        logger.debug(f"Requested endpoint: /api/v2/{url}")
+        body = None
+        decode_time = None
 
         try:
-            result = await response.json(loads=self.json_loader)
+            body = await response.read()
+
+            decode_start = time.perf_counter()
+            result = self.json_loader(body)
+            decode_time = time.perf_counter() - decode_start
         except Exception as e:
             logger.error("Failed to parse JSON response from Tumblr!")
-            logger.error(f"Got error: '{type(e).__name__}'. Reason: '{getattr(e, 'message', '')}'")
+            logger.error("Got error: '%s'. Reason: '%s'", type(e).__name__, getattr(e, 'message', ''))
+
+            self._record_response(family, response, headers_received_in, body, decode_time)
+            self._record_status(family, response.status)
 
             raise exceptions.InitialTumblrAPIParseException(getattr(e, 'message', ''))
 
+        self._record_response(family, response, headers_received_in, body, decode_time)
+
+        if self.recorder:
+            self._record_to_corpus(endpoint, family, url_params, response, body)
+
         # Invalid response handling
         if response.status != 200:
             message = result["meta"]["msg"]
             code = result["meta"]["status"]
 
-            logger.info(f"Error response received with HTTP status code: {code}")
-            logger.debug(f"Response headers: {_format(response.headers)}")
+            logger.info("Error response received with HTTP status code: %s", code)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", _format(response.headers))
 
             if error := result.get("errors"):
                 details = error[0].get('detail')
                 internal_code = error[0].get("code")
-                logger.info(f"Reason: {details}")
-                logger.info(f"Tumblr internal error code: {internal_code}")
+                logger.info("Reason: %s", details)
+                logger.info("Tumblr internal error code: %s", internal_code)
             else:
                 internal_code = None
                 details = ""
 
+            self._record_status(family, response.status, internal_code)
+
             match internal_code:
                 case 13001:
                     raise exceptions.TumblrRestrictedTagError(message, code, details, internal_code)
@@ -101,14 +177,16 @@ class TumblrAPI:
                 case 0:
                     raise exceptions.TumblrBlogNotFoundError(message, code, details, internal_code)
                 case _:
-                    logger.error(f"Unknown tumblr internal error code: {internal_code}")
+                    logger.error("Unknown tumblr internal error code: %s", internal_code)
                     raise exceptions.TumblrErrorResponse(message, code, details, internal_code)
 
+        self._record_status(family, response.status)
+
         return result
 
     async def explore(self):
         """Access the /explore endpoint"""
-        return await self._get_json("explore")
+        return await self._get_json("explore", family="explore")
 
     async def explore_trending(self, *, continuation: Optional[str] = None):
         """Requests the /explore/trending endpoint"""
@@ -120,7 +198,7 @@ class TumblrAPI:
 
         url_parameters["fields[blogs]"] = rconf.EXPLORE_BLOG_INFO_FIELDS
 
-        return await self._get_json("explore/trending", url_parameters)
+        return await self._get_json("explore/trending", url_parameters, family="explore_trending")
 
     async def explore_today(self, *, continuation: Optional[str] = None):
         """Requests the /explore/home/today endpoint"""
@@ -133,7 +211,7 @@ class TumblrAPI:
         if continuation:
             url_parameters["cursor"] = continuation
 
-        return await self._get_json("explore/home/today", url_parameters)
+        return await self._get_json("explore/home/today", url_parameters, family="explore_today")
     
     async def explore_post(self, post_type: rconf.ExplorePostTypeFilters, *, continuation: Optional[str] = None):
         """Requests the /explore/posts/<post-type> endpoint with a post type, to get a trending posts of said type"""
@@ -144,7 +222,7 @@ class TumblrAPI:
 
         url_parameters["fields[blogs]"] = rconf.EXPLORE_BLOG_INFO_FIELDS
 
-        return await self._get_json(f"explore/posts/{post_type.name.lower()}", url_parameters)
+        return await self._get_json(f"explore/posts/{post_type.name.lower()}", url_parameters, family="explore_post")
 
     async def timeline_search(self, query: str, timeline_type: rconf.TimelineType, *,
                               continuation: Optional[str] = None,
@@ -187,7 +265,7 @@ class TumblrAPI:
         if continuation:
             url_parameters["cursor"] = continuation
 
-        return await self._get_json(f"timeline/search", url_parameters)
+        return await self._get_json(f"timeline/search", url_parameters, family="timeline_search")
 
     async def hubs_timeline(self, tag: str, *, continuation: Optional[str], latest: bool = False):
         """Requests the /hubs/<tag>/timeline endpoint
@@ -212,7 +290,7 @@ class TumblrAPI:
 
             url_parameters["cursor"] = continuation
 
-        return await self._get_json(f"hubs/{urllib.parse.quote(tag, safe='')}/timeline", url_parameters)
+        return await self._get_json(f"hubs/{urllib.parse.quote(tag, safe='')}/timeline", url_parameters, family="hubs_timeline")
 
     async def blog_posts(self, blog_name, continuation = None, tag = None, post_type = None, before_id = None):
         """Requests the /blog/<blog name>/posts endpoint
@@ -246,7 +324,7 @@ class TumblrAPI:
             url_parameters["tumblelog"] = blog_name
             url_parameters["page_number"] = continuation
 
-        return await self._get_json(f"blog/{urllib.parse.quote(blog_name, safe = '')}/posts", url_params=url_parameters)
+        return await self._get_json(f"blog/{urllib.parse.quote(blog_name, safe = '')}/posts", url_params=url_parameters, family="blog_posts")
 
     async def blog_search(self, blog_name, query, *, continuation = None,
                           top = None, original_posts = None, post_type = None):
@@ -288,7 +366,7 @@ class TumblrAPI:
                 "cursor": continuation
             }
 
-        return await self._get_json(f"blog/{blog_name}/search/{urllib.parse.quote(query)}", url_params=url_parameters)
+        return await self._get_json(f"blog/{blog_name}/search/{urllib.parse.quote(query)}", url_params=url_parameters, family="blog_search")
 
     async def blog_post(self, blog_name, post_id):
         """Requests the /blog/<blog name>/posts/<post id> endpoint
@@ -300,7 +378,8 @@ class TumblrAPI:
 
         return await self._get_json(
             f"blog/{urllib.parse.quote(blog_name, safe='')}/posts/{post_id}/permalink",
-            url_params={"fields[blogs]": rconf.POST_BLOG_INFO_FIELDS, "reblog_info": "true"}
+            url_params={"fields[blogs]": rconf.POST_BLOG_INFO_FIELDS, "reblog_info": "true"},
+            family="blog_post"
         )
 
     async def blog_post_replies(self, blog_id, post_id, latest: bool = False, after_id: Optional[str] = None):
@@ -317,14 +396,15 @@ class TumblrAPI:
             "mode": "replies",
             "sort": "desc" if latest else "asc",
             "pin_preview_note": "false",
-            "fields[blogs]": "avatar,theme,name"
+            "fields[blogs]": rconf.NOTE_BLOG_INFO_FIELDS
             }
         else:
             url_parameters = {"after": after_id, "sort": "desc" if latest else "asc"}
 
         return await self._get_json(
             f"blog/{urllib.parse.quote(blog_id, safe='')}/post/{post_id}/replies",
-            url_params=url_parameters
+            url_params=url_parameters,
+            family="blog_post_replies"
         )
 
     async def blog_post_notes_timeline(
@@ -354,12 +434,13 @@ class TumblrAPI:
                 "mode": mode.name.lower(),
                 "sort": "asc" if latest else "desc",
                 "pin_preview_note": "false",
-                "fields[blogs]": "avatar,theme,name"
+                "fields[blogs]": rconf.NOTE_BLOG_INFO_FIELDS
             }
 
         return await self._get_json(
             f"blog/{urllib.parse.quote(blog_id, safe='')}/post/{post_id}/notes/timeline",
-            url_params=url_parameters
+            url_params=url_parameters,
+            family="blog_post_notes_timeline"
         )
 
     async def blog_notes(
@@ -398,7 +479,8 @@ class TumblrAPI:
 
         return await self._get_json(
             f"blog/{urllib.parse.quote(blog_id, safe='')}/notes",
-            url_params=url_parameters
+            url_params=url_parameters,
+            family="blog_notes"
         )
 
     async def poll_results(self, blog_name, post_id, poll_id):
@@ -412,4 +494,5 @@ class TumblrAPI:
 
         return await self._get_json(
             f"polls/{urllib.parse.quote(blog_name, safe='')}/{post_id}/{poll_id}/results",
+            family="poll_results"
         )
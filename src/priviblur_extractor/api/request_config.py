@@ -43,11 +43,30 @@ class ReblogNoteTypes(enum.Enum):
     REBLOGS_ONLY = 2
 
 
-# Attributes for the fields[blog] request query
+# Attributes for the fields[blogs] request query
+#
+# Tumblr attaches a blog object to every post and every trail item it returns, so
+# anything requested here gets repeated dozens of times within a single response.
+# Only request what BlogParser actually reads (and what the templates render).
+#
+# utils/extractor/check_blog_fields.py fails whenever BlogParser starts to read
+# an attribute that is missing from these sets.
 
-EXPLORE_BLOG_INFO_FIELDS = "name,avatar,title,url,blog_view_url,is_adult,?is_member,description_npf,uuid,can_be_followed,?followed,?advertiser_name,theme,?primary,?is_paywall_on,?paywall_access,?subscription_plan,tumblrmart_accessories,can_show_badges,share_likes,share_following,can_subscribe,subscribed,ask,?can_submit,?is_blocked_from_primary,?is_blogless_advertiser,is_password_protected"
-TUMBLR_SEARCH_BLOG_INFO_FIELDS = "name,avatar,title,url,blog_view_url,is_adult,?is_member,description_npf,uuid,can_be_followed,?followed,?advertiser_name,theme,?primary,?is_paywall_on,?paywall_access,?subscription_plan,tumblrmart_accessories,can_show_badges,share_following,share_likes,ask"
-POST_BLOG_INFO_FIELDS = "name,avatar,title,url,blog_view_url,is_adult,?is_member,description_npf,uuid,can_be_followed,?followed,?advertiser_name,theme,?primary,?is_paywall_on,?paywall_access,?subscription_plan,tumblrmart_accessories,can_show_badges,share_likes,share_following,can_subscribe,subscribed,ask,?can_submit,?is_blocked_from_primary,?analytics_url"
-BLOG_POSTS_BLOG_INFO_FIELDS = "	name,avatar,title,url,blog_view_url,is_adult,?is_member,description_npf,uuid,can_be_followed,?followed,?advertiser_name,theme,?primary,?is_paywall_on,?paywall_access,?subscription_plan,tumblrmart_accessories,can_show_badges,share_likes,share_following,can_subscribe,subscribed,ask,?can_submit,?is_blocked_from_primary,?is_blogless_advertiser,is_password_protected,?admin,can_message,ask_page_title,?analytics_url,?top_tags,?allow_search_indexing,is_hidden_from_blog_network,?should_show_tip,?should_show_gift,?should_show_tumblrmart_gift,?can_add_tip_message"
+# Blogs embedded within posts, trails and timelines
+EMBEDDED_BLOG_FIELDS = ("name", "avatar", "title", "url", "is_adult", "uuid", "theme", "?is_paywall_on")
+
+# Blogs that are additionally rendered as a page header (blog pages and permalinks)
+BLOG_HEADER_FIELDS = EMBEDDED_BLOG_FIELDS + ("description_npf",)
+
+# Blogs attached to notes. See BlogParser.parse_limited
+NOTE_BLOG_FIELDS = ("avatar", "theme", "name")
+
+EXPLORE_BLOG_INFO_FIELDS = ",".join(EMBEDDED_BLOG_FIELDS)
+TUMBLR_SEARCH_BLOG_INFO_FIELDS = EXPLORE_BLOG_INFO_FIELDS
 TUMBLR_TAG_BLOG_INFO_FIELDS = EXPLORE_BLOG_INFO_FIELDS
-BLOG_SEARCH_BLOG_INFO_FIELDS = EXPLORE_BLOG_INFO_FIELDS
\ No newline at end of file
+
+POST_BLOG_INFO_FIELDS = ",".join(BLOG_HEADER_FIELDS)
+BLOG_POSTS_BLOG_INFO_FIELDS = POST_BLOG_INFO_FIELDS
+BLOG_SEARCH_BLOG_INFO_FIELDS = POST_BLOG_INFO_FIELDS
+
+NOTE_BLOG_INFO_FIELDS = ",".join(NOTE_BLOG_FIELDS)
@@ -1,2 +1,4 @@
 from .utils import dig_dict
 from .logger import LOGGER
+from . import metrics
+from . import recorder
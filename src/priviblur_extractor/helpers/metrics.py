@@ -0,0 +1,136 @@
+"""Minimal in-process metric primitives
+
+These are intentionally dependency free and cheap to update, as they sit within the
+request path of every call made to Tumblr. Exposing them (to Prometheus or otherwise)
+is left to the consumer through MetricsRegistry.snapshot()
+"""
+
+import bisect
+from typing import Iterable, Optional, Tuple
+
+# Upper bounds of histogram buckets (inclusive). An implicit +Inf bucket is always appended.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 131072, 262144, 524288, 1048576, 2097152, 4194304)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-at-export histogram with fixed bucket boundaries"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_json_serialisable(self):
+        return {"buckets": self.buckets, "counts": self.counts, "sum": self.sum, "count": self.count}
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def to_json_serialisable(self):
+        return {"value": self.value}
+
+
+class Gauge:
+    """A value that can go up and down
+
+    `aggregation` describes how values from separate processes should be combined
+    """
+    __slots__ = ("value", "aggregation")
+
+    def __init__(self, aggregation: str = "sum"):
+        self.value = 0
+        self.aggregation = aggregation
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def to_json_serialisable(self):
+        return {"value": self.value, "aggregation": self.aggregation}
+
+
+def _normalize_labels(labels: Optional[dict]) -> Labels:
+    if not labels:
+        return ()
+
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """Stores metrics by name and label set
+
+    Metrics are lazily created on first access. Use the `histogram`, `counter` and `gauge`
+    methods to fetch (or create) a metric and then update it directly.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+
+        # name -> help text
+        self.descriptions = {}
+
+    def describe(self, name: str, description: str):
+        self.descriptions[name] = description
+
+    def histogram(self, name: str, labels: Optional[dict] = None, buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        key = (name, _normalize_labels(labels))
+
+        if (histogram := self.histograms.get(key)) is None:
+            histogram = self.histograms[key] = Histogram(buckets)
+
+        return histogram
+
+    def counter(self, name: str, labels: Optional[dict] = None) -> Counter:
+        key = (name, _normalize_labels(labels))
+
+        if (counter := self.counters.get(key)) is None:
+            counter = self.counters[key] = Counter()
+
+        return counter
+
+    def gauge(self, name: str, labels: Optional[dict] = None, aggregation: str = "sum") -> Gauge:
+        key = (name, _normalize_labels(labels))
+
+        if (gauge := self.gauges.get(key)) is None:
+            gauge = self.gauges[key] = Gauge(aggregation)
+
+        return gauge
+
+    def snapshot(self):
+        """Returns a JSON serialisable representation of every metric within the registry"""
+        def serialise(metrics):
+            return [
+                {"name": name, "labels": dict(labels), **metric.to_json_serialisable()}
+                for (name, labels), metric in metrics.items()
+            ]
+
+        return {
+            "histograms": serialise(self.histograms),
+            "counters": serialise(self.counters),
+            "gauges": serialise(self.gauges),
+            "descriptions": self.descriptions,
+        }
@@ -0,0 +1,120 @@
+"""Records responses from Tumblr into a rotating corpus
+
+Each request made to Tumblr is appended as a single JSON line holding the endpoint,
+the URL parameters, the response status, headers and the raw body. Every line is
+compressed into its own gzip member, as such a partially written corpus remains readable
+and can be read back line by line through `read_records()` or `gzip.open()`.
+
+Corpora are used to replay real traffic within the benchmark suites under utils/benchmarks
+"""
+
+import os
+import glob
+import gzip
+import time
+import json
+import concurrent.futures
+from typing import Iterator, Optional
+
+SCRUBBED_HEADERS = frozenset(("authorization", "cookie", "set-cookie", "x-csrf", "x-tumblr-form-key"))
+
+
+def scrub_headers(headers) -> dict:
+    return {
+        key: ("[scrubbed]" if key.lower() in SCRUBBED_HEADERS else value)
+        for key, value in headers.items()
+    }
+
+
+class ResponseRecorder:
+    """Appends responses from Tumblr to gzip compressed JSONL files within `directory`
+
+    A new file is started once the current one grows past `max_file_size` bytes (compressed),
+    and only the newest `max_files` files written by this process are kept around.
+
+    Compression and writes are done by a single background thread. See `submit()`
+    """
+
+    def __init__(self, directory: str, max_file_size: int = 64 * 1024 * 1024, max_files: int = 10):
+        self.directory = directory
+        self.max_file_size = max_file_size
+        self.max_files = max_files
+
+        self.current_path: Optional[str] = None
+        self.current_size = 0
+        self.sequence = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        # A single thread, as records are appended to the same file one after another
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-recorder")
+
+    def _file_pattern(self):
+        return os.path.join(self.directory, f"responses-{os.getpid()}-*.jsonl.gz")
+
+    def _rotate(self):
+        self.sequence += 1
+        self.current_path = os.path.join(
+            self.directory, f"responses-{os.getpid()}-{int(time.time())}-{self.sequence:04}.jsonl.gz"
+        )
+        self.current_size = 0
+
+        # Remove the oldest files written by this process
+        existing = sorted(glob.glob(self._file_pattern()), key=os.path.getmtime)
+        for path in existing[:max(len(existing) - self.max_files + 1, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def record(self, endpoint, family, url_params, status, request_headers, response_headers, body):
+        """Appends a single request and its response to the corpus"""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+
+        line = json.dumps({
+            "timestamp": time.time(),
+            "endpoint": endpoint,
+            "family": family,
+            "params": dict(url_params) if url_params else {},
+            "status": status,
+            "request_headers": scrub_headers(request_headers),
+            "response_headers": scrub_headers(response_headers),
+            "body": body,
+        }, ensure_ascii=False)
+
+        compressed = gzip.compress(line.encode() + b"\n")
+
+        if self.current_path is None or self.current_size + len(compressed) > self.max_file_size:
+            self._rotate()
+
+        with open(self.current_path, "ab") as file:
+            file.write(compressed)
+
+        self.current_size += len(compressed)
+
+
+    def submit(self, endpoint, family, url_params, status, request_headers, response_headers, body):
+        """Records a single request and its response from the background thread, without blocking the caller
+
+        Returns a concurrent.futures.Future, which holds any error raised while recording
+        """
+        # Copied as to not be mutated (or released) by the caller in the meantime
+        return self.executor.submit(
+            self.record,
+            endpoint,
+            family,
+            dict(url_params) if url_params else {},
+            status,
+            dict(request_headers),
+            dict(response_headers),
+            body,
+        )
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Reads back the records stored in a corpus file"""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
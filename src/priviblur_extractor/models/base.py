@@ -3,7 +3,7 @@ from typing import Optional, NamedTuple, Tuple
 # Used for cache busting
 # Applied when .to_json_serialisable() is called
 # Removed from serialized back with from_json()
-VERSION = 4
+VERSION = 6
 
 class Cursor(NamedTuple):
     """ Object representing Tumblr's API's "Next" object.
@@ -31,8 +31,8 @@ class Cursor(NamedTuple):
     post_type_filter: Optional[str] = None
 
     def to_json_serialisable(self):
-        return self._asdict()
+        return list(self)
 
     @classmethod
     def from_json(cls, json):
-        return cls(**json)
+        return cls(*json)
@@ -1,17 +1,39 @@
+import sys
+import functools
 from typing import NamedTuple, Optional
 
 
+class Avatar(NamedTuple):
+    width: Optional[int]
+    height: Optional[int]
+    url: str
+
+    def to_json_serialisable(self):
+        return list(self)
+
+    def to_api_json(self):
+        return self._asdict()
+
+    @classmethod
+    def from_json(cls, json):
+        width, height, url = json
+        return cls(width, height, sys.intern(url))
+
+
 class HeaderInfo(NamedTuple):
     header_image: str
     focused_header_image: str
     scaled_header_image: str
 
     def to_json_serialisable(self):
+        return list(self)
+
+    def to_api_json(self):
         return self._asdict()
 
     @classmethod
     def from_json(cls, json):
-        return cls(**json)
+        return cls(*(sys.intern(url) for url in json))
 
 
 class BlogTheme(NamedTuple):
@@ -21,41 +43,66 @@ class BlogTheme(NamedTuple):
     header_info : Optional[HeaderInfo] = None
 
     def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        if self.header_info:
-            json_serializable["header_info"] = self.header_info.to_json_serialisable()
-
-        return json_serializable
+        return [
+            self.avatar_shape,
+            self.background_color,
+            self.body_font,
+            self.header_info.to_json_serialisable() if self.header_info else None
+        ]
+
+    def to_api_json(self):
+        return {
+            "avatar_shape": self.avatar_shape,
+            "background_color": self.background_color,
+            "body_font": self.body_font,
+            "header_info": self.header_info.to_api_json() if self.header_info else None,
+        }
 
     @classmethod
     def from_json(cls, json):
-        if json["header_info"]:
-            json["header_info"] = HeaderInfo.from_json(json["header_info"])
-        return cls(**json)
+        avatar_shape, background_color, body_font, header_info = json
+
+        if header_info:
+            header_info = HeaderInfo.from_json(header_info)
+
+        return create_theme(avatar_shape, background_color, body_font, header_info)
+
+
+@functools.lru_cache(maxsize=4096)
+def create_theme(avatar_shape, background_color=None, body_font=None, header_info=None):
+    """Creates a BlogTheme
+
+    Themes are immutable, as such a single instance is shared between every blog
+    (or every appearance of the same blog) with an identical theme.
+    """
+    return BlogTheme(avatar_shape, background_color, body_font, header_info)
 
 
 class BrokenBlog(NamedTuple):
     name: str
-    avatar: list[dict]
+    avatar: tuple[Avatar, ...]
 
     def to_json_serialisable(self):
-        return self._asdict()
+        return [self.name, [avatar.to_json_serialisable() for avatar in self.avatar]]
+
+    def to_api_json(self):
+        return {"name": self.name, "avatar": [avatar.to_api_json() for avatar in self.avatar]}
 
     @classmethod
     def from_json(cls, json):
-        return cls(**json)
+        name, avatar = json
+        return cls(sys.intern(name), tuple(Avatar.from_json(size) for size in avatar))
 
 
 class Blog(NamedTuple):
     name: str
-    # [{"width": 512, "height": 512, url: "..."}, {"width": ...}...]
-    avatar: list[dict]
+    # Largest to smallest
+    avatar: tuple[Avatar, ...]
     title: str
     url: str
     is_adult: bool
 
-    description_npf: list[dict]
+    description_npf: Optional[list[dict]]
     uuid: str
     theme: BlogTheme
     is_paywall_on: bool
@@ -64,15 +111,92 @@ class Blog(NamedTuple):
     active: bool = False
 
     def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        if json_serializable["theme"]:
-            json_serializable["theme"] = json_serializable["theme"].to_json_serialisable()
-
-        return json_serializable
+        return [
+            self.name,
+            [avatar.to_json_serialisable() for avatar in self.avatar],
+            self.title,
+            self.url,
+            self.is_adult,
+            self.description_npf,
+            self.uuid,
+            self.theme.to_json_serialisable() if self.theme else None,
+            self.is_paywall_on,
+            self.active,
+        ]
+
+    def to_api_json(self):
+        return {
+            "name": self.name,
+            "avatar": [avatar.to_api_json() for avatar in self.avatar],
+            "title": self.title,
+            "url": self.url,
+            "is_adult": self.is_adult,
+            "description_npf": self.description_npf,
+            "uuid": self.uuid,
+            "theme": self.theme.to_api_json() if self.theme else None,
+            "is_paywall_on": self.is_paywall_on,
+            "active": self.active,
+        }
 
     @classmethod
     def from_json(cls, json):
-        json["theme"] = BlogTheme.from_json(json["theme"])
-        return cls(**json)
+        name, avatar, title, url, is_adult, description_npf, uuid, theme, is_paywall_on, active = json
+
+        return cls(
+            name=sys.intern(name),
+            avatar=tuple(Avatar.from_json(size) for size in avatar),
+            title=title,
+            url=url,
+            is_adult=is_adult,
+            description_npf=description_npf,
+            uuid=uuid,
+            theme=BlogTheme.from_json(theme) if theme else None,
+            is_paywall_on=is_paywall_on,
+            active=active,
+        )
+
+
+class BlogTable:
+    """Deduplicates the blogs of a collection (timeline) when serializing it
+
+    Blogs are frequently repeated across posts and trails. Each distinct blog is serialized
+    once into the table and referred to by its index everywhere else.
+    """
+
+    def __init__(self):
+        self.indices = {}
+        self.blogs = []
+
+    def reference(self, blog):
+        """Returns a reference to the given blog
+
+        Broken blogs and blogs lacking an uuid are returned serialized in place instead
+        """
+        if not isinstance(blog, Blog) or not blog.uuid:
+            return blog.to_json_serialisable()
+
+        if (index := self.indices.get(blog.uuid)) is None:
+            index = self.indices[blog.uuid] = len(self.blogs)
+            self.blogs.append(blog.to_json_serialisable())
+
+        return index
+
+    def to_json_serialisable(self):
+        return self.blogs
+
+    @staticmethod
+    def from_json(json):
+        """Rebuilds the serialized table into a list of Blog objects to resolve references with"""
+        return [Blog.from_json(blog) for blog in json]
+
+
+def resolve_blog(json, blogs=None):
+    """Resolves a serialized blog which may either be a reference into `blogs` or the blog itself"""
+    if isinstance(json, int):
+        return blogs[json]
 
+    # Broken blogs contains only two attributes
+    if len(json) > 2:
+        return Blog.from_json(json)
+    else:
+        return BrokenBlog.from_json(json)
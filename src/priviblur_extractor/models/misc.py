@@ -5,11 +5,11 @@ class Signpost(NamedTuple):
     description: Optional[str] = None
 
     def to_json_serialisable(self):
-        return {
-            "title": self.title,
-            "description": self.description
-        }
+        return [self.title, self.description]
+
+    def to_api_json(self):
+        return self._asdict()
 
     @classmethod
     def from_json(cls, json):
-        return cls(**json)
+        return cls(*json)
@@ -1,3 +1,4 @@
+import sys
 import datetime
 import enum
 
@@ -13,6 +14,43 @@ class CommunityLabel(enum.Enum):
     SEXUAL_THEMES = 3
 
 
+def _serialise_date(date):
+    if date:
+        return date.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+    return None
+
+
+def _intern_tags(tags):
+    return tuple(sys.intern(tag) for tag in tags)
+
+
+def _serialise_blog(blog_, blogs):
+    if blogs is not None:
+        return blogs.reference(blog_)
+
+    return blog_.to_json_serialisable()
+
+
+def _api_date(date):
+    # Naive dates are in local time, which .timestamp() assumes
+    if date:
+        return int(date.timestamp())
+
+    return None
+
+
+# Models are serialized positionally (as lists) rather than as dictionaries in order
+# to keep cached entries small. Notes are additionally prefixed with their type.
+#
+# When serialized as part of a timeline, blogs are stored within a shared blog.BlogTable
+# and referred to by their index. See blog.BlogTable
+#
+# That form is internal to the cache and changes with every models.VERSION. The JSON API
+# (routes/api) instead exposes models through .to_api_json(): dictionaries with named fields,
+# blogs inlined and dates as Unix timestamps. Its shape is kept stable between versions.
+
+
 class ReplyNote(NamedTuple):
     uuid: str
     reply_id: str
@@ -23,28 +61,43 @@ class ReplyNote(NamedTuple):
 
     blog: blog.Blog
 
-    def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        json_serializable["type"] = "reply"
-
-        json_serializable["blog"] = json_serializable["blog"].to_json_serialisable()
-        if self.date:
-            json_serializable["date"] = self.date.replace(tzinfo=datetime.timezone.utc).timestamp()
-
-        return json_serializable
+    def to_json_serialisable(self, blogs=None):
+        return [
+            "reply",
+            self.uuid,
+            self.reply_id,
+            _serialise_date(self.date),
+            self.content,
+            self.layout,
+            _serialise_blog(self.blog, blogs) if self.blog else None,
+        ]
+
+    def to_api_json(self):
+        return {
+            "type": "reply",
+            "uuid": self.uuid,
+            "reply_id": self.reply_id,
+            "date": _api_date(self.date),
+            "content": self.content,
+            "layout": self.layout,
+            "blog": self.blog.to_api_json() if self.blog else None,
+        }
 
     @classmethod
-    def from_json(cls, json):
-        if json["date"] is not None:
-            json["date"] = datetime.datetime.fromtimestamp(json["date"], tz=datetime.timezone.utc)
-
-        if json["blog"]:
-            json["blog"] = blog.Blog.from_json(json["blog"])
+    def from_json(cls, json, blogs=None):
+        _, uuid, reply_id, date, content, layout, blog_ = json
 
-        del json["type"]
+        if date is not None:
+            date = datetime.datetime.fromtimestamp(date, tz=datetime.timezone.utc)
 
-        return cls(**json)
+        return cls(
+            uuid=uuid,
+            reply_id=reply_id,
+            date=date,
+            content=content,
+            layout=layout,
+            blog=blog.resolve_blog(blog_, blogs) if blog_ is not None else None,
+        )
 
 
 class ReblogNote(NamedTuple):
@@ -63,34 +116,52 @@ class ReblogNote(NamedTuple):
 
     community_labels: Sequence[CommunityLabel]
 
-    def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        json_serializable["type"] = "reblog"
-
-        json_serializable["blog"] = json_serializable["blog"].to_json_serialisable()
-        if self.date:
-            json_serializable["date"] = self.date.replace(tzinfo=datetime.timezone.utc).timestamp()
-
-        return json_serializable
+    def to_json_serialisable(self, blogs=None):
+        return [
+            "reblog",
+            self.uuid,
+            self.id,
+            _serialise_blog(self.blog, blogs) if self.blog else None,
+            self.content,
+            self.layout,
+            self.tags,
+            self.reblogged_from,
+            _serialise_date(self.date),
+            [label.value for label in self.community_labels],
+        ]
+
+    def to_api_json(self):
+        return {
+            "type": "reblog",
+            "uuid": self.uuid,
+            "id": self.id,
+            "blog": self.blog.to_api_json() if self.blog else None,
+            "content": self.content,
+            "layout": self.layout,
+            "tags": list(self.tags),
+            "reblogged_from": self.reblogged_from,
+            "date": _api_date(self.date),
+            "community_labels": [label.name.lower() for label in self.community_labels],
+        }
 
     @classmethod
-    def from_json(cls, json):
-        if json["date"] is not None:
-            json["date"] = datetime.datetime.utcfromtimestamp(json["date"])
-
-        if json["blog"]:
-            json["blog"] = blog.Blog.from_json(json["blog"])
+    def from_json(cls, json, blogs=None):
+        _, uuid, id, blog_, content, layout, tags, reblogged_from, date, community_labels = json
 
-        community_labels = []
-        for label_value in json["community_labels"]:
-            community_labels.append(CommunityLabel(label_value))
+        if date is not None:
+            date = datetime.datetime.utcfromtimestamp(date)
 
-        json["community_labels"] = community_labels
-
-        del json["type"]
-
-        return cls(**json)
+        return cls(
+            uuid=uuid,
+            id=id,
+            blog=blog.resolve_blog(blog_, blogs) if blog_ is not None else None,
+            content=content,
+            layout=layout,
+            tags=_intern_tags(tags),
+            reblogged_from=sys.intern(reblogged_from),
+            date=date,
+            community_labels=[CommunityLabel(label_value) for label_value in community_labels],
+        )
 
 
 class LikeNote(NamedTuple):
@@ -99,29 +170,46 @@ class LikeNote(NamedTuple):
     blog_title: str
     date: Optional[datetime.datetime]
 
-    avatar: list[dict]
+    # {"64": "...", "128": "..."}
+    avatar: dict[str, str]
 
     # TODO
     # avatar_shape
 
-    def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        json_serializable["type"] = "like"
-
-        if self.date:
-            json_serializable["date"] = self.date.replace(tzinfo=datetime.timezone.utc).timestamp()
-
-        return json_serializable
+    def to_json_serialisable(self, blogs=None):
+        return [
+            "like",
+            self.blog_name,
+            self.blog_uuid,
+            self.blog_title,
+            _serialise_date(self.date),
+            self.avatar,
+        ]
+
+    def to_api_json(self):
+        return {
+            "type": "like",
+            "blog_name": self.blog_name,
+            "blog_uuid": self.blog_uuid,
+            "blog_title": self.blog_title,
+            "date": _api_date(self.date),
+            "avatar": self.avatar,
+        }
 
     @classmethod
-    def from_json(cls, json):
-        if json["date"] is not None:
-            json["date"] = datetime.datetime.fromtimestamp(json["date"], tz=datetime.timezone.utc)
+    def from_json(cls, json, blogs=None):
+        _, blog_name, blog_uuid, blog_title, date, avatar = json
 
-        del json["type"]
+        if date is not None:
+            date = datetime.datetime.fromtimestamp(date, tz=datetime.timezone.utc)
 
-        return cls(**json)
+        return cls(
+            blog_name=sys.intern(blog_name),
+            blog_uuid=blog_uuid,
+            blog_title=blog_title,
+            date=date,
+            avatar={size: sys.intern(url) for size, url in avatar.items()},
+        )
 
 
 class ReblogAttribution(NamedTuple):
@@ -132,11 +220,15 @@ class ReblogAttribution(NamedTuple):
     blog_title: str
 
     def to_json_serialisable(self):
+        return list(self)
+
+    def to_api_json(self):
         return self._asdict()
 
     @classmethod
     def from_json(cls, json):
-        return cls(**json)
+        post_id, post_url, blog_name, blog_title = json
+        return cls(post_id, post_url, sys.intern(blog_name), blog_title)
 
 
 class PostTrail(NamedTuple):
@@ -146,29 +238,35 @@ class PostTrail(NamedTuple):
     content: Optional[list[dict]]
     layout: Optional[list[dict]]
 
-    def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        if json_serializable["blog"]:
-            json_serializable["blog"] = json_serializable["blog"].to_json_serialisable()
-
-        if json_serializable["date"]:
-            json_serializable["date"] = self.date.replace(tzinfo=datetime.timezone.utc).timestamp()
-
-        return json_serializable
+    def to_json_serialisable(self, blogs=None):
+        return [
+            self.id,
+            _serialise_blog(self.blog, blogs) if self.blog else None,
+            _serialise_date(self.date),
+            self.content,
+            self.layout,
+        ]
+
+    def to_api_json(self):
+        return {
+            "id": self.id,
+            "blog": self.blog.to_api_json() if self.blog else None,
+            "date": _api_date(self.date),
+            "content": self.content,
+            "layout": self.layout,
+        }
 
     @classmethod
-    def from_json(cls, json):
-        # Broken blogs contains only two attributes
-        if len(json["blog"]) > 2:
-            json["blog"] = blog.Blog.from_json(json["blog"])
-        else:
-            json["blog"] = blog.BrokenBlog.from_json(json["blog"])
+    def from_json(cls, json, blogs=None):
+        id, blog_, date, content, layout = json
+
+        if blog_ is not None:
+            blog_ = blog.resolve_blog(blog_, blogs)
 
-        if json["date"] is not None:
-            json["date"] = datetime.datetime.utcfromtimestamp(json["date"])
+        if date is not None:
+            date = datetime.datetime.utcfromtimestamp(date)
 
-        return cls(**json)
+        return cls(id=id, blog=blog_, date=date, content=content, layout=layout)
 
 
 class Post(NamedTuple):
@@ -178,7 +276,7 @@ class Post(NamedTuple):
     post_url: str
     slug: str
     date: Optional[datetime.datetime]
-    tags: list[str]
+    tags: Sequence[str]
     summary: str
 
     display_avatar: bool
@@ -203,37 +301,87 @@ class Post(NamedTuple):
 
     community_labels: list[CommunityLabel] = []
 
-    def to_json_serialisable(self):
-        json_serializable = self._asdict()
-
-        if json_serializable["date"]:
-            json_serializable["date"] = self.date.replace(tzinfo=datetime.timezone.utc).timestamp()
-        json_serializable["trail"] = [trail.to_json_serialisable() for trail in self.trail]
-
-        # Serialize the attributes that are NamedTuples to JSON
-        for key in ("blog", "reblog_from", "reblog_root"):
-            if json_serializable[key]:
-                json_serializable[key] = json_serializable[key].to_json_serialisable()
-
-        return json_serializable
+    def to_json_serialisable(self, blogs=None):
+        return [
+            _serialise_blog(self.blog, blogs),
+            self.id,
+            self.post_url,
+            self.slug,
+            _serialise_date(self.date),
+            self.tags,
+            self.summary,
+            self.display_avatar,
+            self.is_advertisement,
+            self.is_nsfw,
+            self.content,
+            self.layout,
+            [trail.to_json_serialisable(blogs) for trail in self.trail],
+            self.note_count,
+            self.like_count,
+            self.reblog_count,
+            self.reply_count,
+            self.default_note_viewer_tab,
+            self.reblog_from.to_json_serialisable() if self.reblog_from else None,
+            self.reblog_root.to_json_serialisable() if self.reblog_root else None,
+            [label.value for label in self.community_labels],
+        ]
+
+    def to_api_json(self):
+        return {
+            "blog": self.blog.to_api_json(),
+            "id": self.id,
+            "post_url": self.post_url,
+            "slug": self.slug,
+            "date": _api_date(self.date),
+            "tags": list(self.tags),
+            "summary": self.summary,
+            "display_avatar": self.display_avatar,
+            "is_advertisement": self.is_advertisement,
+            "is_nsfw": self.is_nsfw,
+            "content": self.content,
+            "layout": self.layout,
+            "trail": [trail.to_api_json() for trail in self.trail],
+            "note_count": self.note_count,
+            "like_count": self.like_count,
+            "reblog_count": self.reblog_count,
+            "reply_count": self.reply_count,
+            "default_note_viewer_tab": self.default_note_viewer_tab,
+            "reblog_from": self.reblog_from.to_api_json() if self.reblog_from else None,
+            "reblog_root": self.reblog_root.to_api_json() if self.reblog_root else None,
+            "community_labels": [label.name.lower() for label in self.community_labels],
+        }
 
     @classmethod
-    def from_json(cls, json):
-        if json["date"] is not None:
-            json["date"] = datetime.datetime.utcfromtimestamp(json["date"])
-
-        trails = []
-        for trail in json["trail"]:
-            trails.append(PostTrail.from_json(trail))
-        json["trail"] = trails
-
-        for key, object_ in (("blog", blog.Blog), ("reblog_from", ReblogAttribution), ("reblog_root", ReblogAttribution)):
-            if json[key]:
-                json[key] = object_.from_json(json[key])
-
-        community_labels = []
-        for label_value in json["community_labels"]:
-            community_labels.append(CommunityLabel(label_value))
-        json["community_labels"] = community_labels
-
-        return cls(**json)
+    def from_json(cls, json, blogs=None):
+        (
+            blog_, id, post_url, slug, date, tags, summary, display_avatar, is_advertisement, is_nsfw,
+            content, layout, trail, note_count, like_count, reblog_count, reply_count,
+            default_note_viewer_tab, reblog_from, reblog_root, community_labels
+        ) = json
+
+        if date is not None:
+            date = datetime.datetime.utcfromtimestamp(date)
+
+        return cls(
+            blog=blog.resolve_blog(blog_, blogs),
+            id=id,
+            post_url=post_url,
+            slug=slug,
+            date=date,
+            tags=_intern_tags(tags),
+            summary=summary,
+            display_avatar=display_avatar,
+            is_advertisement=is_advertisement,
+            is_nsfw=is_nsfw,
+            content=content,
+            layout=layout,
+            trail=[PostTrail.from_json(trail_item, blogs) for trail_item in trail],
+            note_count=note_count,
+            like_count=like_count,
+            reblog_count=reblog_count,
+            reply_count=reply_count,
+            default_note_viewer_tab=default_note_viewer_tab,
+            reblog_from=ReblogAttribution.from_json(reblog_from) if reblog_from else None,
+            reblog_root=ReblogAttribution.from_json(reblog_root) if reblog_root else None,
+            community_labels=[CommunityLabel(label_value) for label_value in community_labels],
+        )
@@ -4,7 +4,7 @@ from typing import Sequence, Optional, NamedTuple
 from . import base
 from .post import Post, ReplyNote, ReblogNote, LikeNote
 from .misc import Signpost
-from. blog import Blog
+from. blog import Blog, BlogTable
 
 
 class BlogTimeline(NamedTuple):
@@ -18,11 +18,14 @@ class BlogTimeline(NamedTuple):
     next: Optional[base.Cursor] = None
 
     def to_json_serialisable(self):
+        blogs = BlogTable()
+
         json_serializable = {
             "version": base.VERSION,
             "blog_info": self.blog_info.to_json_serialisable()
         }
-        json_serializable["posts"] = [post.to_json_serialisable() for post in self.posts]
+        json_serializable["posts"] = [post.to_json_serialisable(blogs) for post in self.posts]
+        json_serializable["blogs"] = blogs.to_json_serialisable()
         json_serializable["total_posts"] = self.total_posts
 
         if self.next:
@@ -32,13 +35,21 @@ class BlogTimeline(NamedTuple):
 
         return json_serializable
 
+    def to_api_json(self):
+        return {
+            "blog_info": self.blog_info.to_api_json(),
+            "posts": [post.to_api_json() for post in self.posts],
+            "total_posts": self.total_posts,
+        }
+
     @classmethod
     def from_json(cls, json):
         json["blog_info"] = Blog.from_json(json["blog_info"])
+        blogs = BlogTable.from_json(json.pop("blogs"))
 
         posts = []
         for post in json["posts"]:
-            posts.append(Post.from_json(post))
+            posts.append(Post.from_json(post, blogs))
         json["posts"] = posts
 
         if json["next"]:
@@ -65,25 +76,40 @@ class NoteTimeline(NamedTuple):
     after_id: Optional[str] = None
 
     def to_json_serialisable(self):
+        blogs = BlogTable()
+
         json_serializable = self._asdict()
 
         json_serializable["version"] = base.VERSION
 
-        json_serializable["notes"] = [note.to_json_serialisable() for note in self.notes]
+        json_serializable["notes"] = [note.to_json_serialisable(blogs) for note in self.notes]
+        json_serializable["blogs"] = blogs.to_json_serialisable()
 
         return json_serializable
 
+    def to_api_json(self):
+        return {
+            "notes": [note.to_api_json() for note in self.notes],
+            "total_notes": self.total_notes,
+            "total_replies": self.total_replies,
+            "total_reblogs": self.total_reblogs,
+            "total_likes": self.total_likes,
+        }
+
     @classmethod
     def from_json(cls, json):
+        blogs = BlogTable.from_json(json.pop("blogs"))
+
         notes = []
         for note in json["notes"]:
-            match note["type"]:
+            # Serialized notes are prefixed with their type
+            match note[0]:
                 case "reply":
-                    notes.append(ReplyNote.from_json(note))
+                    notes.append(ReplyNote.from_json(note, blogs))
                 case "reblog":
-                    notes.append(ReblogNote.from_json(note))
+                    notes.append(ReblogNote.from_json(note, blogs))
                 case "like":
-                    notes.append(LikeNote.from_json(note))
+                    notes.append(LikeNote.from_json(note, blogs))
 
         json["notes"] = notes
 
@@ -101,14 +127,17 @@ class Timeline(NamedTuple):
     next: Optional[base.Cursor] = None
 
     def to_json_serialisable(self):
+        blogs = BlogTable()
+
+        # [<type>, <serialized element>]
         elements = []
         for element in self.elements:
             if isinstance(element, Post):
-                elements.append({"post": element.to_json_serialisable()})
+                elements.append(("post", element.to_json_serialisable(blogs)))
             elif isinstance(element, Blog):
-                elements.append({"blog": element.to_json_serialisable()})
+                elements.append(("blog", element.to_json_serialisable()))
             else:
-                elements.append({"signpost": element.to_json_serialisable()})
+                elements.append(("signpost", element.to_json_serialisable()))
 
         next_ = self.next
         if next_:
@@ -116,20 +145,39 @@ class Timeline(NamedTuple):
 
         return {
             "version": base.VERSION,
+            "blogs": blogs.to_json_serialisable(),
             "elements": elements,
             "next": next_
         }
 
+    def to_api_json(self):
+        """Elements are tagged with their type ("post", "blog" or "signpost") through a `type` field"""
+        elements = []
+        for element in self.elements:
+            if isinstance(element, Post):
+                element_type = "post"
+            elif isinstance(element, Blog):
+                element_type = "blog"
+            else:
+                element_type = "signpost"
+
+            elements.append({"type": element_type, **element.to_api_json()})
+
+        return {"elements": elements}
+
     @classmethod
     def from_json(cls, json):
+        blogs = BlogTable.from_json(json.pop("blogs"))
+
         elements = []
-        for element in json["elements"]:
-            if post := element.get("post"):
-                elements.append(Post.from_json(post))
-            elif blog := element.get("blog"): 
-                elements.append(Blog.from_json(blog))
-            else:
-                elements.append(Signpost.from_json(element["signpost"]))
+        for element_type, element in json["elements"]:
+            match element_type:
+                case "post":
+                    elements.append(Post.from_json(element, blogs))
+                case "blog":
+                    elements.append(Blog.from_json(element))
+                case _:
+                    elements.append(Signpost.from_json(element))
 
         json["elements"] = elements
 
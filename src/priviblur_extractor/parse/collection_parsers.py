@@ -51,13 +51,15 @@ class TimelineParser:
 
         # Now the elements contained within
         elements = []
+        blogs = {}
         total_raw_elements = len(self.target["elements"])
         for element_index, element in enumerate(self.target["elements"]):
             if result := items.parse_item(
                     element,
                     element_index,
                     total_raw_elements,
-                    use_parsers=(items.PostParser, items.SignpostParser)
+                    use_parsers=(items.PostParser, items.SignpostParser),
+                    blogs=blogs
                 ):
                 elements.append(result)
 
@@ -88,9 +90,10 @@ class BlogTimelineParser:
 
         # Now the posts contained within
         posts = []
+        blogs = {}
         total_raw_posts = len(self.target["posts"])
         for post_index, post in enumerate(self.target["posts"]):
-            if result := items.parse_item(post, post_index, total_raw_posts):
+            if result := items.parse_item(post, post_index, total_raw_posts, blogs=blogs):
                 posts.append(result)
 
         return models.timelines.BlogTimeline(
@@ -105,9 +108,10 @@ class BlogTimelineParser:
 
         # Now the posts contained within
         posts = []
+        blogs = {}
         total_raw_posts = len(self.target["posts"])
         for post_index, post in enumerate(self.target["posts"]):
-            if result := items.parse_item(post, post_index, total_raw_posts):
+            if result := items.parse_item(post, post_index, total_raw_posts, blogs=blogs):
                 posts.append(result)
 
         return models.timelines.BlogTimeline(
@@ -138,13 +142,15 @@ class NoteTimelineParser:
         total_raw_notes = len(timeline["elements"])
 
         notes = []
+        blogs = {}
         for index, note in enumerate(timeline["elements"]):
             notes.append(
                 items.parse_item(
                     note,
                     index,
                     total_raw_notes,
-                    use_parsers=(items.ReplyNoteParser, items.ReblogNoteParser)
+                    use_parsers=(items.ReplyNoteParser, items.ReblogNoteParser),
+                    blogs=blogs
                 )
             )
 
@@ -2,27 +2,61 @@
 """Parses individual items from Tumblr's JSON API into an object"""
 
 
+import sys
 import datetime
+import functools
 
 from .. import helpers, models
 
 logger = helpers.LOGGER.getChild("parse")
 
 
+def parse_tags(raw_tags):
+    """Tags are frequently repeated across posts, as such they're interned"""
+    return tuple(sys.intern(tag) for tag in raw_tags)
+
+
 class BlogParser:
-    def __init__(self, target) -> None:
+    # Key and value identifying the objects this parser handles. See parse_item()
+    discriminator = ("objectType", "blog")
+
+    def __init__(self, target, blogs=None) -> None:
         self.target = target
 
+        # Blogs already parsed within the current timeline by their uuid. See parse_item()
+        self.blogs = blogs
+
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("objectType") == "blog":
-            return cls(initial_data["resources"][0]).parse()
+            return cls(initial_data["resources"][0], blogs).parse()
         else:
             return None
 
+    def _memoize(self, uuid, parse):
+        """Returns the blog with the given uuid parsed earlier within the timeline or parses it"""
+        if self.blogs is None or not uuid:
+            return parse()
+
+        if (blog := self.blogs.get(uuid)) is None:
+            blog = self.blogs[uuid] = parse()
+
+        return blog
+
+    @staticmethod
+    def parse_avatar(raw_avatar):
+        """Parses the list of avatar sizes into a tuple of Avatar objects"""
+        return tuple(
+            models.blog.Avatar(size.get("width"), size.get("height"), sys.intern(size["url"]))
+            for size in raw_avatar
+        )
+
     def parse_theme(self):
-        """Parses theming information for the blog into a BlogTheme object"""
-        target = self.target.get("theme")
+        """Parses theming information for the blog into a BlogTheme object
+
+        Identical themes share the same (immutable) BlogTheme instance
+        """
+        target = self.target["theme"]
 
         avatar_shape = target["avatarShape"]
 
@@ -30,12 +64,12 @@ class BlogParser:
         # `blog[fields]` was not passed, or did not include "theme" as a field.
         if header_image := target.get("headerImage"):
             header_info = models.blog.HeaderInfo(
-                header_image,
-                target["headerImageFocused"],
-                target["headerImageScaled"],
+                sys.intern(header_image),
+                sys.intern(target["headerImageFocused"]),
+                sys.intern(target["headerImageScaled"]),
             )
 
-            return models.blog.BlogTheme(
+            return models.blog.create_theme(
                 avatar_shape=avatar_shape,
                 background_color=target["backgroundColor"],
                 body_font=target["bodyFont"],
@@ -43,21 +77,21 @@ class BlogParser:
             )
         else:
             # Return limited information otherwise
-            return models.blog.BlogTheme(
-                avatar_shape=avatar_shape,
-                background_color=None,
-                body_font=None,
-                header_info=None
-            )
+            return models.blog.create_theme(avatar_shape=avatar_shape)
 
     def parse(self):
+        return self._memoize(self.target["uuid"], self._parse)
+
+    def _parse(self):
         return models.blog.Blog(
-            name=self.target["name"],
-            avatar=self.target["avatar"],
+            name=sys.intern(self.target["name"]),
+            avatar=self.parse_avatar(self.target["avatar"]),
             title=self.target["title"],
             url=self.target["url"],
             is_adult=self.target["isAdult"],
-            description_npf=self.target["descriptionNpf"],
+            # Only requested when the blog is rendered as a page header.
+            # See EMBEDDED_BLOG_FIELDS in api/request_config.py
+            description_npf=self.target.get("descriptionNpf"),
             uuid=self.target["uuid"],
             theme=self.parse_theme(),
             is_paywall_on=self.target["isPaywallOn"],
@@ -80,9 +114,12 @@ class BlogParser:
         TODO: Add tests for when field[blogs] lack attributes
         TODO: Discuss and figure out how to handle arbitrary values for (or don't) field[blogs]
         """
+        return self._memoize(self.target.get("uuid"), self._parse_limited)
+
+    def _parse_limited(self):
         return models.blog.Blog(
-            name=self.target["name"],
-            avatar=self.target["avatar"],
+            name=sys.intern(self.target["name"]),
+            avatar=self.parse_avatar(self.target["avatar"]),
             title=self.target.get("title", ""),
             url=self.target.get("url", ""),
             is_adult=self.target.get("isAdult", False),
@@ -95,13 +132,16 @@ class BlogParser:
 
 
 class PostParser:
-    def __init__(self, target) -> None:
+    discriminator = ("objectType", "post")
+
+    def __init__(self, target, blogs=None) -> None:
         self.target = target
+        self.blogs = blogs
 
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("objectType") == "post":
-            return cls(initial_data).parse()
+            return cls(initial_data, blogs).parse()
         else:
             return None
 
@@ -123,7 +163,7 @@ class PostParser:
     def parse(self):
         # When we know that the target is a blog object there is no need to
         # pass it to .process to identify it
-        blog = BlogParser(self.target["blog"]).parse()
+        blog = BlogParser(self.target["blog"], self.blogs).parse()
 
         id = self.target["id"]
 
@@ -165,11 +205,11 @@ class PostParser:
             is_broken_trail = False
 
             if raw_trail_blog := trail_post.get("blog"):
-                trail_blog = BlogParser(raw_trail_blog).parse()
+                trail_blog = BlogParser(raw_trail_blog, self.blogs).parse()
             else:
                 trail_blog = models.blog.BrokenBlog(
-                    name=trail_post["brokenBlog"]["name"],
-                    avatar=trail_post["brokenBlog"]["avatar"],
+                    name=sys.intern(trail_post["brokenBlog"]["name"]),
+                    avatar=BlogParser.parse_avatar(trail_post["brokenBlog"]["avatar"]),
                 )
 
                 is_broken_trail = True
@@ -203,7 +243,7 @@ class PostParser:
                 # If a blog uses a custom domain then the rebloggedFromUrl will be that domain
                 # thus we'll try to extract the original tumblr URL from the parentPostUrl attr instead.
                 post_url=self.target["parentPostUrl"],
-                blog_name=self.target["rebloggedFromName"],
+                blog_name=sys.intern(self.target["rebloggedFromName"]),
                 blog_title=self.target["rebloggedFromTitle"],
             )
 
@@ -211,7 +251,7 @@ class PostParser:
                 reblog_root_information = models.post.ReblogAttribution(
                     post_id=root_reblogged_from_id,
                     post_url=self.target["rebloggedRootUrl"],
-                    blog_name=self.target["rebloggedRootName"],
+                    blog_name=sys.intern(self.target["rebloggedRootName"]),
                     blog_title=self.target["rebloggedRootTitle"],
                 )
 
@@ -226,7 +266,7 @@ class PostParser:
             post_url=self.target["postUrl"],
             slug=self.target["slug"],
             date=datetime.datetime.fromtimestamp(self.target["timestamp"]),
-            tags=self.target["tags"],
+            tags=parse_tags(self.target["tags"]),
             summary=self.target["summary"],
 
             content=content,
@@ -250,13 +290,16 @@ class PostParser:
 
 
 class ReplyNoteParser:
-    def __init__(self, target) -> None:
+    discriminator = ("type", "reply")
+
+    def __init__(self, target, blogs=None) -> None:
             self.target = target
+            self.blogs = blogs
 
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("type") == "reply":
-            return cls(initial_data).parse()
+            return cls(initial_data, blogs).parse()
 
     def parse(self):
         return models.post.ReplyNote(
@@ -267,42 +310,48 @@ class ReplyNoteParser:
             content=self.target["content"],
             layout=self.target["layout"],
 
-            blog=BlogParser(self.target["blog"]).parse_limited()
+            blog=BlogParser(self.target["blog"], self.blogs).parse_limited()
         )
 
 
 class ReblogNoteParser:
-    def __init__(self, target) -> None:
+    discriminator = ("type", "reblog")
+
+    def __init__(self, target, blogs=None) -> None:
         self.target = target
+        self.blogs = blogs
 
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("type") == "reblog":
             # If blog data isn't given under a blog object then
             # the note is likely a simple reblog note
             if initial_data.get("blogName"):
-                return cls(initial_data).parse_simple()
-            return cls(initial_data).parse()
+                return cls(initial_data, blogs).parse_simple()
+            return cls(initial_data, blogs).parse()
 
     def parse(self) -> models.post.ReblogNote:
         return models.post.ReblogNote(
             uuid=self.target["id"],
             id=self.target["postId"],
-            blog=BlogParser(self.target["blog"]).parse_limited(),
+            blog=BlogParser(self.target["blog"], self.blogs).parse_limited(),
 
             content=self.target["content"],
             layout=self.target["content"],
-            tags=self.target["tags"],
+            tags=parse_tags(self.target["tags"]),
 
-            reblogged_from=self.target["reblogParentBlogName"],
+            reblogged_from=sys.intern(self.target["reblogParentBlogName"]),
             date=datetime.datetime.fromtimestamp(self.target["timestamp"]),   
             community_labels=PostParser.parse_community_label(self.target),
         )
 
     def parse_simple(self):
         blog=models.blog.Blog(
-            name=self.target["blogName"],
-            avatar=[{"url": avatar_url} for avatar_url in list(self.target["avatarUrl"].values())],
+            name=sys.intern(self.target["blogName"]),
+            avatar=tuple(
+                models.blog.Avatar(int(size), int(size), sys.intern(avatar_url))
+                for size, avatar_url in self.target["avatarUrl"].items()
+            ),
             title=self.target["blogTitle"],
             url="",
 
@@ -310,7 +359,7 @@ class ReblogNoteParser:
             description_npf="",
             uuid=self.target["blogUuid"],
 
-            theme=models.blog.BlogTheme(self.target["avatarShape"]),
+            theme=models.blog.create_theme(self.target["avatarShape"]),
             is_paywall_on =False,
             active = True
         )
@@ -322,39 +371,43 @@ class ReblogNoteParser:
 
             content=[],
             layout=[],
-            tags=self.target["tags"],
+            tags=parse_tags(self.target["tags"]),
 
-            reblogged_from=self.target["reblogParentBlogName"],
+            reblogged_from=sys.intern(self.target["reblogParentBlogName"]),
             date=datetime.datetime.fromtimestamp(self.target["timestamp"]),
             community_labels=[],
         )
 
 
 class LikeNoteParser:
+    discriminator = ("type", "like")
+
     def __init__(self, target) -> None:
         self.target = target
 
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("type") == "like":
             return cls(initial_data).parse()
 
     def parse(self):
         return models.post.LikeNote(
-            blog_name=self.target["blogName"],
+            blog_name=sys.intern(self.target["blogName"]),
             blog_uuid=self.target["blogUuid"],
             blog_title=self.target["blogTitle"],
             date=datetime.datetime.fromtimestamp(self.target["timestamp"]),
-            avatar=self.target["avatarUrl"],
+            avatar={size: sys.intern(url) for size, url in self.target["avatarUrl"].items()},
         )
 
 
 class SignpostParser:
+    discriminator = ("objectType", "signpost_cta")
+
     def __init__(self, target) -> None:
         self.target = target
 
     @classmethod
-    def process(cls, initial_data):
+    def process(cls, initial_data, blogs=None):
         if initial_data.get("objectType") == "signpost_cta":
             return cls(initial_data).parse()
 
@@ -365,20 +418,45 @@ class SignpostParser:
         )
 
 
-def parse_item(element, element_index=0, total_elements=1, use_parsers=None):
-    """Parses an item from Tumblr API's JSON response into a more usable structure"""
-    item_number = f"({element_index + 1}/{total_elements})"
-    logger.debug(f"parse_item: Parsing item {item_number}")
+@functools.lru_cache(maxsize=None)
+def _create_dispatch_table(use_parsers):
+    """Maps the discriminators of the given parsers to the parsers themselves
+
+    Returns the keys to look up in order and the table itself
+    """
+    dispatch_keys = []
+    dispatch_table = {}
+
+    for parser in use_parsers:
+        key, value = parser.discriminator
+
+        if key not in dispatch_keys:
+            dispatch_keys.append(key)
+
+        dispatch_table.setdefault((key, value), parser)
+
+    return tuple(dispatch_keys), dispatch_table
+
+
+def parse_item(element, element_index=0, total_elements=1, use_parsers=None, blogs=None):
+    """Parses an item from Tumblr API's JSON response into a more usable structure
+
+    The parser is selected from `use_parsers` (a tuple) by the element's discriminating key
+    (`objectType` or `type`) rather than by attempting each parser in turn.
+
+    `blogs` is a dictionary shared between every item of a timeline. Blogs are stored within it
+    by their uuid as to only parse (and hold) a single instance of each blog.
+    """
+    logger.debug("parse_item: Parsing item (%s/%s)", element_index + 1, total_elements)
 
     if not use_parsers:
-        return PostParser.process(element)
+        return PostParser.process(element, blogs)
 
-    # use_parsers must be a iterable object
-    for parser_index, parser in enumerate(use_parsers):
-        logger.debug(f"parse_item: Attempting to match item {item_number} with `{parser.__name__}`"
-                     f"({parser_index + 1}/{len(use_parsers)})...")
+    dispatch_keys, dispatch_table = _create_dispatch_table(use_parsers)
 
-        if parsed_element := parser.process(element):
-            return parsed_element
+    for key in dispatch_keys:
+        if parser := dispatch_table.get((key, element.get(key))):
+            logger.debug("parse_item: Matched item (%s/%s) with `%s`", element_index + 1, total_elements, parser.__name__)
+            return parser.process(element, blogs)
 
     return None
@@ -1,4 +1,4 @@
-from . import explore, media, search, tagged, blogs, assets, priviblur, miscellaneous, api, settings
+from . import explore, media, search, tagged, blogs, assets, priviblur, miscellaneous, api, settings, metrics
 
 BLUEPRINTS = (
     explore.explore,
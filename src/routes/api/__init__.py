@@ -1,7 +1,11 @@
 from sanic import Blueprint
+
+from src.exceptions import error_handlers
 from .v1 import v1
 
 api = Blueprint.group(
     v1,
     url_prefix="/api"
-)
\ No newline at end of file
+)
+
+error_handlers.register_into_api(api)
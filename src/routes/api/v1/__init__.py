@@ -1,8 +1,52 @@
+"""Version 1 of Priviblur's JSON API
+
+Timeline endpoints respond with
+
+    {"continuation": <cursor of the next page or null>, "results": <timeline>}
+
+where the next page is requested by passing the cursor back through `?continuation=`.
+Errors respond with `{"error": <message>}` alongside a 4xx or 5xx status.
+
+Timelines are serialised through the `.to_api_json()` methods of the models within
+priviblur_extractor/models. Fields are named, blogs are inlined wherever they appear and
+dates are Unix timestamps (in seconds). Fields are only ever added to this shape.
+
+    /explore/<feed>, /search/<query>, /tagged/<tag>, /blog/<blog>/post/<id>
+        {"elements": [{"type": "post" | "blog" | "signpost", ...<post, blog or signpost>}]}
+
+    /blog/<blog>, /blog/<blog>/tagged/<tag>, /blog/<blog>/search/<query>
+        {"blog_info": <blog>, "posts": [<post>], "total_posts": <int or null>}
+
+    /blog/<blog>/post/<id>/notes/<replies|reblogs|likes>
+        {"notes": [{"type": "reply" | "reblog" | "like", ...}], "total_notes": <int>,
+         "total_replies": <int>, "total_reblogs": <int>, "total_likes": <int>}
+
+    post
+        {"blog": <blog>, "id", "post_url", "slug", "date", "tags", "summary", "display_avatar",
+         "is_advertisement", "is_nsfw", "content" (NPF), "layout" (NPF),
+         "trail": [{"id", "blog": <blog>, "date", "content", "layout"}],
+         "note_count", "like_count", "reblog_count", "reply_count", "default_note_viewer_tab",
+         "reblog_from", "reblog_root": {"post_id", "post_url", "blog_name", "blog_title"} or null,
+         "community_labels": ["mature" | "drug_use" | "violence" | "sexual_themes"]}
+
+    blog
+        {"name", "avatar": [{"width", "height", "url"}] (largest first), "title", "url", "is_adult",
+         "description_npf", "uuid", "is_paywall_on", "active",
+         "theme": {"avatar_shape", "background_color", "body_font",
+                   "header_info": {"header_image", "focused_header_image", "scaled_header_image"}}}
+
+    Blogs within trails that no longer exist only carry their "name" and "avatar".
+"""
+
 from sanic import Blueprint
 
 from .misc import misc
+from .timelines import timelines
+from .blogs import blogs
 
 v1 = Blueprint.group(
     misc,
+    timelines,
+    blogs,
     url_prefix="/v1"
-)
\ No newline at end of file
+)
@@ -0,0 +1,106 @@
+import urllib.parse
+
+import sanic
+
+from .... import cache
+from .timelines import timeline_response, error_response, get_continuation
+
+blogs = sanic.Blueprint("api_blogs", url_prefix="/blog/<blog:([a-z\d]{1}[a-z\d-]{0,30}[a-z\d]{0,1})>")
+
+
+@blogs.get("/")
+async def blog_posts(request, blog : str):
+    """Lists the posts of a blog. Accepts the `before_id` parameter"""
+    blog = urllib.parse.unquote(blog)
+
+    if before_id := request.args.get("before_id"):
+        before_id = urllib.parse.unquote(before_id)
+
+    results = await cache.get_blog_posts(
+        request.app.ctx, blog, continuation=get_continuation(request), before_id=before_id
+    )
+
+    return timeline_response(results)
+
+
+@blogs.get("/tagged/<tag:str>")
+async def blog_tagged_posts(request, blog : str, tag : str):
+    blog = urllib.parse.unquote(blog)
+    tag = urllib.parse.unquote(tag)
+
+    results = await cache.get_blog_posts(
+        request.app.ctx, blog, continuation=get_continuation(request), tag=tag
+    )
+
+    return timeline_response(results)
+
+
+@blogs.get("/search/<query:str>")
+async def blog_search(request, blog : str, query : str):
+    blog = urllib.parse.unquote(blog)
+    query = urllib.parse.unquote(query)
+
+    results = await cache.get_blog_search_results(
+        request.app.ctx, blog, query, continuation=get_continuation(request)
+    )
+
+    return timeline_response(results)
+
+
+@blogs.get("/post/<post_id:int>")
+async def blog_post(request, blog : str, post_id : int):
+    blog = urllib.parse.unquote(blog)
+
+    results = await cache.get_blog_post(request.app.ctx, blog, post_id)
+
+    return timeline_response(results)
+
+
+@blogs.get("/post/<post_id:int>/notes/<note_type:str>")
+async def blog_post_notes(request, blog : str, post_id : int, note_type : str):
+    """Lists the notes of a post. Accepts the `latest` parameter for replies and `reblog_filter` for reblogs
+
+    Parameters are the same as the ones of the note viewer pages. See routes/blogs/post.py
+    """
+    blog = urllib.parse.unquote(blog)
+    tumblr_api = request.app.ctx.TumblrAPI
+    continuation = get_continuation(request)
+
+    match note_type:
+        case "replies":
+            arguments = {"latest": "latest" in request.get_args(keep_blank_values=True)}
+
+            if continuation:
+                arguments["after_id"] = continuation
+
+            fetch_function = tumblr_api.blog_post_replies
+        case "reblogs":
+            reblog_note_types = tumblr_api.config.ReblogNoteTypes
+            arguments = {}
+            fetch_function = tumblr_api.blog_post_notes_timeline
+
+            match request.args.get("reblog_filter"):
+                case "reblogs_with_comments":
+                    arguments["mode"] = reblog_note_types.REBLOGS_WITH_COMMENTS
+                case "reblogs_with_content_comments":
+                    arguments["mode"] = reblog_note_types.REBLOGS_WITH_CONTENT_COMMENTS
+                case "reblogs_only":
+                    arguments["return_likes"] = False
+                    fetch_function = tumblr_api.blog_notes
+
+            if continuation:
+                arguments["before_timestamp"] = continuation
+        case "likes":
+            arguments = {"before_timestamp": continuation}
+            fetch_function = tumblr_api.blog_notes
+        case _:
+            return error_response(f"Unknown note type \"{note_type}\"", 404)
+
+    results = await cache.get_post_notes(
+        request.app.ctx, blog, post_id, note_type, fetch_function, **arguments
+    )
+
+    return sanic.response.json({
+        "continuation": results.before_timestamp or results.after_id,
+        "results": results.to_api_json()
+    })
@@ -0,0 +1,100 @@
+import urllib.parse
+
+import sanic
+
+from ....cache import get_explore_results, get_search_results, get_tag_browse_results
+
+timelines = sanic.Blueprint("api_timelines", url_prefix="/")
+
+TIME_FILTERS = ("365", "180", "30", "7", "1")
+
+
+def timeline_response(results):
+    """Creates a response out of a timeline. See routes/api/v1/__init__.py for its shape"""
+    continuation = results.next.cursor if results.next else None
+
+    return sanic.response.json({"continuation": continuation, "results": results.to_api_json()})
+
+
+def error_response(message, status):
+    return sanic.response.json({"error": message}, status=status)
+
+
+def get_continuation(request):
+    if continuation := request.args.get("continuation"):
+        return urllib.parse.unquote(continuation)
+
+    return None
+
+
+@timelines.get("/explore/<feed:str>")
+async def explore(request, feed : str):
+    tumblr_api = request.app.ctx.TumblrAPI
+
+    match feed:
+        case "trending":
+            results = await get_explore_results(
+                request.app.ctx, tumblr_api.explore_trending, "trending", get_continuation(request)
+            )
+        case "today":
+            results = await get_explore_results(
+                request.app.ctx, tumblr_api.explore_today, "today", get_continuation(request)
+            )
+        case _:
+            if not (post_type := getattr(tumblr_api.config.ExplorePostTypeFilters, feed.upper(), None)):
+                return error_response(f"Unknown explore feed \"{feed}\"", 404)
+
+            results = await get_explore_results(
+                request.app.ctx,
+                tumblr_api.explore_post,
+                post_type.name.lower(),
+                get_continuation(request),
+                post_type=post_type
+            )
+
+    return timeline_response(results)
+
+
+@timelines.get("/search/<query:str>")
+async def search(request, query : str):
+    """Searches Tumblr
+
+    Accepts the `sort` (popular or recent), `post_type` and `t` (days) parameters
+    """
+    query = urllib.parse.unquote(query)
+    post_type_filters = request.app.ctx.TumblrAPI.config.PostTypeFilters
+
+    arguments = {"latest": request.args.get("sort") == "recent"}
+
+    time_filter = request.args.get("t")
+    arguments["days"] = time_filter if time_filter in TIME_FILTERS else 0
+
+    if post_type := request.args.get("post_type"):
+        # Tumblr refers to asks as "answer". See routes/search.py
+        post_type = "ANSWER" if post_type.upper() == "ASK" else post_type.upper()
+
+        if not (post_type_filter := getattr(post_type_filters, post_type, None)):
+            return error_response(f"Unknown post type \"{post_type.lower()}\"", 400)
+
+        arguments["post_type_filter"] = post_type_filter
+
+    results = await get_search_results(
+        request.app.ctx, query, get_continuation(request), **arguments
+    )
+
+    return timeline_response(results)
+
+
+@timelines.get("/tagged/<tag:str>")
+async def tagged(request, tag : str):
+    """Browses the posts of a tag. Accepts the `sort` (top or recent) parameter"""
+    tag = urllib.parse.unquote(tag)
+
+    results = await get_tag_browse_results(
+        request.app.ctx,
+        tag,
+        latest=request.args.get("sort") == "recent",
+        continuation=get_continuation(request)
+    )
+
+    return timeline_response(results)
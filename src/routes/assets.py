@@ -2,6 +2,8 @@ import sanic
 
 from npf_renderer.utils import BASIC_LAYOUT_CSS
 
+from ..helpers import compression, asset_manifest, preload
+
 assets = sanic.Blueprint("assets", url_prefix="/assets")
 
 # Static assets
@@ -13,6 +15,79 @@ async def base_post_layout(request):
     return sanic.response.text(BASIC_LAYOUT_CSS, content_type="text/css")
 
 
+@assets.listener("before_server_start")
+def prepare_assets(app):
+    """Fingerprints the assets and compresses every compressible one once with each available encoding
+
+    The manifest is stored at app.ctx.ASSET_MANIFEST, and the preload links of the assets
+    every page depends on at app.ctx.PRELOAD_LINKS. Compressed variants are stored within
+    app.ctx.PRECOMPRESSED_ASSETS as a mapping of the asset's paths (fingerprinted and not)
+    to its content type and a mapping of encoding to compressed body.
+    """
+    config = app.ctx.PRIVIBLUR_CONFIG
+
+    app.ctx.ASSET_MANIFEST = manifest = asset_manifest.build(
+        "assets",
+        extra_assets={"css/base-post-layout.css": BASIC_LAYOUT_CSS.encode()},
+        bundle=config.misc.bundle_assets,
+    )
+
+    # Every page depends on the base bundles
+    app.ctx.PRELOAD_LINKS = (
+        *(preload.format_link(url, "style") for url in manifest.bundle("base.css")),
+        *(preload.format_link(url, "script") for url in manifest.bundle("base.js")),
+    )
+
+    app.ctx.PRECOMPRESSED_ASSETS = {}
+
+    if not config.compression.enabled:
+        return
+
+    for path, url in manifest.urls.items():
+        body, content_type = manifest.files[url]
+
+        if not compression.is_compressible(content_type):
+            continue
+
+        app.ctx.PRECOMPRESSED_ASSETS[url] = (
+            content_type,
+            {encoding: compression.compress(body, encoding) for encoding in compression.ENCODERS},
+        )
+
+        # Unversioned URLs are otherwise served from the original file. Bundles have none.
+        if (source := manifest.sources.get(path)) is not None:
+            if source != body:
+                variants = {encoding: compression.compress(source, encoding) for encoding in compression.ENCODERS}
+            else:
+                variants = app.ctx.PRECOMPRESSED_ASSETS[url][1]
+
+            app.ctx.PRECOMPRESSED_ASSETS[asset_manifest.URL_PREFIX + path] = (content_type, variants)
+
+
+@assets.on_request
+def serve_prepared_asset(request):
+    """Serves fingerprinted assets from memory, and the precompressed variant of assets when the client accepts one"""
+    if asset := request.app.ctx.PRECOMPRESSED_ASSETS.get(request.path):
+        if encoding := compression.negotiate(request.headers.get("accept-encoding")):
+            content_type, variants = asset
+
+            return sanic.response.raw(
+                variants[encoding],
+                content_type=content_type,
+                headers={"content-encoding": encoding, "vary": "accept-encoding"},
+            )
+
+    if fingerprinted_asset := request.app.ctx.ASSET_MANIFEST.files.get(request.path):
+        body, content_type = fingerprinted_asset
+
+        headers = {"vary": "accept-encoding"} if asset else None
+        return sanic.response.raw(body, content_type=content_type, headers=headers)
+
+
 @assets.on_response
 def add_assets_cache(request, response):
-    response.headers["Cache-Control"] = "max-age=2629800, immutable"
+    if request.path in request.app.ctx.ASSET_MANIFEST.files:
+        # The URL changes along with the content
+        response.headers["Cache-Control"] = "max-age=31536000, immutable"
+    else:
+        response.headers["Cache-Control"] = "max-age=2629800, immutable"
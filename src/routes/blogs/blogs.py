@@ -4,12 +4,13 @@ import sanic
 import sanic_ext
 
 from ... import priviblur_extractor
-from ...cache import get_blog_posts, get_blog_search_results
+from ...cache import get_blog_posts, get_blog_search_results, get_rss_feed
+from ...helpers import preload, feeds
 
 blogs = sanic.Blueprint("blogs", url_prefix="/")
 
 
-@blogs.get("/")
+@blogs.get("/", ctx_blog_header=True)
 async def _blog_posts(request: sanic.Request, blog: str):
     blog = urllib.parse.unquote(blog)
 
@@ -21,6 +22,8 @@ async def _blog_posts(request: sanic.Request, blog: str):
 
     blog = await get_blog_posts(request.app.ctx, blog, continuation=continuation, before_id=before_id)
 
+    preload.add_blog_images(request, blog.blog_info, request.app.ctx.BLOG_IMAGE_HINTS)
+
     return await sanic_ext.render(
         "blog/blog.jinja",
         context={
@@ -32,7 +35,7 @@ async def _blog_posts(request: sanic.Request, blog: str):
 
 # Tags
 
-@blogs.get("/tagged/<tag:str>")
+@blogs.get("/tagged/<tag:str>", ctx_blog_header=True)
 async def _blog_tags(request: sanic.Request, blog: str, tag: str):
     blog = urllib.parse.unquote(blog)
     tag = urllib.parse.unquote(tag)
@@ -42,6 +45,8 @@ async def _blog_tags(request: sanic.Request, blog: str, tag: str):
 
     blog = await get_blog_posts(request.app.ctx, blog, continuation=continuation, tag=tag)
 
+    preload.add_blog_images(request, blog.blog_info, request.app.ctx.BLOG_IMAGE_HINTS)
+
     return await sanic_ext.render(
         "blog/blog.jinja",
         context={
@@ -54,7 +59,7 @@ async def _blog_tags(request: sanic.Request, blog: str, tag: str):
 
 # Search
 
-@blogs.get("/search/<query:str>")
+@blogs.get("/search/<query:str>", ctx_blog_header=True)
 async def _blog_search(request: sanic.Request, blog: str, query: str):
     blog = urllib.parse.unquote(blog)
     query = urllib.parse.unquote(query)
@@ -69,6 +74,8 @@ async def _blog_search(request: sanic.Request, blog: str, query: str):
         blog = await get_blog_posts(request.app.ctx, blog)
         blog.posts.clear()
 
+    preload.add_blog_images(request, blog.blog_info, request.app.ctx.BLOG_IMAGE_HINTS)
+
     return await sanic_ext.render(
         "blog/blog_search.jinja",
         context={
@@ -98,3 +105,25 @@ async def redirect_slash_post_no_slug(request: sanic.Request, blog: str, post_id
 @blogs.get("/post/<post_id:int>/<slug:str>")
 async def redirect_slash_post(request: sanic.Request, blog: str, post_id: str, slug: str):
     return sanic.redirect(request.app.url_for("blog_post._blog_post_with_slug", blog=blog, post_id=post_id, slug=slug))
+
+
+# RSS
+
+@blogs.get("/rss")
+async def _blog_rss(request: sanic.Request, blog: str):
+    blog = urllib.parse.unquote(blog)
+
+    async def render():
+        blog_posts = await get_blog_posts(request.app.ctx, blog)
+        blog_info = blog_posts.blog_info
+
+        return await feeds.render_feed(
+            request,
+            title=blog_info.title or blog_info.name,
+            path=f"/{blog_info.name}",
+            description=f"@{blog_info.name}",
+            elements=blog_posts.posts,
+        )
+
+    document, rendered_at = await get_rss_feed(request.app.ctx, f"blog:{blog}", render)
+    return feeds.feed_response(request, document, rendered_at)
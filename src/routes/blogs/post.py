@@ -5,6 +5,7 @@ import sanic
 import sanic_ext
 
 from ... import cache, priviblur_extractor
+from ...helpers import preload
 
 blog_post_bp = sanic.Blueprint("blog_post", url_prefix="/<post_id:int>")
 
@@ -68,8 +69,8 @@ async def before_blog_post_request(request):
     request.ctx.parsed_post = post
 
 
-@blog_post_bp.get("/")
-@blog_post_bp.get("/<slug:str>", name="_blog_post_with_slug")
+@blog_post_bp.get("/", ctx_blog_header=True)
+@blog_post_bp.get("/<slug:str>", name="_blog_post_with_slug", ctx_blog_header=True)
 async def _blog_post(request: sanic.Request, **kwargs):
     blog_info = priviblur_extractor.models.timelines.BlogTimeline(request.ctx.parsed_post.blog, (), None, None)
 
@@ -90,6 +91,8 @@ async def _blog_post(request: sanic.Request, **kwargs):
     else:
         fetch_poll_results = False
 
+    preload.add_blog_images(request, request.ctx.parsed_post.blog, request.app.ctx.BLOG_IMAGE_HINTS)
+
     return await sanic_ext.render(
         "blog/blog_post.jinja",
         context={
@@ -27,7 +27,7 @@ async def _handle_explore(request, endpoint, post_type = None):
                 continuation,
             )
 
-            title = request.app.ctx.translate(request.ctx.language, "explore_trending_page_title")
+            title = request.ctx.translate("explore_trending_page_title")
         case "explore._today":
             timeline = await get_explore_results(
                 request.app.ctx,
@@ -35,7 +35,7 @@ async def _handle_explore(request, endpoint, post_type = None):
                 "today",
                 continuation,
             )
-            title = request.app.ctx.translate(request.ctx.language, "explore_today_on_tumblr_page_title")
+            title = request.ctx.translate("explore_today_on_tumblr_page_title")
         case _:
             timeline = await get_explore_results(
                 request.app.ctx,
@@ -44,7 +44,7 @@ async def _handle_explore(request, endpoint, post_type = None):
                 continuation,
                 post_type=post_type
             )
-            title = request.app.ctx.translate(request.ctx.language, "explore_trending_page_title")
+            title = request.ctx.translate("explore_trending_page_title")
 
     return await sanic_ext.render(
         "timeline.jinja",
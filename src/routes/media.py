@@ -2,6 +2,7 @@ import sanic
 import aiohttp
 
 from src.exceptions import exceptions
+from ..helpers import metrics
 
 media = sanic.Blueprint("TumblrMedia", url_prefix="/tblr")
 
@@ -26,8 +27,17 @@ async def get_media(request, client : aiohttp.ClientSession, path_to_request, ad
 
         priviblur_response = await request.respond(headers=priviblur_response_headers)
 
-        async for chunk in tumblr_response.content.iter_any():
-            await priviblur_response.send(chunk)
+        active_streams = metrics.REGISTRY.gauge("priviblur_media_proxy_active_streams")
+        proxied_bytes = metrics.REGISTRY.counter("priviblur_media_proxy_bytes_total")
+
+        active_streams.inc()
+
+        try:
+            async for chunk in tumblr_response.content.iter_any():
+                proxied_bytes.inc(len(chunk))
+                await priviblur_response.send(chunk)
+        finally:
+            active_streams.dec()
 
     await priviblur_response.eof()
 
@@ -47,7 +57,8 @@ async def _media_cdn(request: sanic.Request, cdn: str, path: str):
         case "va":
             return await get_media(request, request.app.ctx.MediaVaClient, path, additional_headers={"accept": "video/webm,video/ogg,video/*;q=0.9, application/ogg;q=0.7,audio/*;q=0.6,*/*;q=0.5"})
         case _:
-            return await get_media(request, request.app.ctx.MediaGenericClient, path, base_url=f"https://{cdn}.media.tumblr.com") 
+            base_url = request.app.ctx.PRIVIBLUR_CONFIG.backend.upstream_url_override or f"https://{cdn}.media.tumblr.com"
+            return await get_media(request, request.app.ctx.MediaGenericClient, path, base_url=base_url)
 
 
 @media.get(r"/a/<path:path>")
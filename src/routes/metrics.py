@@ -0,0 +1,27 @@
+import sanic
+import sanic.exceptions
+
+from ..helpers import metrics as metrics_helpers
+
+metrics = sanic.Blueprint("metrics", url_prefix="/metrics")
+
+
+@metrics.get("/")
+async def _metrics(request: sanic.Request):
+    """Exposes metrics from every worker in Prometheus' text format"""
+    metrics_config = request.app.ctx.PRIVIBLUR_CONFIG.metrics
+
+    # When a dedicated port is configured the endpoint should not be reachable from the main one
+    if metrics_config.port and request.conn_info.server_port != metrics_config.port:
+        raise sanic.exceptions.NotFound()
+
+    if directory := metrics_helpers.get_snapshot_directory():
+        metrics_helpers.publish_snapshot(directory)
+        snapshots = metrics_helpers.collect_snapshots(directory, max_age=metrics_config.snapshot_interval * 3)
+    else:
+        snapshots = [metrics_helpers.REGISTRY.snapshot()]
+
+    return sanic.response.text(
+        metrics_helpers.render_prometheus(metrics_helpers.merge_snapshots(snapshots)),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -5,6 +5,16 @@ from src.exceptions import exceptions
 
 miscellaneous = sanic.Blueprint("miscellaneous", url_prefix="/")
 
+
+@miscellaneous.get("/healthz/ready")
+async def _ready(request: sanic.Request):
+    """Reports whether this worker has been warmed up and is ready to accept traffic"""
+    if request.app.ctx.READY:
+        return sanic.json({"ready": True})
+
+    return sanic.json({"ready": False}, status=503)
+
+
 @miscellaneous.get(r"/at/<path:path>")
 async def _at_links(request: sanic.Request, path : str):
     """Redirects for at.tumblr.com links"""
@@ -113,12 +113,11 @@ async def _query_search(request, query, **kwargs):
 
 async def _render(request, timeline, query, **kwargs):
     # We remove the continuation parameter used to fetch this page as to ensure the current continuation parameter isn't
-    # added when applying a search filter
-    if request.args.get("continuation"):
-        del request.args["continuation"]
+    # added when applying a search filter. Likewise for the fragment parameter used to load the next page in place.
+    query_args = {key: value for key, value in request.args.items() if key not in ("continuation", "fragment")}
 
     context = {
-        "app": request.app, "timeline": timeline, "query_args": request.args, "query": query
+        "app": request.app, "timeline": timeline, "query_args": query_args, "query": query
     }
 
     context.update(kwargs)
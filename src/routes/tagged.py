@@ -5,7 +5,8 @@ import sanic
 import sanic_ext
 
 from .. import priviblur_extractor
-from ..cache import get_tag_browse_results
+from ..cache import get_tag_browse_results, get_rss_feed
+from ..helpers import feeds
 
 tagged = sanic.Blueprint("tagged", url_prefix="/tagged")
 
@@ -40,4 +41,24 @@ async def _main(request: sanic.Request, tag: str):
             "tag": tag,
             "sort_by": sort_by
         }
-    )
\ No newline at end of file
+    )
+
+
+@tagged.get("/<tag:str>/rss")
+async def _rss(request: sanic.Request, tag: str):
+    """RSS feed of the most recent posts of the tag"""
+    tag = urllib.parse.unquote(tag)
+
+    async def render():
+        timeline = await get_tag_browse_results(request.app.ctx, tag, latest=True)
+
+        return await feeds.render_feed(
+            request,
+            title=f"#{tag}",
+            path=f"/tagged/{urllib.parse.quote(tag, safe='')}?sort=recent",
+            description=f"#{tag}",
+            elements=timeline.elements,
+        )
+
+    document, rendered_at = await get_rss_feed(request.app.ctx, f"tagged:{tag}", render)
+    return feeds.feed_response(request, document, rendered_at)
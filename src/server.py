@@ -1,21 +1,19 @@
 import os
+import time
+import asyncio
+import hashlib
+import shutil
 import logging
-import urllib.parse
-import functools
 
 import sanic
 import aiohttp
 import orjson
-import babel.numbers
-import babel.dates
-import babel.lists
-import redis.asyncio
 from npf_renderer import VERSION as NPF_RENDERER_VERSION
 
 from . import routes, priviblur_extractor, preferences
 from .exceptions import error_handlers
 from .config import load_config
-from .helpers import setup_logging, helpers, i18n, ext_npf_renderer
+from .helpers import setup_logging, helpers, i18n, metrics, timing, templating, prewarm, compression, etags, preload
 from .version import VERSION, CURRENT_COMMIT
 
 
@@ -36,7 +34,7 @@ app.config.TEMPLATING_PATH_TO_TEMPLATES = "src/templates"
 
 app.ctx.LOGGER = logging.getLogger("priviblur")
 
-app.ctx.CURRENT_COMMIT = CURRENT_COMMIT  # Used for cache busting
+app.ctx.CURRENT_COMMIT = CURRENT_COMMIT
 app.ctx.NPF_RENDERER_VERSION = NPF_RENDERER_VERSION
 app.ctx.VERSION = VERSION
 
@@ -44,17 +42,69 @@ app.ctx.URL_HANDLER = helpers.url_handler
 app.ctx.BLACKLIST_RESPONSE_HEADERS = ("access-control-allow-origin", "alt-svc", "server")
 
 app.ctx.PRIVIBLUR_CONFIG = config
+app.ctx.METRICS = metrics.REGISTRY
+app.ctx.SERVER_TIMING_TRUSTED_NETWORKS = timing.parse_trusted_networks(config.server_timing.trusted_ips)
 app.ctx.translate = i18n.translate
 
+# Preferences are immutable, as such the defaults are shared between requests
+app.ctx.DEFAULT_PREFERENCES = preferences.UserPreferences(**config.default_user_preferences._asdict())
+
+app.ctx.BLOG_IMAGE_HINTS = preload.BlogImageHints(config.preload.remembered_blogs)
+
+# Sent with every response. Built once rather than for every response
+# https://github.com/iv-org/invidious/blob/master/src/invidious/routes/before_all.cr
+SECURITY_HEADERS = (
+    ("x-xss-protection", "1; mode=block"),
+    ("x-content-type-options", "nosniff"),
+    ("referrer-policy", "same-origin"),
+    ("content-security-policy", "; ".join(
+        [
+            "default-src 'none'",
+            "script-src 'self'",
+            "style-src 'self' 'unsafe-inline'",
+            "img-src 'self' data:",
+            "font-src 'self' data:",
+            "connect-src 'self'",
+            "manifest-src 'self'",
+            "media-src 'self'",
+            "child-src 'self' blob:",
+        ]
+    )),
+)
+
 app.ctx.PRIVIBLUR_PARENT_DIR_PATH = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 
+# Part of every ETag, as to invalidate them whenever Priviblur, its models or its configuration changes
+app.ctx.ETAG_FINGERPRINT = ":".join((
+    VERSION,
+    str(priviblur_extractor.models.VERSION),
+    hashlib.blake2b(repr(config).encode(), digest_size=8).hexdigest(),
+))
+
+# Set once the worker has been warmed up. See /healthz/ready
+app.ctx.READY = False
+
 
 @app.listener("before_server_start")
 async def initialize(app):
     priviblur_backend = app.ctx.PRIVIBLUR_CONFIG.backend
 
+    # Points every upstream request to a stand-in server (utils/benchmarks/mock_tumblr.py)
+    upstream_url_override = priviblur_backend.upstream_url_override
+
+    if recorder_directory := priviblur_backend.response_recorder_directory:
+        response_recorder = priviblur_extractor.helpers.recorder.ResponseRecorder(
+            recorder_directory,
+            max_file_size=priviblur_backend.response_recorder_max_file_size * 1024 * 1024,
+            max_files=priviblur_backend.response_recorder_max_files
+        )
+    else:
+        response_recorder = None
+
     app.ctx.TumblrAPI = await priviblur_extractor.TumblrAPI.create(
-        main_request_timeout=priviblur_backend.main_response_timeout, json_loads=orjson.loads
+        main_request_timeout=priviblur_backend.main_response_timeout, json_loads=orjson.loads,
+        metrics=app.ctx.METRICS, url=upstream_url_override or "https://www.tumblr.com",
+        recorder=response_recorder
     )
 
     media_request_headers = {
@@ -70,7 +120,7 @@ async def initialize(app):
 
     def create_image_client(url, timeout):
         timeout = aiohttp.ClientTimeout(timeout)
-        return aiohttp.ClientSession(url, headers=media_request_headers, timeout=timeout)
+        return aiohttp.ClientSession(upstream_url_override or url, headers=media_request_headers, timeout=timeout)
 
     app.ctx.Media64Client = create_image_client(
         "https://64.media.tumblr.com", priviblur_backend.image_response_timeout
@@ -110,13 +160,16 @@ async def initialize(app):
     )
 
     app.ctx.TumblrAtClient = aiohttp.ClientSession(
-        "https://at.tumblr.com",
+        upstream_url_override or "https://at.tumblr.com",
         headers={"user-agent": priviblur_extractor.TumblrAPI.DEFAULT_HEADERS["user-agent"]},
         timeout=aiohttp.ClientTimeout(priviblur_backend.main_response_timeout)
     )
 
     # Initialize database
     if cache_url := app.ctx.PRIVIBLUR_CONFIG.cache.url:
+        # Only imported when the cache is enabled, as it takes a while to import
+        import redis.asyncio
+
         try:
             app.ctx.CacheDb = redis.asyncio.from_url(cache_url, protocol=3, decode_responses=True)
             await app.ctx.CacheDb.ping()
@@ -127,29 +180,67 @@ async def initialize(app):
         app.ctx.CacheDb = None
 
     # Add additional jinja filters and functions
+    templating.setup_environment(app.ext.environment, app.ctx.PRIVIBLUR_CONFIG)
+
+    if template_cache_path := app.ctx.PRIVIBLUR_CONFIG.misc.template_cache_path:
+        if not templating.setup_bytecode_cache(app.ext.environment, template_cache_path):
+            app.ctx.LOGGER.warning(
+                "Unable to write to the template cache at \"%s\". Templates will be compiled by every worker instead.",
+                template_cache_path
+            )
+
+    # Compile every template now rather than on the first request for each
+    start = time.perf_counter()
+    template_count = templating.load_templates(app.ext.environment)
+    app.ctx.LOGGER.debug("Loaded %d templates in %.1fms", template_count, (time.perf_counter() - start) * 1000)
+
+
+async def prewarm_and_mark_as_ready(app):
+    """Opens connections to Tumblr and fills the cache, then reports the worker as ready. See /healthz/ready"""
+    priviblur_backend = app.ctx.PRIVIBLUR_CONFIG.backend
+
+    upstream_clients = (
+        app.ctx.TumblrAPI.client, app.ctx.Media64Client, app.ctx.Media49Client, app.ctx.Media44Client,
+        app.ctx.MediaVeClient, app.ctx.MediaVaClient, app.ctx.AudioClient, app.ctx.TumblrAssetClient,
+        app.ctx.TumblrStaticClient, app.ctx.TumblrAtClient,
+    )
+
+    try:
+        await asyncio.wait_for(prewarm.prewarm(app.ctx, upstream_clients), priviblur_backend.prewarm_timeout)
+    except asyncio.TimeoutError:
+        app.ctx.LOGGER.warning("Prewarm: Timed out after %s seconds. Continuing without.", priviblur_backend.prewarm_timeout)
 
-    app.ext.environment.add_extension("jinja2.ext.do")
+    app.ctx.READY = True
 
-    app.ext.environment.filters["encodepathsegment"] = functools.partial(urllib.parse.quote, safe="")
 
-    app.ext.environment.filters["update_query_params"] = helpers.update_query_params
-    app.ext.environment.filters["remove_query_params"] = helpers.remove_query_params
-    app.ext.environment.filters["deseq_urlencode"] = helpers.deseq_urlencode
-    app.ext.environment.filters["ensure_single_prefix_slash"] = helpers.prefix_slash_in_url_if_missing
+@app.listener("after_server_start")
+async def start_prewarm(app):
+    # Ran in the background as for the worker to answer /healthz/ready (with 503) in the meantime
+    app.add_task(prewarm_and_mark_as_ready(app), name="prewarm")
 
-    app.ext.environment.filters["format_decimal"] = babel.numbers.format_decimal
-    app.ext.environment.filters["format_date"] = babel.dates.format_date
-    app.ext.environment.filters["format_datetime"] = babel.dates.format_datetime
 
-    app.ext.environment.filters["format_list"] = babel.lists.format_list
+@app.listener("before_server_stop")
+async def mark_as_unready(app):
+    # Lets load balancers drain the worker before it stops
+    app.ctx.READY = False
 
-    app.ext.environment.globals["translate"] = i18n.translate
-    app.ext.environment.globals["url_handler"] = helpers.url_handler
-    app.ext.environment.globals["format_npf"] = ext_npf_renderer.format_npf
-    app.ext.environment.globals["create_poll_callback"] = helpers.create_poll_callback
-    app.ext.environment.globals["create_reblog_attribution"] = helpers.create_reblog_attribution_link
 
-    app.ext.environment.tests["a_post"] = lambda element : isinstance(element, priviblur_extractor.models.post.Post)
+@app.listener("after_server_start")
+async def start_background_tasks(app):
+    if app.ctx.PRIVIBLUR_CONFIG.metrics.enabled:
+        app.add_task(metrics.monitor_event_loop_lag(), name="monitor_event_loop_lag")
+
+        if directory := metrics.get_snapshot_directory():
+            app.add_task(
+                metrics.publish_snapshots_periodically(directory, app.ctx.PRIVIBLUR_CONFIG.metrics.snapshot_interval),
+                name="publish_metrics_snapshots"
+            )
+
+
+@app.listener("after_server_stop")
+async def remove_metrics_snapshot(app):
+    if directory := metrics.get_snapshot_directory():
+        metrics.remove_snapshot(directory)
 
 
 @app.listener("main_process_start")
@@ -157,6 +248,16 @@ async def main_startup_listener(app):
     """Startup listener to notify of priviblur startup"""
     print(f"Starting up Priviblur version {VERSION}")
 
+    # Workers are separate processes. They'll need somewhere to share their metrics
+    if app.ctx.PRIVIBLUR_CONFIG.metrics.enabled:
+        metrics.create_snapshot_directory()
+
+
+@app.listener("main_process_stop")
+async def main_shutdown_listener(app):
+    if directory := metrics.get_snapshot_directory():
+        shutil.rmtree(directory, ignore_errors=True)
+
 
 @app.get("/")
 async def root(request):
@@ -170,47 +271,80 @@ async def robotstxt_route(request):
 
 @app.middleware("request", priority=1)
 async def before_all_routes(request):
-    request.ctx.preferences = preferences.UserPreferences(
-            **config.default_user_preferences._asdict()
-    )
+    request.ctx.request_start = time.perf_counter()
 
-    request.ctx.language = request.ctx.preferences.language
+    if config.server_timing.enabled:
+        request.ctx.server_timing = timing.begin(
+            timing.is_trusted(request.remote_addr or request.ip, request.app.ctx.SERVER_TIMING_TRUSTED_NETWORKS)
+        )
 
-    request.ctx.preferences = request.ctx.preferences.replace_from_cookie(request)
+    with timing.measure("prefs"):
+        request.ctx.preferences = request.app.ctx.DEFAULT_PREFERENCES.replace_from_cookie(request)
+
+    etags.begin(request, request.app.ctx.ETAG_FINGERPRINT)
+
+    if config.preload.enabled:
+        preload.begin(
+            request, request.app.ctx.PRELOAD_LINKS, request.app.ctx.BLOG_IMAGE_HINTS, config.preload.early_hints
+        )
 
 
 @app.middleware("response")
 async def after_all_routes(request, response):
-    # https://github.com/iv-org/invidious/blob/master/src/invidious/routes/before_all.cr
-    response.headers["x-xss-protection"] = "1; mode=block"
-    response.headers["x-content-type-options"] = "nosniff"
-    response.headers["referrer-policy"] = "same-origin"
+    for name, value in SECURITY_HEADERS:
+        response.headers[name] = value
 
-    response.headers["content-security-policy"] = "; ".join(
-        [
-            "default-src 'none'",
-            "script-src 'self'",
-            "style-src 'self' 'unsafe-inline'",
-            "img-src 'self' data:",
-            "font-src 'self' data:",
-            "connect-src 'self'",
-            "manifest-src 'self'",
-            "media-src 'self'",
-            "child-src 'self' blob:",
-        ]
-    )
+    if response.status == 200 and (etag := etags.current_etag()):
+        response.headers["etag"] = etag
+
+    if link := preload.to_header(request, response):
+        response.headers["link"] = link
+
+    if config.compression.enabled:
+        with timing.measure("compress"):
+            compression.compress_response(
+                request, response, config.compression.minimum_size, config.compression.level
+            )
+
+    if server_timing := getattr(request.ctx, "server_timing", None):
+        server_timing.add("total", time.perf_counter() - request.ctx.request_start)
+        response.headers["server-timing"] = server_timing.to_header()
+
+    if request.app.ctx.PRIVIBLUR_CONFIG.metrics.enabled:
+        metrics.record_request(request, response)
 
 # Register all routes:
 for route in routes.BLUEPRINTS:
     app.blueprint(route)
 
+if config.metrics.enabled:
+    app.blueprint(routes.metrics.metrics)
+
 # Register error handlers into Priviblur
 error_handlers.register(app)
 
 if __name__ == "__main__":
-    app.run(
-        host=config.deployment.host,
-        port=config.deployment.port,
-        workers=config.deployment.workers,
-        dev=config.misc.dev_mode
-    )
+    if config.metrics.enabled and config.metrics.port:
+        # Serve the metrics endpoint on its own listener as well
+        app.prepare(
+            host=config.deployment.host,
+            port=config.deployment.port,
+            workers=config.deployment.workers,
+            dev=config.misc.dev_mode
+        )
+
+        app.prepare(
+            host=config.metrics.host or config.deployment.host,
+            port=config.metrics.port,
+            workers=config.deployment.workers,
+            dev=config.misc.dev_mode
+        )
+
+        sanic.Sanic.serve()
+    else:
+        app.run(
+            host=config.deployment.host,
+            port=config.deployment.port,
+            workers=config.deployment.workers,
+            dev=config.misc.dev_mode
+        )
@@ -7,11 +7,6 @@ import subprocess
 #     stdout=subprocess.PIPE
 # ).stdout.decode("utf-8").strip()
 
-CURRENT_COMMIT = subprocess.run(
-    "git rev-list HEAD --max-count=1 --abbrev-commit".split(),
-    stdout=subprocess.PIPE
-).stdout.decode("utf-8").strip()
-
 # CURRENT_VERSION = subprocess.run(
 #     "git log -1 --format=%ci".split(),
 #     stdout=subprocess.PIPE
@@ -20,4 +15,32 @@ CURRENT_COMMIT = subprocess.run(
 CURRENT_VERSION = "v0.3.0-dev"
 
 PROJECT_VERSION = f"{CURRENT_VERSION}"
+
+
+def get_current_commit() -> str:
+    """Returns the commit Priviblur is running from
+
+    Read from the build metadata written by utils/build_info.py when available (such as within the
+    Docker image). Otherwise falls back to asking git.
+    """
+    try:
+        from ._build_info import CURRENT_COMMIT
+        return CURRENT_COMMIT
+    except ImportError:
+        pass
+
+    try:
+        return subprocess.run(
+            "git rev-list HEAD --max-count=1 --abbrev-commit".split(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout.decode("utf-8").strip() or "unknown"
+    except OSError:
+        # git isn't installed
+        return "unknown"
+
+
+# Needed as soon as the server is imported (ETag fingerprint, page footer), as such resolved right away.
+# Only runs git when the build metadata is missing, such as outside the Docker image.
+CURRENT_COMMIT = get_current_commit()
 VERSION = f"{CURRENT_VERSION}-{CURRENT_COMMIT}"
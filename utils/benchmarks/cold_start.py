@@ -0,0 +1,102 @@
+"""Cold start benchmark for templates
+
+Measures how long a freshly started worker takes to get its templates ready, and how long its
+first page of posts then takes to render. Every sample is taken within a new process:
+
+    on demand:  no template cache and no warm-up. Templates are compiled by the first requests
+    warm-up:    every template compiled at startup, with an empty template cache
+    cached:     every template loaded at startup out of a populated template cache,
+                as is the case for every worker after the first one or after compile.py
+
+    python utils/benchmarks/cold_start.py --samples 10
+"""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import orjson
+
+import fixtures
+import render
+
+from src.priviblur_extractor import parse_timeline
+from src.helpers import templating
+
+CASES = ("on demand", "warm-up", "cached")
+
+
+def run_sample(case, directory):
+    """Ran within the new process. Returns the startup and first render times in seconds"""
+    rng = fixtures.create_rng(0)
+    timeline = parse_timeline(orjson.loads(orjson.dumps(fixtures.timeline(rng, 20))))
+    context = {"request": render.create_request("en_US"), "elements": timeline.elements}
+
+    start = time.perf_counter()
+
+    environment = render.create_environment()
+
+    if case != "on demand":
+        templating.setup_bytecode_cache(environment, directory)
+        templating.load_templates(environment)
+
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    template = environment.from_string(render.PAGE_TEMPLATE)
+    asyncio.run(template.render_async(**context))
+
+    return startup, time.perf_counter() - start
+
+
+def spawn_sample(case, directory):
+    output = subprocess.run(
+        [sys.executable, __file__, "--sample", case, "--directory", directory],
+        capture_output=True, check=True,
+    ).stdout
+
+    return orjson.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the template cold start of a worker")
+    parser.add_argument("--samples", type=int, default=10, help="Processes spawned per case")
+    parser.add_argument("--sample", choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.sample:
+        print(orjson.dumps(run_sample(arguments.sample, arguments.directory)).decode())
+        return
+
+    directory = tempfile.mkdtemp(prefix="priviblur-template-cache-")
+    timings = {case: [] for case in CASES}
+
+    try:
+        for _ in range(arguments.samples):
+            for case in CASES:
+                # Every warm-up starts out with an empty cache. The cached case reuses the one it populated.
+                if case == "warm-up":
+                    shutil.rmtree(directory)
+                    os.makedirs(directory)
+
+                timings[case].append(spawn_sample(case, directory))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{'case':<10}  {'startup ms':>10}  {'first page ms':>13}  {'total ms':>8}")
+    for case, samples in timings.items():
+        startup = statistics.median(sample[0] for sample in samples) * 1000
+        first_page = statistics.median(sample[1] for sample in samples) * 1000
+
+        print(f"{case:<10}  {startup:>10.1f}  {first_page:>13.1f}  {startup + first_page:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
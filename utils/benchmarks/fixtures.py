@@ -0,0 +1,380 @@
+"""Synthetic Tumblr API responses
+
+Generates deterministic JSON payloads shaped like the camelCase responses Tumblr's API
+returns for each endpoint requested by TumblrAPI. Used by the mock Tumblr server and the
+benchmark suites whenever a recorded corpus isn't available.
+
+Every generator takes a random.Random instance as to keep the output reproducible.
+
+Corpora recorded through the `response_recorder_directory` option can be read with
+`load_corpus()` in order to replay real traffic instead.
+"""
+
+import os
+import sys
+import glob
+import random
+import string
+import time
+
+sys.path.insert(0, ".")
+
+from src.priviblur_extractor.helpers import recorder
+
+MEDIA_URL = "https://64.media.tumblr.com"
+
+WORDS = (
+    "lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do",
+    "eiusmod", "tempor", "incididunt", "ut", "labore", "et", "dolore", "magna", "aliqua", "enim",
+    "minim", "veniam", "quis", "nostrud", "exercitation", "ullamco", "laboris", "nisi", "aliquip",
+)
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _hex(rng, length):
+    return "".join(rng.choice(string.hexdigits[:16]) for _ in range(length))
+
+
+def _media_url(rng, size, extension="jpg"):
+    return f"{MEDIA_URL}/{_hex(rng, 32)}/{_hex(rng, 16)}-{_hex(rng, 2)}/{size}/{_hex(rng, 40)}.{extension}"
+
+
+def blog(rng, name=None, *, header=False):
+    """Creates a blog object as embedded within posts, trails and timelines
+
+    `header` additionally includes the fields only requested for blog headers
+    """
+    name = name or f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{rng.randint(0, 9999)}"
+
+    result = {
+        "name": name,
+        "avatar": [
+            {"width": size, "height": size, "url": f"{MEDIA_URL}/avatar_{_hex(rng, 12)}_{size}.pnj"}
+            for size in (512, 128, 96, 64)
+        ],
+        "title": _words(rng, 3).title(),
+        "url": f"https://{name}.tumblr.com/",
+        "isAdult": False,
+        "uuid": f"t:{_hex(rng, 22)}",
+        "theme": {
+            "avatarShape": rng.choice(("circle", "square")),
+            "backgroundColor": "#FAFAFA",
+            "bodyFont": "Helvetica Neue",
+            "headerImage": _media_url(rng, "s2048x3072"),
+            "headerImageFocused": _media_url(rng, "s2048x3072"),
+            "headerImageScaled": _media_url(rng, "s2048x3072"),
+        },
+        "isPaywallOn": False,
+    }
+
+    if header:
+        result["descriptionNpf"] = [text_block(rng)]
+
+    return result
+
+
+def text_block(rng, words=None):
+    return {"type": "text", "text": _words(rng, words or rng.randint(5, 60))}
+
+
+def image_block(rng):
+    return {
+        "type": "image",
+        "media": [
+            {"type": "image/jpeg", "width": width, "height": width * 3 // 2, "url": _media_url(rng, f"s{width}x{width * 3 // 2}")}
+            for width in (1280, 640, 400, 250, 100)
+        ],
+        "altText": _words(rng, 6),
+    }
+
+
+def poll_block(rng, timestamp):
+    return {
+        "type": "poll",
+        "clientId": f"{_hex(rng, 8)}-{_hex(rng, 4)}-{_hex(rng, 4)}-{_hex(rng, 4)}-{_hex(rng, 12)}",
+        "question": f"{_words(rng, 6)}?",
+        "answers": [
+            {"clientId": _hex(rng, 16), "answerText": _words(rng, 3)}
+            for _ in range(rng.randint(2, 5))
+        ],
+        "settings": {"closedStatus": "closed-results", "expireAfter": 604800},
+        "timestamp": timestamp,
+    }
+
+
+def content(rng, blocks=None, *, polls=False, timestamp=None):
+    """Creates a list of NPF content blocks"""
+    result = []
+
+    for _ in range(blocks if blocks is not None else rng.randint(1, 4)):
+        if rng.random() < 0.3:
+            result.append(image_block(rng))
+        else:
+            result.append(text_block(rng))
+
+    if polls:
+        result.append(poll_block(rng, timestamp or int(time.time())))
+
+    return result
+
+
+def _pick_blog(rng, blogs):
+    """Picks a blog from the `blogs` pool when given, as to have blogs repeat like they do on Tumblr"""
+    if blogs:
+        return rng.choice(blogs)
+
+    return blog(rng)
+
+
+def trail_item(rng, *, broken=False, blogs=None):
+    if broken:
+        return {
+            "brokenBlog": {"name": f"broken-{rng.randint(0, 9999)}", "avatar": blog(rng)["avatar"]},
+            "content": content(rng),
+            "layout": [],
+        }
+
+    return {
+        "blog": _pick_blog(rng, blogs),
+        "post": {"id": str(rng.randint(10 ** 17, 10 ** 18)), "timestamp": int(time.time()) - rng.randint(0, 10 ** 7)},
+        "content": content(rng),
+        "layout": [],
+    }
+
+
+def post(rng, *, post_blog=None, post_id=None, trail_depth=None, polls=False, blogs=None):
+    """Creates a post object with a trail of the given depth
+
+    Blogs are picked from the `blogs` pool when given
+    """
+    post_blog = post_blog or _pick_blog(rng, blogs)
+    post_id = str(post_id or rng.randint(10 ** 17, 10 ** 18))
+    timestamp = int(time.time()) - rng.randint(0, 10 ** 6)
+
+    if trail_depth is None:
+        trail_depth = rng.choice((0, 0, 0, 1, 1, 2, 3, 5))
+
+    reply_count, reblog_count, like_count = (rng.randint(0, 5000) for _ in range(3))
+
+    result = {
+        "objectType": "post",
+        "type": "blocks",
+        "id": post_id,
+        "blog": post_blog,
+        "postUrl": f"https://www.tumblr.com/{post_blog['name']}/{post_id}/synthetic-post",
+        "slug": "synthetic-post",
+        "timestamp": timestamp,
+        "tags": [rng.choice(WORDS) for _ in range(rng.randint(0, 8))],
+        "summary": _words(rng, 8),
+        "isNsfw": False,
+        "displayAvatar": True,
+        "noteCount": reply_count + reblog_count + like_count,
+        "replyCount": reply_count,
+        "reblogCount": reblog_count,
+        "likeCount": like_count,
+        "content": content(rng, polls=polls, timestamp=timestamp),
+        "layout": [],
+        "trail": [trail_item(rng, broken=rng.random() < 0.05, blogs=blogs) for _ in range(trail_depth)],
+    }
+
+    if trail_depth:
+        parent_id = str(rng.randint(10 ** 17, 10 ** 18))
+        root_id = str(rng.randint(10 ** 17, 10 ** 18))
+
+        result.update({
+            "rebloggedFromId": parent_id,
+            "rebloggedFromName": "parent-blog",
+            "rebloggedFromTitle": "Parent Blog",
+            "parentPostUrl": f"https://www.tumblr.com/parent-blog/{parent_id}",
+            "rebloggedRootId": root_id,
+            "rebloggedRootName": "root-blog",
+            "rebloggedRootTitle": "Root Blog",
+            "rebloggedRootUrl": f"https://www.tumblr.com/root-blog/{root_id}",
+        })
+
+    return result
+
+
+def _next_link(rng, **extra):
+    return {"next": {"href": "/api/v2/next", "method": "GET", "queryParams": {"cursor": _hex(rng, 48), **extra}}}
+
+
+def _wrap(response):
+    return {"meta": {"status": 200, "msg": "OK"}, "response": response}
+
+
+def timeline(rng, posts=20, *, trail_depth=None, polls=False, distinct_blogs=None):
+    """Response of the explore, search and tagged (hubs) endpoints
+
+    Posts and trails are authored by a pool of `distinct_blogs` blogs (half the post count by default)
+    """
+    blogs = [blog(rng) for _ in range(distinct_blogs or max(posts // 2, 1))]
+
+    return _wrap({
+        "timeline": {
+            "elements": [post(rng, trail_depth=trail_depth, polls=polls, blogs=blogs) for _ in range(posts)],
+            "links": _next_link(rng),
+        }
+    })
+
+
+def blog_posts(rng, blog_name=None, posts=20, *, trail_depth=None, polls=False):
+    """Response of the blog posts and blog search endpoints"""
+    post_blog = blog(rng, blog_name, header=True)
+    blogs = [blog(rng) for _ in range(max(posts // 2, 1))]
+
+    return _wrap({
+        "blog": post_blog,
+        "posts": [post(rng, post_blog=post_blog, trail_depth=trail_depth, polls=polls, blogs=blogs) for _ in range(posts)],
+        "totalPosts": posts * 50,
+        "links": {"next": {"href": "/api/v2/next", "method": "GET", "queryParams": {"pageNumber": _hex(rng, 24)}}},
+    })
+
+
+def blog_post(rng, blog_name=None, post_id=None, *, trail_depth=None, polls=False):
+    """Response of the permalink endpoint"""
+    post_blog = blog(rng, blog_name, header=True)
+
+    return _wrap({
+        "timeline": {
+            "elements": [post(rng, post_blog=post_blog, post_id=post_id, trail_depth=trail_depth, polls=polls)],
+        }
+    })
+
+
+def _note_totals(rng, notes):
+    return {
+        "totalNotes": notes * 10,
+        "totalLikes": notes * 5,
+        "totalReblogs": notes * 4,
+        "totalReplies": notes,
+    }
+
+
+def reply_notes(rng, notes=50):
+    """Response of the replies endpoint"""
+    elements = [
+        {
+            "type": "reply",
+            "id": _hex(rng, 24),
+            "replyId": str(rng.randint(10 ** 17, 10 ** 18)),
+            "timestamp": int(time.time()) - rng.randint(0, 10 ** 6),
+            "content": [text_block(rng, rng.randint(3, 30))],
+            "layout": [],
+            "blog": blog(rng),
+        }
+        for _ in range(notes)
+    ]
+
+    return _wrap({
+        "timeline": {"elements": elements, "links": _next_link(rng, after=_hex(rng, 24))},
+        **_note_totals(rng, notes),
+    })
+
+
+def reblog_notes(rng, notes=50):
+    """Response of the notes timeline endpoint"""
+    elements = [
+        {
+            "type": "reblog",
+            "id": _hex(rng, 24),
+            "postId": str(rng.randint(10 ** 17, 10 ** 18)),
+            "timestamp": int(time.time()) - rng.randint(0, 10 ** 6),
+            "content": content(rng, 1),
+            "tags": [rng.choice(WORDS) for _ in range(rng.randint(0, 4))],
+            "reblogParentBlogName": "parent-blog",
+            "blog": blog(rng),
+        }
+        for _ in range(notes)
+    ]
+
+    return _wrap({
+        "timeline": {
+            "elements": elements,
+            "links": _next_link(rng, beforeTimestamp=str(int(time.time()) - 10 ** 6)),
+        },
+        **_note_totals(rng, notes),
+    })
+
+
+def note_sequence(rng, notes=50, *, likes=True):
+    """Response of the notes endpoint. Either likes or plain reblogs"""
+    sequence = []
+
+    for _ in range(notes):
+        avatar = {str(size): f"{MEDIA_URL}/avatar_{_hex(rng, 12)}_{size}.pnj" for size in (64, 128)}
+
+        note = {
+            "type": "like" if likes else "reblog",
+            "blogName": f"{rng.choice(WORDS)}-{rng.randint(0, 9999)}",
+            "blogUuid": f"t:{_hex(rng, 22)}",
+            "blogTitle": _words(rng, 3).title(),
+            "avatarUrl": avatar,
+            "avatarShape": "circle",
+            "timestamp": int(time.time()) - rng.randint(0, 10 ** 6),
+        }
+
+        if not likes:
+            note.update({
+                "postId": str(rng.randint(10 ** 17, 10 ** 18)),
+                "tags": [],
+                "reblogParentBlogName": "parent-blog",
+            })
+
+        sequence.append(note)
+
+    return _wrap({
+        "notes": sequence,
+        "links": {"next": {"href": "/api/v2/next", "method": "GET", "queryParams": {"beforeTimestamp": str(int(time.time()) - 10 ** 6)}}},
+        **_note_totals(rng, notes),
+    })
+
+
+def poll_results(rng, answers=4):
+    return _wrap({
+        "timestamp": str(int(time.time())),
+        "results": {_hex(rng, 16): rng.randint(0, 10000) for _ in range(answers)},
+    })
+
+
+def error(status=404, code=0, message="Not Found"):
+    """Tumblr style error response"""
+    return {
+        "meta": {"status": status, "msg": message},
+        "response": [],
+        "errors": [{"title": message, "code": code, "detail": message}],
+    }
+
+
+def create_rng(seed=0):
+    return random.Random(seed)
+
+
+def corpus_family(record):
+    """Returns the endpoint family of a recorded response
+
+    Likes and plain reblogs share an endpoint, but are told apart here as they're
+    parsed differently.
+    """
+    if record["family"] == "blog_notes" and record["params"].get("mode") == "reblogs_only":
+        return "blog_notes_reblogs_only"
+
+    return record["family"]
+
+
+def load_corpus(directory):
+    """Reads every successful response within the recorded corpora in `directory`
+
+    Returns a dictionary mapping each endpoint family to a list of raw response bodies
+    """
+    responses = {}
+
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl.gz"))):
+        for record in recorder.read_records(path):
+            if record["status"] == 200:
+                responses.setdefault(corpus_family(record), []).append(record["body"])
+
+    return responses
@@ -0,0 +1,97 @@
+"""Import time profile of Priviblur
+
+Imports src.server within new processes under `python -X importtime`, which also covers the
+work done at import time by Priviblur's modules (loading the config, creating the app, etc.),
+then reports the total alongside the slowest top-level packages and modules. Times are the
+median out of every run.
+
+    python utils/benchmarks/importtime.py --runs 10
+    python utils/benchmarks/importtime.py --json importtime.json
+
+The example config is used unless PRIVIBLUR_CONFIG_LOCATION is set.
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import collections
+
+import orjson
+
+
+def profile(module):
+    """Returns the self and cumulative import times (in microseconds) of every module"""
+    environment = dict(os.environ)
+    environment.setdefault("PRIVIBLUR_CONFIG_LOCATION", "config.example.toml")
+
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=environment, capture_output=True, text=True, check=True,
+    ).stderr
+
+    modules = {}
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_time, cumulative_time, name = line[len("import time:"):].split("|")
+
+        if not self_time.strip().isdigit():
+            # Header
+            continue
+
+        modules[name.strip()] = (int(self_time), int(cumulative_time))
+
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the import time of Priviblur")
+    parser.add_argument("--module", default="src.server", help="Module to import")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="Amount of packages and modules listed")
+    parser.add_argument("--json", help="Write the results to this file as JSON")
+    arguments = parser.parse_args()
+
+    runs = [profile(arguments.module) for _ in range(arguments.runs)]
+
+    def median(values):
+        return statistics.median(values) / 1000
+
+    total = median(run[arguments.module][1] for run in runs)
+
+    # Self time of every module, and summed up by top level package
+    modules = collections.defaultdict(list)
+    packages = collections.defaultdict(list)
+
+    for run in runs:
+        package_times = collections.Counter()
+
+        for name, (self_time, _) in run.items():
+            modules[name].append(self_time)
+            package_times[name.split(".")[0]] += self_time
+
+        for package, self_time in package_times.items():
+            packages[package].append(self_time)
+
+    modules = {name: median(times) for name, times in modules.items()}
+    packages = {name: median(times) for name, times in packages.items()}
+
+    print(f"import {arguments.module}: {total:.1f}ms (median of {arguments.runs} runs)\n")
+
+    for title, results in (("package", packages), ("module (self)", modules)):
+        print(f"{title:<48}  {'ms':>7}")
+        for name, milliseconds in sorted(results.items(), key=lambda item: item[1], reverse=True)[:arguments.top]:
+            print(f"{name:<48}  {milliseconds:>7.1f}")
+        print()
+
+    if arguments.json:
+        with open(arguments.json, "wb") as file:
+            file.write(orjson.dumps({"total": total, "packages": packages, "modules": modules}, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Load driver for Priviblur
+
+Requests a set of Priviblur routes from a number of concurrent workers and reports the
+throughput and latency percentiles of each route. Intended to be ran against an instance
+backed by mock_tumblr.py, as to not send any traffic to Tumblr:
+
+    python utils/benchmarks/load.py --target http://127.0.0.1:8000 --concurrency 16 --duration 30
+
+Routes are read from `--routes`, a file with one path per line, or otherwise default to
+a set covering every major page type.
+"""
+
+import time
+import asyncio
+import argparse
+import itertools
+
+import orjson
+import aiohttp
+
+DEFAULT_ROUTES = (
+    "/explore/trending",
+    "/explore/today",
+    "/explore/photos",
+    "/search/lorem",
+    "/tagged/lorem",
+    "/staff",
+    "/staff/tagged/lorem",
+    "/staff/search/lorem",
+    "/staff/123456789/synthetic-post",
+    "/staff/123456789/synthetic-post?note_viewer=replies",
+    "/staff/123456789/synthetic-post?note_viewer=reblogs",
+    "/staff/123456789/synthetic-post?note_viewer=likes",
+    "/api/v1/poll/staff/123456789/poll-id/results",
+    "/tblr/media/64/abcdef/s640x960/image.jpg",
+)
+
+
+class RouteResults:
+    __slots__ = ("latencies", "errors", "statuses")
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def worker(session, routes, deadline, remaining, results, record):
+    for route in routes:
+        if time.perf_counter() >= deadline:
+            return
+
+        if remaining is not None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+
+        route_results = results[route]
+        start = time.perf_counter()
+
+        try:
+            async with session.get(route, allow_redirects=False) as response:
+                await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = None
+
+        if not record():
+            continue
+
+        route_results.latencies.append(time.perf_counter() - start)
+        route_results.statuses[status] = route_results.statuses.get(status, 0) + 1
+
+        if status is None or status >= 500:
+            route_results.errors += 1
+
+
+async def run(arguments, routes):
+    results = {route: RouteResults() for route in routes}
+
+    timeout = aiohttp.ClientTimeout(arguments.timeout)
+    connector = aiohttp.TCPConnector(limit=arguments.concurrency)
+
+    async with aiohttp.ClientSession(arguments.target, timeout=timeout, connector=connector) as session:
+        start = time.perf_counter()
+        warmup_until = start + arguments.warmup
+        deadline = warmup_until + arguments.duration
+
+        remaining = [arguments.requests] if arguments.requests else None
+
+        def record():
+            return time.perf_counter() >= warmup_until
+
+        workers = []
+        for index in range(arguments.concurrency):
+            # Offset each worker as to spread the load across the routes
+            offset_routes = itertools.islice(itertools.cycle(routes), index, None)
+            workers.append(worker(session, offset_routes, deadline, remaining, results, record))
+
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - max(warmup_until, start)
+
+    return results, elapsed
+
+
+def summarise(results, elapsed):
+    summary = {}
+
+    for route, route_results in results.items():
+        latencies = sorted(route_results.latencies)
+        summary[route] = {
+            "requests": len(latencies),
+            "errors": route_results.errors,
+            "statuses": {str(status): count for status, count in route_results.statuses.items()},
+            "rps": len(latencies) / elapsed if elapsed else 0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p90_ms": percentile(latencies, 0.90) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        }
+
+    return summary
+
+
+def print_summary(summary, elapsed):
+    route_width = max(len(route) for route in summary)
+
+    print(f"{'route':<{route_width}}  {'requests':>8}  {'errors':>6}  {'rps':>8}  {'p50 ms':>8}  {'p90 ms':>8}  {'p99 ms':>8}")
+
+    for route, stats in summary.items():
+        print(
+            f"{route:<{route_width}}  {stats['requests']:>8}  {stats['errors']:>6}  {stats['rps']:>8.1f}  "
+            f"{stats['p50_ms']:>8.1f}  {stats['p90_ms']:>8.1f}  {stats['p99_ms']:>8.1f}"
+        )
+
+    total_requests = sum(stats["requests"] for stats in summary.values())
+    print(f"\n{total_requests} requests in {elapsed:.1f}s ({total_requests / elapsed:.1f} rps)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Priviblur and report latency percentiles per route")
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="Base URL of the Priviblur instance")
+    parser.add_argument("--routes", help="File with one route per line. Defaults to a built-in set")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to measure for")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests (warmup included) instead")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds to run before measuring")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout of each request in seconds")
+    parser.add_argument("--json", help="Write the results to this file as JSON")
+    arguments = parser.parse_args()
+
+    if arguments.routes:
+        with open(arguments.routes) as file:
+            routes = tuple(line.strip() for line in file if line.strip() and not line.startswith("#"))
+    else:
+        routes = DEFAULT_ROUTES
+
+    if arguments.requests:
+        # Run until the request budget is exhausted
+        arguments.duration = float("inf")
+
+    results, elapsed = asyncio.run(run(arguments, routes))
+    summary = summarise(results, elapsed)
+
+    print_summary(summary, elapsed)
+
+    if arguments.json:
+        with open(arguments.json, "wb") as file:
+            file.write(orjson.dumps({"elapsed": elapsed, "routes": summary}, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Memory footprint of parsed timelines
+
+Simulates an in-process (L1) cache holding `--timelines` parsed timelines and reports
+its resident size. Two ways of populating the cache are measured, each within its own
+process as to get a clean resident set size:
+
+    parsed:  Timelines parsed from freshly decoded API responses
+    rebuilt: Timelines rebuilt from their serialized (Redis cached) form
+
+Alongside the memory retained per timeline, the size of the serialized form is reported
+as that's what ends up within Redis.
+
+    python utils/benchmarks/memory.py --timelines 10000
+"""
+
+import gc
+import os
+import time
+import argparse
+import tracemalloc
+import multiprocessing
+
+import orjson
+
+import fixtures
+
+from src.priviblur_extractor import parse_timeline, models
+
+
+def resident_set_size():
+    """Returns the resident set size of the current process in bytes"""
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def create_pool(arguments):
+    """Creates the distinct raw responses the cache is filled from"""
+    if arguments.corpus:
+        corpus = fixtures.load_corpus(arguments.corpus)
+        bodies = [
+            body.encode() for family, bodies in corpus.items()
+            for body in bodies if family.startswith("explore") or family in ("timeline_search", "hubs_timeline")
+        ]
+
+        if bodies:
+            return bodies
+
+    rng = fixtures.create_rng(arguments.seed)
+    return [orjson.dumps(fixtures.timeline(rng, arguments.posts)) for _ in range(arguments.pool)]
+
+
+def fill_cache(mode, pool, count):
+    if mode == "parsed":
+        return [parse_timeline(orjson.loads(pool[index % len(pool)])) for index in range(count)]
+
+    serialized = [orjson.dumps(parse_timeline(orjson.loads(body)).to_json_serialisable()) for body in pool]
+    return [models.timelines.Timeline.from_json(orjson.loads(serialized[index % len(serialized)])) for index in range(count)]
+
+
+def measure(mode, arguments, results):
+    pool = create_pool(arguments)
+
+    serialized_size = sum(
+        len(orjson.dumps(parse_timeline(orjson.loads(body)).to_json_serialisable())) for body in pool
+    ) / len(pool)
+
+    gc.collect()
+    rss_before = resident_set_size()
+
+    start = time.perf_counter()
+    cache = fill_cache(mode, pool, arguments.timelines)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    rss_after = resident_set_size()
+
+    # Python level allocations retained by a sample of the cache
+    sample_size = min(len(pool), arguments.timelines)
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    sample = fill_cache(mode, pool, sample_size)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results[mode] = {
+        "timelines": len(cache),
+        "rss_mib": (rss_after - rss_before) / 1024 / 1024,
+        "retained_kib_per_timeline": (retained - baseline) / len(sample) / 1024,
+        "serialized_kib_per_timeline": serialized_size / 1024,
+        "fill_seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory used by parsed timelines")
+    parser.add_argument("--timelines", type=int, default=10000, help="Timelines held within the simulated cache")
+    parser.add_argument("--posts", type=int, default=20, help="Posts per synthetic timeline")
+    parser.add_argument("--pool", type=int, default=50, help="Distinct synthetic responses to fill the cache from")
+    parser.add_argument("--corpus", help="Directory of recorded corpora to use instead of synthetic responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the results to this file as JSON")
+    arguments = parser.parse_args()
+
+    with multiprocessing.Manager() as manager:
+        results = manager.dict()
+
+        for mode in ("parsed", "rebuilt"):
+            process = multiprocessing.Process(target=measure, args=(mode, arguments, results))
+            process.start()
+            process.join()
+
+        results = dict(results)
+
+    print(f"{'mode':<8}  {'timelines':>9}  {'RSS MiB':>8}  {'KiB/timeline':>12}  {'serialized KiB':>14}  {'fill s':>7}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<8}  {stats['timelines']:>9}  {stats['rss_mib']:>8.1f}  {stats['retained_kib_per_timeline']:>12.1f}  "
+            f"{stats['serialized_kib_per_timeline']:>14.1f}  {stats['fill_seconds']:>7.2f}"
+        )
+
+    if arguments.json:
+        with open(arguments.json, "wb") as file:
+            file.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Micro-benchmark for the work done by the request and response middleware
+
+Measures the preferences and security headers steps ran for every request, whatever the route,
+for requests without a settings cookie, with a valid one and with an invalid one:
+
+    uncached: preferences created and the cookie parsed anew for every request
+    cached:   the shared default preferences, with parsed cookies memoized
+
+The security headers are measured separately, set one by one with the CSP joined for every
+response versus applied from the precomputed block.
+
+    python utils/benchmarks/middleware.py
+"""
+
+import time
+import types
+import argparse
+import statistics
+
+from sanic.compat import Header
+
+from src import preferences
+from src.helpers import i18n
+
+COOKIES = {
+    "none": {},
+    "valid": {"settings": "language=fr&theme=dark&version=1"},
+    "invalid": {"settings": "language=fr&theme=dark"},
+}
+
+CSP = [
+    "default-src 'none'",
+    "script-src 'self'",
+    "style-src 'self' 'unsafe-inline'",
+    "img-src 'self' data:",
+    "font-src 'self' data:",
+    "connect-src 'self'",
+    "manifest-src 'self'",
+    "media-src 'self'",
+    "child-src 'self' blob:",
+]
+
+SECURITY_HEADERS = (
+    ("x-xss-protection", "1; mode=block"),
+    ("x-content-type-options", "nosniff"),
+    ("referrer-policy", "same-origin"),
+    ("content-security-policy", "; ".join(CSP)),
+)
+
+DEFAULTS = {"language": "en_US", "theme": "auto"}
+DEFAULT_PREFERENCES = preferences.UserPreferences(**DEFAULTS)
+
+
+def create_request(cookies, languages):
+    return types.SimpleNamespace(
+        cookies=cookies,
+        ctx=types.SimpleNamespace(),
+        app=types.SimpleNamespace(ctx=types.SimpleNamespace(LANGUAGES=languages)),
+    )
+
+
+def uncached_preferences(request):
+    preferences.UserPreferences._parse_cookie.cache_clear()
+    return preferences.UserPreferences(**DEFAULTS).replace_from_cookie(request)
+
+
+def cached_preferences(request):
+    return DEFAULT_PREFERENCES.replace_from_cookie(request)
+
+
+def uncached_headers(headers):
+    headers["x-xss-protection"] = "1; mode=block"
+    headers["x-content-type-options"] = "nosniff"
+    headers["referrer-policy"] = "same-origin"
+    headers["content-security-policy"] = "; ".join(CSP)
+
+
+def cached_headers(headers):
+    for name, value in SECURITY_HEADERS:
+        headers[name] = value
+
+
+def measure(function, argument_factory, iterations):
+    arguments = [argument_factory() for _ in range(iterations)]
+
+    start = time.process_time()
+    for argument in arguments:
+        function(argument)
+
+    return (time.process_time() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-request middleware work")
+    parser.add_argument("--iterations", type=int, default=20000, help="Calls per round")
+    parser.add_argument("--rounds", type=int, default=15, help="Rounds per variant. The median is reported")
+    arguments = parser.parse_args()
+
+    languages = i18n.initialize_locales()
+
+    cases = {
+        f"prefs, {name} cookie": (
+            (uncached_preferences, cached_preferences),
+            lambda cookies=cookies: create_request(cookies, languages),
+        )
+        for name, cookies in COOKIES.items()
+    }
+    cases["security headers"] = ((uncached_headers, cached_headers), Header)
+
+    print(f"{'case':<22}  {'uncached ns':>12}  {'cached ns':>10}  {'change':>8}")
+
+    for name, ((uncached, cached), factory) in cases.items():
+        timings = {uncached: [], cached: []}
+
+        # Alternate between the variants as for both to be equally affected by noise
+        for _ in range(arguments.rounds):
+            for function in timings:
+                timings[function].append(measure(function, factory, arguments.iterations))
+
+        before = statistics.median(timings[uncached])
+        after = statistics.median(timings[cached])
+
+        print(f"{name:<22}  {before * 1e9:>12.0f}  {after * 1e9:>10.0f}  {after / before - 1:>+8.1%}")
+
+
+if __name__ == "__main__":
+    main()
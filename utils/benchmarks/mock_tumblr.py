@@ -0,0 +1,177 @@
+"""Stand-in for Tumblr's API and media servers
+
+Answers every endpoint requested by TumblrAPI with either recorded fixtures or synthetic
+responses from fixtures.py, and any other path with synthetic media. Point Priviblur at
+it through `upstream_url_override` under [priviblur_backend]:
+
+    python utils/benchmarks/mock_tumblr.py --port 8080 --latency 50 --jitter 20
+    python utils/benchmarks/load.py --target http://127.0.0.1:8000
+
+Recorded fixtures are read from `--fixtures`, where `<family>.json` and `<family>-<anything>.json`
+files are replayed for the matching endpoint family. Families match the ones TumblrAPI records
+metrics under, such as "explore_trending" or "blog_post".
+Corpora written by Priviblur's response recorder (*.jsonl.gz) within the same directory
+are replayed as well.
+"""
+
+import os
+import re
+import glob
+import random
+import asyncio
+import argparse
+import mimetypes
+
+import orjson
+from aiohttp import web
+
+import fixtures
+
+# (endpoint family, pattern) matched against the path following /api/v2/
+ENDPOINT_FAMILIES = (
+    ("explore_trending", re.compile(r"explore/trending")),
+    ("explore_today", re.compile(r"explore/home/today")),
+    ("explore_post", re.compile(r"explore/posts/[^/]+")),
+    ("explore", re.compile(r"explore")),
+    ("timeline_search", re.compile(r"timeline/search")),
+    ("hubs_timeline", re.compile(r"hubs/[^/]+/timeline")),
+    ("blog_post", re.compile(r"blog/[^/]+/posts/[^/]+/permalink")),
+    ("blog_posts", re.compile(r"blog/[^/]+/posts")),
+    ("blog_search", re.compile(r"blog/[^/]+/search/.+")),
+    ("blog_post_replies", re.compile(r"blog/[^/]+/post/[^/]+/replies")),
+    ("blog_post_notes_timeline", re.compile(r"blog/[^/]+/post/[^/]+/notes/timeline")),
+    ("blog_notes", re.compile(r"blog/[^/]+/notes")),
+    ("poll_results", re.compile(r"polls/[^/]+/[^/]+/[^/]+/results")),
+)
+
+SYNTHETIC_GENERATORS = {
+    "explore_trending": lambda rng: fixtures.timeline(rng),
+    "explore_today": lambda rng: fixtures.timeline(rng),
+    "explore_post": lambda rng: fixtures.timeline(rng),
+    "explore": lambda rng: fixtures.timeline(rng),
+    "timeline_search": lambda rng: fixtures.timeline(rng),
+    "hubs_timeline": lambda rng: fixtures.timeline(rng, 14),
+    "blog_post": lambda rng: fixtures.blog_post(rng, polls=rng.random() < 0.2),
+    "blog_posts": lambda rng: fixtures.blog_posts(rng),
+    "blog_search": lambda rng: fixtures.blog_posts(rng),
+    "blog_post_replies": lambda rng: fixtures.reply_notes(rng),
+    "blog_post_notes_timeline": lambda rng: fixtures.reblog_notes(rng),
+    "blog_notes": lambda rng: fixtures.note_sequence(rng),
+    "blog_notes_reblogs_only": lambda rng: fixtures.note_sequence(rng, likes=False),
+    "poll_results": lambda rng: fixtures.poll_results(rng),
+}
+
+
+def match_family(path, query):
+    for family, pattern in ENDPOINT_FAMILIES:
+        if pattern.fullmatch(path):
+            if family == "blog_notes" and query.get("mode") == "reblogs_only":
+                return "blog_notes_reblogs_only"
+            return family
+
+    return None
+
+
+class MockTumblr:
+    def __init__(self, arguments):
+        self.arguments = arguments
+        self.rng = random.Random(arguments.seed)
+
+        # family -> list of encoded response bodies
+        self.responses = {}
+
+        for family, generator in SYNTHETIC_GENERATORS.items():
+            self.responses[family] = [orjson.dumps(generator(self.rng)) for _ in range(arguments.variants)]
+
+        if arguments.fixtures:
+            self.load_fixtures(arguments.fixtures)
+
+        # Without an internal error code as to not be mistaken for a missing blog
+        self.error_body = orjson.dumps(fixtures.error(arguments.error_status, None, "Injected error"))
+        self.media_body = bytes(self.rng.getrandbits(8) for _ in range(arguments.media_size))
+
+    def load_fixtures(self, directory):
+        corpus = fixtures.load_corpus(directory)
+
+        for family in SYNTHETIC_GENERATORS:
+            recorded = [body.encode() for body in corpus.get(family, ())]
+            # Delimited, as families may prefix one another ("blog_post" and "blog_posts")
+            paths = [os.path.join(directory, f"{family}.json")]
+            paths.extend(sorted(glob.glob(os.path.join(directory, f"{family}-*.json"))))
+
+            for path in paths:
+                if not os.path.isfile(path):
+                    continue
+
+                with open(path, "rb") as file:
+                    recorded.append(file.read())
+
+            if recorded:
+                self.responses[family] = recorded
+                print(f"Replaying {len(recorded)} recorded response(s) for \"{family}\"")
+
+    async def simulate_latency(self, latency):
+        if delay := latency + self.rng.uniform(0, self.arguments.jitter):
+            await asyncio.sleep(delay / 1000)
+
+    def should_fail(self, error_rate):
+        return error_rate and self.rng.random() < error_rate
+
+    def respond(self, body, status=200):
+        response = web.Response(body=body, status=status, content_type="application/json")
+
+        if self.arguments.compress:
+            response.enable_compression()
+
+        return response
+
+    async def handle_api(self, request):
+        await self.simulate_latency(self.arguments.latency)
+
+        family = match_family(request.match_info["path"], request.query)
+        if family is None:
+            return self.respond(orjson.dumps(fixtures.error()), status=404)
+
+        if self.should_fail(self.arguments.error_rate):
+            return self.respond(self.error_body, status=self.arguments.error_status)
+
+        return self.respond(self.rng.choice(self.responses[family]))
+
+    async def handle_media(self, request):
+        await self.simulate_latency(self.arguments.media_latency)
+
+        if self.should_fail(self.arguments.media_error_rate):
+            return web.Response(status=self.arguments.error_status)
+
+        content_type = mimetypes.guess_type(request.path)[0] or "image/jpeg"
+        return web.Response(body=self.media_body, content_type=content_type, headers={"cache-control": "max-age=31536000"})
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_get("/api/v2/{path:.+}", self.handle_api)
+        app.router.add_route("*", "/{path:.*}", self.handle_media)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Tumblr API and media server for benchmarking Priviblur")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", help="Directory of recorded responses to replay")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic responses, latency and errors")
+    parser.add_argument("--variants", type=int, default=8, help="Synthetic responses generated per endpoint")
+    parser.add_argument("--latency", type=float, default=0, help="Base latency of API responses in milliseconds")
+    parser.add_argument("--media-latency", type=float, default=0, help="Base latency of media responses in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0, help="Random latency added on top, in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of API requests answered with an error")
+    parser.add_argument("--media-error-rate", type=float, default=0, help="Fraction of media requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors")
+    parser.add_argument("--media-size", type=int, default=64 * 1024, help="Size of synthetic media in bytes")
+    parser.add_argument("--compress", action="store_true", help="Compress responses like Tumblr does")
+    arguments = parser.parse_args()
+
+    web.run_app(MockTumblr(arguments).create_app(), host=arguments.host, port=arguments.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Micro-benchmarks for priviblur_extractor.parse
+
+Runs each parser over payloads of varying sizes and reports operations per second, alongside
+the peak and retained memory allocated by a single operation (through tracemalloc):
+
+    python utils/benchmarks/parsers.py
+    python utils/benchmarks/parsers.py --save baseline.json
+    python utils/benchmarks/parsers.py --compare baseline.json --threshold 0.1
+
+When comparing, the script exits with a non-zero status if the throughput of any case
+regressed by more than `--threshold` (a fraction) relative to the baseline.
+
+Synthetic payloads from fixtures.py are used by default. Recorded corpora can be
+benchmarked as well through `--corpus`.
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+
+import orjson
+
+import fixtures
+
+from src.priviblur_extractor.parse import collection_parsers, items
+
+TRAIL_DEPTHS = (0, 1, 5, 10, 25, 50)
+
+# Endpoint family -> function parsing its (decoded) response
+CORPUS_PARSERS = {
+    "explore_trending": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "explore_today": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "explore_post": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "timeline_search": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "hubs_timeline": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "blog_post": lambda data: collection_parsers.TimelineParser.process(data["response"]),
+    "blog_posts": lambda data: collection_parsers.BlogTimelineParser.process(data["response"]),
+    "blog_search": lambda data: collection_parsers.BlogTimelineParser(data["response"]).parse_blog_search_timeline(),
+    "blog_post_replies": lambda data: collection_parsers.NoteTimelineParser.process(data["response"]),
+    "blog_post_notes_timeline": lambda data: collection_parsers.NoteTimelineParser.process(data["response"]),
+    "blog_notes": lambda data: collection_parsers.NoteTimelineParser.process(data["response"]),
+    "blog_notes_reblogs_only": lambda data: collection_parsers.NoteTimelineParser.process(data["response"]),
+}
+
+
+def create_synthetic_cases(seed):
+    """Returns a list of (name, function) pairs over synthetic payloads"""
+    rng = fixtures.create_rng(seed)
+    cases = []
+
+    raw_blog = fixtures.blog(rng, header=True)
+    cases.append(("BlogParser", lambda: items.BlogParser(raw_blog).parse()))
+
+    for depth in TRAIL_DEPTHS:
+        raw_post = fixtures.post(rng, trail_depth=depth)
+        cases.append((f"PostParser trail={depth}", lambda raw_post=raw_post: items.PostParser(raw_post).parse()))
+
+    for depth in TRAIL_DEPTHS:
+        raw_timeline = fixtures.timeline(rng, 20, trail_depth=depth)["response"]
+        cases.append((
+            f"TimelineParser 20 posts trail={depth}",
+            lambda raw_timeline=raw_timeline: collection_parsers.TimelineParser.process(raw_timeline)
+        ))
+
+    raw_blog_timeline = fixtures.blog_posts(rng)["response"]
+    cases.append(("BlogTimelineParser 20 posts", lambda: collection_parsers.BlogTimelineParser.process(raw_blog_timeline)))
+
+    raw_replies = fixtures.reply_notes(rng, 50)["response"]
+    raw_reblogs = fixtures.reblog_notes(rng, 50)["response"]
+    raw_likes = fixtures.note_sequence(rng, 50)["response"]
+
+    cases.append(("NoteTimelineParser 50 replies", lambda: collection_parsers.NoteTimelineParser.process(raw_replies)))
+    cases.append(("NoteTimelineParser 50 reblogs", lambda: collection_parsers.NoteTimelineParser.process(raw_reblogs)))
+    cases.append(("NoteTimelineParser 50 likes", lambda: collection_parsers.NoteTimelineParser.process(raw_likes)))
+
+    return cases
+
+
+def create_corpus_cases(directory, limit):
+    """Returns a list of (name, function) pairs over recorded responses"""
+    cases = []
+
+    for family, bodies in sorted(fixtures.load_corpus(directory).items()):
+        if (parser := CORPUS_PARSERS.get(family)) is None:
+            continue
+
+        for index, body in enumerate(bodies[:limit]):
+            data = orjson.loads(body)
+            cases.append((f"corpus {family} #{index}", lambda parser=parser, data=data: parser(data)))
+
+    return cases
+
+
+def measure_throughput(function, min_time, repeat):
+    """Returns the best operations per second out of `repeat` rounds lasting at least `min_time` seconds"""
+    # Calibrate the number of operations per round
+    operations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(operations):
+            function()
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= min_time / 10:
+            break
+
+        operations *= 2
+
+    operations = max(int(operations * (min_time / elapsed)), 1)
+
+    best = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(operations):
+            function()
+        best = max(best, operations / (time.perf_counter() - start))
+
+    return best
+
+
+def measure_allocations(function):
+    """Returns the peak and retained bytes allocated by a single operation"""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        result = function()
+
+        current, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return peak - baseline, current - baseline
+
+
+def run(cases, min_time, repeat):
+    results = {}
+
+    for name, function in cases:
+        # Warm up
+        function()
+
+        peak, retained = measure_allocations(function)
+        results[name] = {
+            "ops_per_sec": measure_throughput(function, min_time, repeat),
+            "peak_kib": peak / 1024,
+            "retained_kib": retained / 1024,
+        }
+
+    return results
+
+
+def print_results(results, baseline=None):
+    name_width = max(len(name) for name in results)
+
+    header = f"{'case':<{name_width}}  {'ops/sec':>10}  {'peak KiB':>9}  {'retained KiB':>12}"
+    if baseline:
+        header += f"  {'change':>8}"
+    print(header)
+
+    for name, stats in results.items():
+        line = f"{name:<{name_width}}  {stats['ops_per_sec']:>10.1f}  {stats['peak_kib']:>9.1f}  {stats['retained_kib']:>12.1f}"
+
+        if baseline and (previous := baseline.get(name)):
+            change = stats["ops_per_sec"] / previous["ops_per_sec"] - 1
+            line += f"  {change:>+8.1%}"
+
+        print(line)
+
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+
+    for name, stats in results.items():
+        if (previous := baseline.get(name)) is None:
+            continue
+
+        change = stats["ops_per_sec"] / previous["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((name, change))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Priviblur's Tumblr API parsers")
+    parser.add_argument("--corpus", help="Directory of recorded corpora to benchmark in addition to synthetic payloads")
+    parser.add_argument("--corpus-limit", type=int, default=3, help="Responses to benchmark per endpoint family")
+    parser.add_argument("--filter", help="Only run cases whose name contains this string")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum duration of each round in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Rounds per case. The best one is reported")
+    parser.add_argument("--save", help="Save the results to this file as a baseline")
+    parser.add_argument("--compare", help="Compare the results against the baseline in this file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed throughput regression as a fraction")
+    arguments = parser.parse_args()
+
+    cases = create_synthetic_cases(arguments.seed)
+
+    if arguments.corpus:
+        cases.extend(create_corpus_cases(arguments.corpus, arguments.corpus_limit))
+
+    if arguments.filter:
+        cases = [(name, function) for name, function in cases if arguments.filter in name]
+
+    results = run(cases, arguments.min_time, arguments.repeat)
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, "rb") as file:
+            baseline = orjson.loads(file.read())
+
+    print_results(results, baseline)
+
+    if arguments.save:
+        with open(arguments.save, "wb") as file:
+            file.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+    if baseline and (regressions := find_regressions(results, baseline, arguments.threshold)):
+        print(f"\n{len(regressions)} case(s) regressed by more than {arguments.threshold:.0%}:")
+        for name, change in regressions:
+            print(f"    {name}: {change:+.1%}")
+
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
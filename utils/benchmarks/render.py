@@ -0,0 +1,107 @@
+"""Render benchmark for post templates
+
+Renders the posts of a synthetic timeline through post/post.jinja, the same way timeline pages
+do, and reports the median time per page. The number, date and list filters are benchmarked in
+two variants, alternating between rounds as to be equally affected by noise:
+
+    babel:      Babel's functions, parsing the locale on every call
+    formatters: helpers.formatters, with locale bound and memoized formatters
+
+    python utils/benchmarks/render.py --posts 20 --language fr
+"""
+
+import time
+import types
+import asyncio
+import argparse
+import statistics
+
+import babel.dates
+import babel.lists
+import babel.numbers
+import orjson
+
+import fixtures
+
+from src.priviblur_extractor import parse_timeline
+from src.helpers import formatters, i18n, templating
+
+PAGE_TEMPLATE = "{% for element in elements %}{% include 'post/post.jinja' %}{% endfor %}"
+
+FILTERS = {
+    "babel": {
+        "format_decimal": babel.numbers.format_decimal,
+        "format_date": babel.dates.format_date,
+        "format_datetime": babel.dates.format_datetime,
+        "format_list": babel.lists.format_list,
+    },
+    "formatters": {
+        "format_decimal": formatters.format_decimal,
+        "format_date": formatters.format_date,
+        "format_datetime": formatters.format_datetime,
+        "format_list": formatters.format_list,
+    },
+}
+
+
+def create_environment():
+    environment = templating.create_environment("src/templates")
+    templating.setup_environment(environment)
+
+    return environment
+
+
+def create_request(language):
+    """Creates a stand-in for the attributes of sanic.Request used by post templates"""
+    languages = i18n.initialize_locales()
+
+    return types.SimpleNamespace(
+        app=types.SimpleNamespace(ctx=types.SimpleNamespace(LANGUAGES=languages)),
+        ctx=types.SimpleNamespace(language=language, translate=languages[language].translator),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering the posts of a timeline")
+    parser.add_argument("--posts", type=int, default=20, help="Posts within the synthetic timeline")
+    parser.add_argument("--language", default="en_US")
+    parser.add_argument("--rounds", type=int, default=30, help="Rounds per variant")
+    parser.add_argument("--pages", type=int, default=5, help="Pages rendered per round")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    rng = fixtures.create_rng(arguments.seed)
+    timeline = parse_timeline(orjson.loads(orjson.dumps(fixtures.timeline(rng, arguments.posts))))
+
+    environment = create_environment()
+    template = environment.from_string(PAGE_TEMPLATE)
+    context = {"request": create_request(arguments.language), "elements": timeline.elements}
+
+    loop = asyncio.new_event_loop()
+
+    def render_round():
+        start = time.perf_counter()
+        for _ in range(arguments.pages):
+            loop.run_until_complete(template.render_async(**context))
+        return (time.perf_counter() - start) / arguments.pages
+
+    timings = {variant: [] for variant in FILTERS}
+
+    for _ in range(arguments.rounds):
+        for variant, filters in FILTERS.items():
+            environment.filters.update(filters)
+            timings[variant].append(render_round())
+
+    loop.close()
+
+    baseline = statistics.median(timings["babel"])
+
+    print(f"{arguments.posts} posts, {arguments.language}")
+    print(f"{'variant':<12}  {'ms/page':>8}  {'change':>8}")
+    for variant, results in timings.items():
+        median = statistics.median(results)
+        print(f"{variant:<12}  {median * 1000:>8.2f}  {median / baseline - 1:>+8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Micro-benchmark for helpers.url_handler
+
+Collects the URLs found within synthetic (or recorded) posts: images, avatars, header images and
+links, alongside href.li and t.umblr.com redirects, then measures url_handler over them:
+
+    full parse: every URL through urllib.parse.urlparse(), i.e. the handler without its fast path or memo
+    cold:       url_handler with its memo cleared before each round
+    warm:       url_handler with every URL already memoized
+
+The results of the fast path are verified against those of the full parse beforehand.
+
+    python utils/benchmarks/url_handler.py
+"""
+
+import sys
+import time
+import argparse
+import urllib.parse
+
+import orjson
+
+import fixtures
+
+from src.helpers import helpers
+
+LINKS = (
+    "https://{blog}.tumblr.com/post/{id}/synthetic-post",
+    "https://www.tumblr.com/{blog}/{id}",
+    "https://www.tumblr.com/tagged/{word}",
+    "https://assets.tumblr.com/images/default_avatar/cone_closed_128.png",
+    "https://static.tumblr.com/{hex}/{hex}/{hex}.css",
+    "https://a.tumblr.com/{hex}.mp3",
+    "https://href.li/?https://example.com/{word}",
+    "https://t.umblr.com/redirect?z=https%3A%2F%2Fexample.com%2F{word}&t={hex}",
+    "https://example.com/{word}?ref={hex}",
+)
+
+
+def collect_urls(value, urls):
+    """Collects every URL-like string within a decoded API response"""
+    if isinstance(value, dict):
+        for item in value.values():
+            collect_urls(item, urls)
+    elif isinstance(value, list):
+        for item in value:
+            collect_urls(item, urls)
+    elif isinstance(value, str) and value.startswith("https://"):
+        urls.append(value)
+
+
+def create_urls(arguments):
+    urls = []
+
+    if arguments.corpus:
+        for bodies in fixtures.load_corpus(arguments.corpus).values():
+            for body in bodies:
+                collect_urls(orjson.loads(body), urls)
+    else:
+        rng = fixtures.create_rng(arguments.seed)
+
+        for _ in range(arguments.timelines):
+            collect_urls(fixtures.timeline(rng, 20), urls)
+
+            for _ in range(20):
+                urls.append(rng.choice(LINKS).format(
+                    blog=f"{rng.choice(fixtures.WORDS)}-{rng.randint(0, 999)}",
+                    id=rng.randint(10 ** 17, 10 ** 18),
+                    word=rng.choice(fixtures.WORDS),
+                    hex=fixtures._hex(rng, 12),
+                ))
+
+    return urls
+
+
+def full_parse(url):
+    return helpers._handle_parsed_url(urllib.parse.urlparse(url))
+
+
+def verify(urls):
+    mismatches = []
+
+    for url in set(urls):
+        helpers._handle_url.cache_clear()
+
+        try:
+            expected = full_parse(url)
+        except AttributeError:
+            # URLs without a hostname aren't supported by either path
+            continue
+
+        if (result := helpers.url_handler(url)) != expected:
+            mismatches.append((url, expected, result))
+
+    return mismatches
+
+
+def measure(function, urls, repeat, before_round=None):
+    """Returns the best URLs handled per second out of `repeat` rounds"""
+    best = 0
+
+    for _ in range(repeat):
+        if before_round:
+            before_round()
+
+        start = time.perf_counter()
+        for url in urls:
+            function(url)
+        best = max(best, len(urls) / (time.perf_counter() - start))
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark helpers.url_handler")
+    parser.add_argument("--timelines", type=int, default=10, help="Synthetic timelines to collect URLs from")
+    parser.add_argument("--corpus", help="Directory of recorded corpora to collect URLs from instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per case. The best one is reported")
+    arguments = parser.parse_args()
+
+    urls = create_urls(arguments)
+    print(f"{len(urls)} URLs ({len(set(urls))} distinct)")
+
+    if mismatches := verify(urls):
+        print(f"\n{len(mismatches)} URL(s) handled differently by the fast path:")
+        for url, expected, result in mismatches:
+            print(f"    {url}: {expected!r} != {result!r}")
+
+        sys.exit(1)
+
+    results = {
+        "full parse": measure(full_parse, urls, arguments.repeat),
+        "cold": measure(helpers.url_handler, urls, arguments.repeat, before_round=helpers._handle_url.cache_clear),
+        "warm": measure(helpers.url_handler, urls, arguments.repeat),
+    }
+
+    print(f"{'case':<10}  {'URLs/sec':>12}  {'speedup':>8}")
+    for name, urls_per_second in results.items():
+        print(f"{name:<10}  {urls_per_second:>12.0f}  {urls_per_second / results['full parse']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
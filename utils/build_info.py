@@ -0,0 +1,34 @@
+"""Writes build metadata into src/_build_info.py
+
+Ran at build time, such as when building the Docker image, as for Priviblur to not have to
+call git (nor ship the .git directory) at runtime. See src/version.py
+
+    python utils/build_info.py
+"""
+
+import sys
+import subprocess
+
+OUTPUT_PATH = "src/_build_info.py"
+
+
+def main():
+    current_commit = subprocess.run(
+        "git rev-list HEAD --max-count=1 --abbrev-commit".split(),
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout.decode("utf-8").strip()
+
+    if not current_commit:
+        print("Unable to determine the current commit")
+        sys.exit(1)
+
+    with open(OUTPUT_PATH, "w") as file:
+        file.write("# Generated by utils/build_info.py\n")
+        file.write(f"CURRENT_COMMIT = {current_commit!r}\n")
+
+    print(f"Wrote build metadata for commit {current_commit} to \"{OUTPUT_PATH}\"")
+
+
+if __name__ == "__main__":
+    main()
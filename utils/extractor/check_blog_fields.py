@@ -0,0 +1,143 @@
+"""Verifies that every blog attribute BlogParser reads is requested from Tumblr
+
+Walks the source of parse/items.py and collects the attributes BlogParser reads from
+its target. Attributes accessed through subscripts (`self.target["..."]`) are
+required, while those read through `.get()` are treated as optional.
+
+Methods that delegate to another through `self._memoize(..., self.<method>)` are
+followed, as to check the reads of the method that actually does the parsing.
+
+Exits with a non-zero status when a required attribute is missing from the
+corresponding `fields[blogs]` set in api/request_config.py. Also fails when a checked
+method reads no attributes at all or never constructs `models.blog.Blog`, as either
+means this script no longer finds where the blog is actually parsed.
+
+Usage: python ./utils/extractor/check_blog_fields.py
+"""
+
+import ast
+import re
+import sys
+
+sys.path.insert(0, ".")
+
+from src.priviblur_extractor.api import request_config
+
+# BlogParser method -> the field sets that are used to request the blogs it parses
+CHECKED_METHODS = {
+    "parse": {
+        "EMBEDDED_BLOG_FIELDS": request_config.EMBEDDED_BLOG_FIELDS,
+        "BLOG_HEADER_FIELDS": request_config.BLOG_HEADER_FIELDS,
+    },
+    "parse_limited": {
+        "NOTE_BLOG_FIELDS": request_config.NOTE_BLOG_FIELDS,
+    },
+}
+
+# Methods whose reads are shared by every method listed above
+SHARED_METHODS = ("parse_theme",)
+
+
+def camel_to_snake(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def collect_reads(function_node):
+    """Returns the attributes required and optionally read from `self.target`"""
+    required = set()
+    optional = set()
+
+    for node in ast.walk(function_node):
+        # self.target["..."]
+        if isinstance(node, ast.Subscript) and ast.unparse(node.value) == "self.target":
+            if isinstance(node.slice, ast.Constant):
+                required.add(camel_to_snake(node.slice.value))
+
+        # self.target.get("...")
+        elif isinstance(node, ast.Call) and ast.unparse(node.func) == "self.target.get":
+            if node.args and isinstance(node.args[0], ast.Constant):
+                optional.add(camel_to_snake(node.args[0].value))
+
+    return required, optional
+
+
+def get_delegates(function_node):
+    """Returns the names of the methods passed to `self._memoize()` within the function"""
+    delegates = []
+
+    for node in ast.walk(function_node):
+        if isinstance(node, ast.Call) and ast.unparse(node.func) == "self._memoize":
+            for argument in node.args:
+                if (
+                    isinstance(argument, ast.Attribute)
+                    and isinstance(argument.value, ast.Name)
+                    and argument.value.id == "self"
+                ):
+                    delegates.append(argument.attr)
+
+    return delegates
+
+
+def constructs_blog(function_node):
+    return any(
+        isinstance(node, ast.Call) and ast.unparse(node.func) == "models.blog.Blog"
+        for node in ast.walk(function_node)
+    )
+
+
+def collect_method_reads(methods, method_name):
+    """Returns the attributes read by the method, including those read by the methods it delegates to
+
+    Also returns whether a Blog is constructed by any of them
+    """
+    required, optional = collect_reads(methods[method_name])
+    constructed = constructs_blog(methods[method_name])
+
+    for delegate in get_delegates(methods[method_name]):
+        delegate_required, delegate_optional, delegate_constructed = collect_method_reads(methods, delegate)
+        required |= delegate_required
+        optional |= delegate_optional
+        constructed |= delegate_constructed
+
+    return required, optional, constructed
+
+
+with open("src/priviblur_extractor/parse/items.py") as file:
+    module = ast.parse(file.read())
+
+blog_parser = next(
+    node for node in module.body if isinstance(node, ast.ClassDef) and node.name == "BlogParser"
+)
+
+methods = {node.name: node for node in blog_parser.body if isinstance(node, ast.FunctionDef)}
+
+shared_required = set()
+for method_name in SHARED_METHODS:
+    shared_required |= collect_reads(methods[method_name])[0]
+
+failed = False
+
+for method_name, field_sets in CHECKED_METHODS.items():
+    required, optional, constructed = collect_method_reads(methods, method_name)
+
+    if not (required or optional) or not constructed:
+        failed = True
+        print(f"Unable to find where BlogParser.{method_name} parses the blog. Has its parsing moved elsewhere?")
+        continue
+
+    required |= shared_required
+
+    for set_name, fields in field_sets.items():
+        requested = {field.lstrip("?") for field in fields}
+
+        if missing := sorted(required - requested):
+            failed = True
+            print(f"BlogParser.{method_name} reads {', '.join(missing)} which is missing from {set_name}")
+
+        if unused := sorted(requested - required - optional):
+            print(f"Note: {set_name} requests {', '.join(unused)} which BlogParser.{method_name} never reads")
+
+if failed:
+    sys.exit(1)
+
+print("All blog attributes read by BlogParser are requested")
@@ -0,0 +1,44 @@
+"""Compiles every template ahead of time into the template cache
+
+Ran when building the Docker image as for workers to not have to compile any template upon
+their first start. Templates changed afterwards are simply compiled again by the server.
+
+    python utils/templates/compile.py
+    python utils/templates/compile.py --directory /path/to/template/cache
+"""
+
+import sys
+import time
+import argparse
+
+sys.path.insert(0, ".")
+
+from src.config.misc import MiscellaneousConfig
+from src.helpers import templating
+
+TEMPLATES_PATH = "src/templates"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile Priviblur's templates into the template cache")
+    parser.add_argument(
+        "--directory", default=MiscellaneousConfig().template_cache_path,
+        help="Template cache directory. Should match template_cache_path within the config file"
+    )
+    arguments = parser.parse_args()
+
+    environment = templating.create_environment(TEMPLATES_PATH)
+    templating.setup_environment(environment)
+
+    if not templating.setup_bytecode_cache(environment, arguments.directory):
+        print(f"Unable to write to \"{arguments.directory}\"")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    template_count = templating.load_templates(environment)
+
+    print(f"Compiled {template_count} templates into \"{arguments.directory}\" in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()